@@ -0,0 +1,8 @@
+import os
+
+# Benchmarks measure the full work on synthetic items: keep the run history
+# (which would drop corpus links recorded by earlier runs) and the on-disk
+# caches out of the way unless explicitly configured. Runs before any src
+# import, since src.config reads the environment at import time.
+for _name in ("HISTORY_DB_PATH", "FEED_CACHE_DIR", "LLM_CACHE_PATH"):
+    os.environ.setdefault(_name, "")
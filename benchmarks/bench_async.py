@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.corpus import generate_news, write_feeds
+from benchmarks.stubs import start_feed_server, start_openai_stub, start_feishu_stub
+
+# Usage: python -m benchmarks.bench_async [--items 400] [--feeds 8] [--latency 0.2] [--feed-latency 1.0] [--runs 3]
+# End-to-end latency of the sync runner vs the asyncio runner (--async) against
+# the local stubs (feeds and OpenAI API with simulated latency, Feishu webhook).
+# Every run is a fresh `python -m src.main --ignore-freshness` process with
+# caches and run history disabled, so both runners do the full work; the
+# stage timings come from the run report.
+
+NETWORK_STAGES = ["fetch", "ai_score", "summarize", "send"]
+
+def run_once(env, extra_args):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        report_path = f.name
+    try:
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "src.main", "--ignore-freshness", "--report", report_path, *extra_args],
+            env=env, check=True, stdout=subprocess.DEVNULL
+        )
+        elapsed = time.perf_counter() - start
+        with open(report_path, encoding="utf-8") as f:
+            report = json.load(f)
+    finally:
+        os.unlink(report_path)
+    stages = {row["stage"]: row["seconds"] for row in report["stages"] if row["stage"] != "fetch_feed"}
+    return elapsed, stages
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs asyncio pipeline end-to-end latency")
+    parser.add_argument("--items", type=int, default=400)
+    parser.add_argument("--feeds", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated LLM latency per request (seconds)")
+    parser.add_argument("--feed-latency", type=float, default=1.0, help="Simulated feed server latency per request (seconds)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    feed_dir = tempfile.mkdtemp(prefix="bench_async_")
+    names = write_feeds(generate_news(args.items), feed_dir, feed_count=args.feeds)
+    _, feed_url = start_feed_server(feed_dir, latency=args.feed_latency)
+    _, openai_url = start_openai_stub(latency=args.latency)
+    _, feishu_url = start_feishu_stub()
+
+    env = {
+        **os.environ,
+        "RSS_FEEDS": ",".join(f"{feed_url}/{name}" for name in names),
+        "AI_API_KEY": "sk-bench", "AI_BASE_URL": openai_url, "FEISHU_WEBHOOK": feishu_url,
+        "FEED_CACHE_DIR": "", "LLM_CACHE_PATH": "", "HISTORY_DB_PATH": "", "LOG_LEVEL": "WARNING"
+    }
+
+    print(f"{args.items} items in {args.feeds} feeds, feed latency {args.feed_latency}s, LLM latency {args.latency}s, median of {args.runs} runs")
+    for label, extra_args in [("sync", []), ("async", ["--async"])]:
+        runs = [run_once(env, extra_args) for _ in range(args.runs)]
+        total = statistics.median(elapsed for elapsed, _ in runs)
+        per_stage = ", ".join(
+            f"{name} {statistics.median(stages.get(name, 0.0) for _, stages in runs):.3f}s" for name in NETWORK_STAGES
+        )
+        print(f"{label:<6} end-to-end {total:6.3f}s | {per_stage}", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import sys
+import time
+import src.deduplicate as deduplicate
+from src.config import SIMILARITY_THRESHOLD
+from src.deduplicate import deduplicate_news, is_similar
+from src.normalize import normalize_title
+from benchmarks.corpus import generate_news
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_deduplicate [max_items]
+# 1. Golden check: the indexed deduplicate_news must keep exactly the items the
+#    original all-pairs loop keeps (synthetic corpus plus hand-written edits).
+# 2. Blocking: on 5k titles, count the items SIMILARITY_BLOCKING=words keeps
+#    that the exhaustive SIMILARITY_BLOCKING=none scan drops as duplicates.
+# 3. Scaling: time deduplicate_news up to max_items (default 50k) titles.
+
+def deduplicate_all_pairs(news_list):
+    """
+    Reference implementation: the original O(n^2) loop.
+    """
+    unique_news = []
+    seen_links = set()
+    seen_titles = []
+    for item in news_list:
+        link = item.get("link")
+        title = item.get("title")
+        if link in seen_links:
+            continue
+        if any(is_similar(title, seen_title) for seen_title in seen_titles):
+            continue
+        seen_links.add(link)
+        seen_titles.append(title)
+        unique_news.append(item)
+    return unique_news
+
+# Edits that change words but not the character sequence much
+HANDWRITTEN_TITLES = [
+    "OpenAI releases GPT-5 model today",
+    "OpenAI released GPT5 models today",
+    "Nvidia to acquire Intel stake",
+    "Intel to acquire Nvidia stake",
+    "Anthropic launches Claude for enterprise customers",
+    "Anthropic launched Claude for enterprise-customers",
+    "Google DeepMind unveils new reasoning model",
+    "Google Deepmind unveils new reasoning modle"
+]
+
+def golden_news(seed):
+    # Titles in their normalized form (see src.normalize), so the original loop
+    # compares the same strings as the stage
+    news = generate_news(400, duplicate_ratio=0.4, seed=seed)
+    for i, title in enumerate(HANDWRITTEN_TITLES):
+        news.insert(i * 40, dict(news[0], title=title, link=f"https://news.example.com/handwritten/{i}"))
+    for item in news:
+        item["title"] = normalize_title(item["title"])
+    return news
+
+def deduplicate_with(blocking, news_list):
+    deduplicate.SIMILARITY_BLOCKING = blocking
+    return deduplicate_news(news_list)
+
+def main():
+    max_items = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    blocking = deduplicate.SIMILARITY_BLOCKING
+
+    for seed in range(3):
+        news = golden_news(seed)
+        expected = [item["link"] for item in deduplicate_all_pairs(news)]
+        actual = [item["link"] for item in deduplicate_news(news)]
+        status = "OK" if actual == expected else "MISMATCH"
+        print(f"golden seed={seed}: {status} ({len(expected)} unique of {len(news)}, threshold {SIMILARITY_THRESHOLD})", flush=True)
+        if actual != expected:
+            sys.exit(1)
+
+    news = generate_news(min(max_items, 5000), duplicate_ratio=0.4, seed=7)
+    exhaustive = {item["link"] for item in deduplicate_with("none", news)}
+    blocked = {item["link"] for item in deduplicate_with(blocking, news)}
+    print(f"blocking={blocking}: {len(blocked - exhaustive)} missed duplicates, {len(exhaustive - blocked)} extra drops of {len(news)}", flush=True)
+
+    for size in [1000, 2000, 5000, 10000, 50000]:
+        if size > max_items:
+            break
+        news = generate_news(size, duplicate_ratio=0.3)
+        start = time.perf_counter()
+        unique_news = deduplicate_news(news)
+        elapsed = time.perf_counter() - start
+        print(f"n={size:>6}: {elapsed:8.3f}s ({size / elapsed:,.0f} items/s), {len(unique_news)} unique", flush=True)
+
+if __name__ == "__main__":
+    main()
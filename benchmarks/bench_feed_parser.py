@@ -0,0 +1,78 @@
+import re
+import statistics
+import time
+from src.feed_parser import StreamingFeedParser, parse_feed
+from src.fetch_rss import _parse_with_feedparser
+from benchmarks.fixtures.make_fixtures import fixture_paths
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_feed_parser [runs]
+# Parses the feed fixtures in benchmarks/fixtures with feedparser and with the
+# streaming fast path (src/feed_parser.py), checks that both yield the same
+# entries (title, link, publish time, summary), then times feedparser, the
+# fast path reading the whole feed, and the fast path with the pipeline's
+# widest freshness window (120h), which stops once the rest of a feed is stale.
+# Bodies are fed in 64 KB chunks, as get_limited hands them over.
+# feedparser sanitizes summary HTML (reordering attributes on the way), so
+# summaries are compared by their text with the markup stripped.
+
+FIELDS = ("title", "link", "publish_time")
+TAG_PATTERN = re.compile(r"<[^>]+>")
+WINDOW_HOURS = 120
+CHUNK_SIZE = 65536
+
+def timed(func, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+def stream(content, hours):
+    parser = StreamingFeedParser(hours)
+    read = 0
+    for start in range(0, len(content), CHUNK_SIZE):
+        read = min(len(content), start + CHUNK_SIZE)
+        if not parser.feed(content[start:start + CHUNK_SIZE]):
+            break
+    return parser, parser.close(), read
+
+def mismatches(reference, fast):
+    count = 0
+    for expected, actual in zip(reference, fast):
+        if any(expected[field] != actual[field] for field in FIELDS):
+            count += 1
+        elif TAG_PATTERN.sub("", expected["summary"]).split() != TAG_PATTERN.sub("", actual["summary"]).split():
+            count += 1
+    return count + abs(len(reference) - len(fast))
+
+def main(runs=5):
+    for name, path in fixture_paths().items():
+        with open(path, "rb") as f:
+            content = f.read()
+
+        feedparser_time, (reference_title, reference) = timed(lambda: _parse_with_feedparser(name, content), runs)
+        fast_time, parsed = timed(lambda: parse_feed(content), runs)
+        print(f"{name} ({len(content) // 1024} KB, {len(reference)} entries)", flush=True)
+        print(f"  feedparser:         {feedparser_time * 1000:8.1f} ms")
+        if parsed is None:
+            parser, _, _ = stream(content, None)
+            print(f"  fast path:          falls back to feedparser ({parser.error})")
+            continue
+
+        feed_title, entries = parsed
+        diff = mismatches(reference, entries) + (feed_title != reference_title)
+        print(f"  fast path:          {fast_time * 1000:8.1f} ms ({feedparser_time / fast_time:4.1f}x), {diff} mismatches")
+
+        window_time, (parser, parsed, read) = timed(lambda: stream(content, WINDOW_HOURS), runs)
+        kept = len(parsed[1])
+        print(
+            f"  fast path, {WINDOW_HOURS}h:    {window_time * 1000:8.1f} ms ({feedparser_time / window_time:4.1f}x), "
+            f"{kept} entries kept, {parser.stale_skipped} skipped, read {read * 100 // len(content)}% of the body"
+            f"{' (stopped early)' if parser.stopped_early else ''}",
+            flush=True
+        )
+
+if __name__ == "__main__":
+    import sys
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
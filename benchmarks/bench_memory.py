@@ -0,0 +1,62 @@
+import resource
+import subprocess
+import sys
+import src.merge_news as merge_news
+from src.deduplicate import deduplicate_news
+from src.models import NewsItem
+from src.scoring import filter_by_rule_score
+from benchmarks.corpus import generate_news
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_memory [items]
+# Peak RSS of a backfill (default 10k items) through dedup -> merge -> rule
+# scoring, with plain dicts and dict-copying merged items (the previous
+# representation) versus NewsItem / MergedNews. Each mode runs in its own
+# subprocess so peaks don't mix.
+
+def build_merged_dict(group):
+    """
+    The previous merged item shape: a dict with summaries/contents copied per item.
+    """
+    best_item = min(group, key=lambda x: (merge_news._item_priority(x), -x["publish_time"].timestamp()))
+    return {
+        "title": best_item["title"],
+        "link": best_item["link"],
+        "source": best_item["source"],
+        "publish_time": max(item["publish_time"] for item in group),
+        "sources": list(set(item["source"] for item in group)),
+        "links": list(set(item["link"] for item in group)),
+        "summaries": [item["summary"] for item in group],
+        "contents": [item.get("content", "") for item in group],
+        "original_items": group
+    }
+
+def run(mode, size):
+    news = []
+    for item in generate_news(size, duplicate_ratio=0.3, summary_words=(80, 300)):
+        del item["story_id"]
+        # Fetched content is usually a few KB of HTML per entry
+        item["content"] = item["content"] * 6
+        # Source names come from feed titles; each feed parse creates fresh strings
+        item["source"] = "".join(list(item["source"]))
+        news.append(NewsItem(**item) if mode == "slots" else item)
+
+    if mode == "dicts":
+        merge_news.build_merged_item = build_merged_dict
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    merged_news = merge_news.merge_news_items(deduplicate_news(news))
+    filter_by_rule_score(merged_news)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:>5}: peak RSS {peak / 1024:7.1f} MiB ({(peak - baseline) / 1024:+.1f} MiB in pipeline), {len(merged_news)} merged")
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        run(sys.argv[2], int(sys.argv[3]))
+        return
+
+    size = sys.argv[1] if len(sys.argv) > 1 else "10000"
+    for mode in ["dicts", "slots"]:
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_memory", "--mode", mode, size], check=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import sys
+import time
+import src.merge_news as merge_news
+from src.merge_news import merge_news_items, is_similar
+from benchmarks.bench_deduplicate import golden_news
+from benchmarks.corpus import generate_news
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_merge [max_items]
+# 1. Golden checks on the corpus with hand-written edits (titles in normalized
+#    form, see bench_deduplicate):
+#    - MERGE_STRATEGY=greedy must build exactly the groups of the original
+#      pop(0) loop on the titles
+#    - MERGE_STRATEGY=components must build the connected components of all
+#      similar pairs
+# 2. Scaling: time both strategies up to max_items (default 5k) items.
+
+def merge_greedy_all_pairs(news_list):
+    """
+    Reference implementation: the original latest-first pop(0) loop.
+    Returns the groups as lists of links.
+    """
+    groups = []
+    sorted_news = sorted(news_list, key=lambda x: x['publish_time'], reverse=True)
+    while sorted_news:
+        base_item = sorted_news.pop(0)
+        group = [base_item]
+        remaining_news = []
+        for item in sorted_news:
+            if is_similar(base_item["title"], item["title"]):
+                group.append(item)
+            else:
+                remaining_news.append(item)
+        sorted_news = remaining_news
+        groups.append([item["link"] for item in group])
+    return groups
+
+def merge_components_all_pairs(news_list):
+    """
+    Reference implementation: connected components over every similar pair
+    (earlier item first, latest first). Returns the groups as sets of links.
+    """
+    sorted_news = sorted(news_list, key=lambda x: x['publish_time'], reverse=True)
+    parents = list(range(len(sorted_news)))
+    def find(i):
+        while parents[i] != i:
+            i = parents[i]
+        return i
+    for j, item in enumerate(sorted_news):
+        for i in range(j):
+            if is_similar(sorted_news[i]["title"], item["title"]):
+                parents[find(j)] = find(i)
+    groups = {}
+    for i, item in enumerate(sorted_news):
+        groups.setdefault(find(i), set()).add(item["link"])
+    return sorted(groups.values(), key=sorted)
+
+def merge_with(strategy, news_list):
+    merge_news.MERGE_STRATEGY = strategy
+    return merge_news_items(news_list)
+
+def main():
+    max_items = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    for seed in range(3):
+        news = golden_news(seed)
+        expected = merge_greedy_all_pairs(news)
+        actual = [[item["link"] for item in merged["original_items"]] for merged in merge_with("greedy", news)]
+        status = "OK" if actual == expected else "MISMATCH"
+        print(f"golden greedy seed={seed}: {status} ({len(expected)} groups of {len(news)})", flush=True)
+        if actual != expected:
+            sys.exit(1)
+
+        expected = merge_components_all_pairs(news)
+        actual = sorted(({item["link"] for item in merged["original_items"]} for merged in merge_with("components", news)), key=sorted)
+        status = "OK" if actual == expected else "MISMATCH"
+        print(f"golden components seed={seed}: {status} ({len(expected)} groups of {len(news)})", flush=True)
+        if actual != expected:
+            sys.exit(1)
+
+    for size in [1000, 2000, 5000, 10000]:
+        if size > max_items:
+            break
+        news = generate_news(size, duplicate_ratio=0.3)
+        for strategy in ("greedy", "components"):
+            start = time.perf_counter()
+            merged = merge_with(strategy, news)
+            elapsed = time.perf_counter() - start
+            print(f"n={size:>6} {strategy:10}: {elapsed:8.3f}s, {len(merged)} groups", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import re
+import time
+from src.fetch_rss import parse_feed_records
+from src.models import NewsItem
+from src.normalize import normalize_news, search_text, summary_texts
+from src.similarity_index import title_fingerprint
+from src.deduplicate import deduplicate_news
+from src.merge_news import merge_news_items
+from src.scoring import filter_by_rule_score
+from benchmarks.fixtures.make_fixtures import fixture_paths
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_normalize
+# Normalization (src/normalize.py) on the HTML-heavy feed fixtures in
+# benchmarks/fixtures (WordPress descriptions, Blogger full-content HTML):
+# - cost of the normalize stage per item
+# - the text work it replaces, redone per call the way the stages used to
+#   (join + lowercase for rule scoring, join + truncate for prompts, tag regex
+#   for the no-AI fallback, tokenizing / fingerprinting titles for the
+#   history), vs reading the cached fields
+# - prompt characters saved by sending plain text instead of raw HTML
+# - dedup, merge and rule scoring times on the normalized items
+
+LEGACY_TAG_PATTERN = re.compile('<[^<]+?>')
+
+def load_items():
+    items = []
+    for path in fixture_paths().values():
+        with open(path, "rb") as f:
+            feed_title, records, _ = parse_feed_records(path, f.read())
+        items.extend(NewsItem(title, link, feed_title, publish_time, summary, content)
+                     for title, link, publish_time, summary, content in records)
+    return items
+
+def legacy_text_work(merged):
+    """
+    Reference: the per-call cleaning the stages did before normalization.
+    """
+    for item in merged:
+        summaries = item["summaries"]
+        (item["title"] + " " + " ".join(summaries)).lower() # Rule score
+        " ".join(summaries)[:1000] # AI score prompt
+        "\n".join(summaries) # Summary prompt
+        LEGACY_TAG_PATTERN.sub('', summaries[0])[:200] # No-AI fallback
+        for original in item["original_items"]:
+            title_fingerprint(original["title"]) # History
+
+def cached_text_work(merged):
+    for item in merged:
+        search_text(item)
+        texts = summary_texts(item)
+        " ".join(texts)[:1000]
+        "\n".join(texts)
+        texts[0][:200]
+        for original in item["original_items"]:
+            original["title_fp"]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    items = load_items()
+    raw_chars = sum(len(item["summary"]) for item in items)
+    print(f"{len(items)} items, avg summary {raw_chars // len(items)} chars of HTML", flush=True)
+
+    seconds, _ = timed(normalize_news, items)
+    print(f"  normalize stage: {seconds * 1000:7.1f} ms ({seconds / len(items) * 1e6:5.1f} us/item)")
+    clean_chars = sum(len(item["text"]) for item in items)
+    print(f"  plain text: {clean_chars * 100 // raw_chars}% of the HTML characters ({(raw_chars - clean_chars) // len(items)} chars/item fewer in prompts)")
+
+    dedup_time, unique = timed(deduplicate_news, items)
+    merge_time, merged = timed(merge_news_items, unique)
+    score_time, candidates = timed(filter_by_rule_score, merged)
+    print(f"  dedup {dedup_time * 1000:6.1f} ms, merge {merge_time * 1000:6.1f} ms, rule score {score_time * 1000:6.1f} ms "
+          f"({len(items)} -> {len(unique)} -> {len(merged)} -> {len(candidates)})")
+
+    legacy_time, _ = timed(legacy_text_work, merged)
+    cached_time, _ = timed(cached_text_work, merged)
+    print(f"  per-stage text work: legacy {legacy_time * 1000:6.1f} ms, cached fields {cached_time * 1000:6.1f} ms", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import multiprocessing
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src.config import AVAILABLE_CORES, FEED_PARSER, FETCH_MAX_WORKERS
+from src.fetch_rss import parse_feed_records
+from src.parse_pool import _warm_worker
+from benchmarks.fixtures.make_fixtures import fixture_paths
+
+# Usage: LOG_LEVEL=ERROR [FEED_PARSER=feedparser] python -m benchmarks.bench_parse_pool [feeds] [runs]
+# Parsing throughput (entries/s) for a batch of feeds (the fixtures in
+# benchmarks/fixtures, repeated), parsed fully (no freshness window):
+# - threads: FETCH_MAX_WORKERS fetch threads parsing in-process (PARSE_WORKERS=0)
+# - processes: warm spawn pools of 1, 2, 4, ... workers up to the available
+#   cores, fed raw bytes and returning compact records (PARSE_WORKERS=n)
+# Pools are started and warmed before timing, as the fetch stage does while
+# the first downloads are in flight. Uses the configured FEED_PARSER.
+
+def load_bodies(feeds):
+    bodies = []
+    for path in fixture_paths().values():
+        with open(path, "rb") as f:
+            bodies.append((path, f.read()))
+    return [bodies[i % len(bodies)] for i in range(feeds)]
+
+def throughput(executor, bodies, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        entries = sum(len(records) for _, records, _ in executor.map(parse_feed_records, *zip(*bodies)))
+        times.append(time.perf_counter() - start)
+    seconds = statistics.median(times)
+    return entries / seconds, seconds
+
+def worker_counts():
+    counts = []
+    workers = 1
+    while workers < AVAILABLE_CORES:
+        counts.append(workers)
+        workers *= 2
+    return counts + [AVAILABLE_CORES]
+
+def main(feeds=16, runs=3):
+    bodies = load_bodies(feeds)
+    print(f"{feeds} feeds ({sum(len(body) for _, body in bodies) // 1024} KB), FEED_PARSER={FEED_PARSER}, {AVAILABLE_CORES} cores available")
+
+    with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as executor:
+        baseline, seconds = throughput(executor, bodies, runs)
+    print(f"  threads ({FETCH_MAX_WORKERS}):     {baseline:9.0f} entries/s ({seconds:6.3f}s)", flush=True)
+
+    for workers in worker_counts():
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_warm_worker) as executor:
+            for future in [executor.submit(int) for _ in range(workers)]:
+                future.result()
+            rate, seconds = throughput(executor, bodies, runs)
+        print(f"  processes ({workers:>2}):  {rate:9.0f} entries/s ({seconds:6.3f}s, {rate / baseline:4.2f}x threads)", flush=True)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.corpus import generate_news, write_feeds
+from benchmarks.stubs import start_feed_server, start_openai_stub, start_feishu_stub
+
+# Usage: python -m benchmarks.bench_pipeline [--sizes 100,1000,10000,100000] [--output results.json] [--compare baseline.json]
+# Times every pipeline stage on the synthetic corpus at each size and writes
+# the results as JSON, so two versions can be compared with --compare.
+# Network stages (fetch, AI scoring, summaries, Feishu) run against the local
+# stubs in benchmarks/stubs.py; on-disk caches and run history are disabled so
+# every run does the full work.
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+MIN_COMPARABLE_SECONDS = 0.01 # Stages faster than this are too noisy to flag
+
+def _configure_environment(openai_url, feishu_url):
+    # src.config reads the environment at import time, so this runs before any src import
+    os.environ.update({
+        "AI_API_KEY": "sk-bench", "AI_BASE_URL": openai_url, "FEISHU_WEBHOOK": feishu_url,
+        "FEED_CACHE_DIR": "", "LLM_CACHE_PATH": "", "HISTORY_DB_PATH": ""
+    })
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def _timed(results, size, stage, func, items_in):
+    start = time.perf_counter()
+    output = func()
+    elapsed = time.perf_counter() - start
+    items_out = len(output) if output is not None and hasattr(output, "__len__") else None
+    results.append({
+        "size": size,
+        "stage": stage,
+        "seconds": round(elapsed, 6),
+        "items_in": items_in,
+        "items_out": items_out,
+        "items_per_second": round(items_in / elapsed, 1) if elapsed and items_in else None,
+        "us_per_item": round(elapsed * 1e6 / items_in, 2) if items_in else None
+    })
+    print(f"n={size:>6} {stage:<12} {elapsed:9.4f}s  in={items_in:<7} out={items_out}", flush=True)
+    return output
+
+def run_size(size, args, feed_url):
+    """
+    Runs every stage once on a corpus of `size` items. Returns the result rows.
+    """
+    from src.models import NewsItem
+    from src.source_index import tag_source
+    from src.fetch_rss import fetch_rss_feeds
+    from src.freshness_filter import filter_fresh_news
+    from src.deduplicate import deduplicate_news
+    from src.merge_news import merge_news_items
+    from src.scoring import filter_by_rule_score, apply_ai_scores
+    from src.ranking import rank_news
+    from src.main import summarize_news
+    from src.feishu_sender import send_to_feishu
+
+    results = []
+    corpus = generate_news(size, duplicate_ratio=args.duplicate_ratio, title_words=args.title_words, seed=args.seed)
+
+    if size <= args.fetch_max:
+        names = write_feeds(corpus, os.path.join(args.feed_dir, str(size)), feed_count=args.feeds)
+        urls = [f"{feed_url}/{size}/{name}" for name in names]
+        _timed(results, size, "fetch", lambda: fetch_rss_feeds(urls), size)
+
+    # Stages after fetch run on the generated items (exact titles/times, independent of feed parsing)
+    news = [
+        tag_source(NewsItem(**{key: value for key, value in item.items() if key != "story_id"}))
+        for item in corpus
+    ]
+
+    fresh = _timed(results, size, "freshness", lambda: filter_fresh_news(news, hours=args.window), len(news))
+    unique = _timed(results, size, "deduplicate", lambda: deduplicate_news(fresh), len(fresh))
+    merged = _timed(results, size, "merge", lambda: merge_news_items(unique), len(unique))
+    candidates = _timed(results, size, "rule_score", lambda: filter_by_rule_score(merged), len(merged))
+    scored = _timed(results, size, "ai_score", lambda: apply_ai_scores(candidates), len(candidates))
+    ranked = _timed(results, size, "rank", lambda: rank_news(scored), len(scored))
+    summaries = _timed(results, size, "summarize", lambda: summarize_news(ranked), len(ranked))
+    _timed(results, size, "send", lambda: send_to_feishu(summaries) and summaries, len(summaries))
+    return results
+
+def compare(results, baseline_path, max_slowdown):
+    """
+    Prints per-stage time ratios against a baseline results file.
+    Returns the number of stages slower than max_slowdown.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(row["size"], row["stage"]): row for row in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"\nComparison against {baseline_path}:")
+    for row in results:
+        old = baseline.get((row["size"], row["stage"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        flag = ""
+        if ratio > max_slowdown and row["seconds"] >= MIN_COMPARABLE_SECONDS:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"n={row['size']:>6} {row['stage']:<12} {old['seconds']:9.4f}s -> {row['seconds']:9.4f}s  x{ratio:5.2f}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmark")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated corpus sizes")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3, help="Share of near-duplicate titles")
+    parser.add_argument("--title-words", default="6,14", help="Min,max words per title")
+    parser.add_argument("--window", type=int, default=120, help="Freshness window (hours)")
+    parser.add_argument("--feeds", type=int, default=4, help="Number of feeds the corpus is split into")
+    parser.add_argument("--fetch-max", type=int, default=10000, help="Largest size the fetch stage is timed at")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Simulated LLM latency per request (seconds)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results file (default benchmarks/results/pipeline-<git rev>.json)")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.25, help="Ratio above which --compare reports a regression")
+    args = parser.parse_args()
+    args.title_words = tuple(int(n) for n in args.title_words.split(","))
+
+    with tempfile.TemporaryDirectory() as feed_dir:
+        args.feed_dir = feed_dir
+        _, feed_url = start_feed_server(feed_dir)
+        _, openai_url = start_openai_stub(latency=args.llm_latency)
+        _, feishu_url = start_feishu_stub()
+        _configure_environment(openai_url, feishu_url)
+
+        results = []
+        for size in (int(n) for n in args.sizes.split(",")):
+            results.extend(run_size(size, args, feed_url))
+
+    revision = _git_revision()
+    report = {
+        "meta": {
+            "revision": revision,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key != "feed_dir"}
+        },
+        "results": results
+    }
+
+    output = args.output or os.path.join("benchmarks", "results", f"pipeline-{revision}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(results, args.compare, args.max_slowdown):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
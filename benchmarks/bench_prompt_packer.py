@@ -0,0 +1,62 @@
+import random
+import sys
+import time
+from src.config import SUMMARY_PROMPT_TOKENS, SCORE_PROMPT_TOKENS
+from src.prompt_packer import pack_texts, estimate_tokens
+from benchmarks.corpus import make_vocabulary, TERMS
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_prompt_packer [stories] [sources]
+# Prompt packing (src/prompt_packer.py) on synthetic merged stories: each
+# story has a set of fact sentences, and each of its sources restates the lead
+# fact (lightly reworded) plus a random subset of the others, the way outlets
+# cover the same announcement. For the summary prompt (SUMMARY_PROMPT_TOKENS)
+# and the score prompt (SCORE_PROMPT_TOKENS) it reports estimated prompt
+# tokens and the share of the story's distinct facts that reach the prompt,
+# for the old prompts (all summaries joined / joined and cut at 1000
+# characters) vs the packed ones, plus the packing time per item.
+
+def make_story(rng, vocabulary, sources):
+    facts = []
+    for i in range(rng.randint(5, 10)):
+        words = [rng.choice(TERMS) if rng.random() < 0.1 else rng.choice(vocabulary) for _ in range(rng.randint(10, 24))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), f"{rng.randint(2, 999)}")
+        facts.append(f"fact{i} " + " ".join(words))
+    texts = []
+    for _ in range(sources):
+        lead = facts[0].split()
+        lead[rng.randrange(1, len(lead))] = rng.choice(vocabulary) # Reworded a little
+        picked = [fact for fact in facts[1:] if rng.random() < 0.5]
+        texts.append(". ".join([" ".join(lead)] + picked) + ".")
+    return [fact.split()[0] for fact in facts], texts
+
+def coverage(fact_ids, text):
+    return sum(1 for fact_id in fact_ids if f"{fact_id} " in text) / len(fact_ids)
+
+def main(stories=500, sources=4):
+    rng = random.Random(7)
+    vocabulary = make_vocabulary(rng, 3000)
+    corpus = [make_story(rng, vocabulary, sources) for _ in range(stories)]
+    print(f"{stories} merged stories x {sources} sources, "
+          f"SUMMARY_PROMPT_TOKENS={SUMMARY_PROMPT_TOKENS}, SCORE_PROMPT_TOKENS={SCORE_PROMPT_TOKENS}")
+
+    prompts = [
+        ("summary", lambda texts: "\n".join(texts), SUMMARY_PROMPT_TOKENS),
+        ("score", lambda texts: " ".join(texts)[:1000], SCORE_PROMPT_TOKENS)
+    ]
+    for name, legacy, budget in prompts:
+        legacy_texts = [legacy(texts) for _, texts in corpus]
+        start = time.perf_counter()
+        packed_texts = [pack_texts(texts, budget) for _, texts in corpus]
+        seconds = time.perf_counter() - start
+
+        legacy_tokens = sum(estimate_tokens(text) for text in legacy_texts)
+        packed_tokens = sum(estimate_tokens(text) for text in packed_texts)
+        legacy_coverage = sum(coverage(facts, text) for (facts, _), text in zip(corpus, legacy_texts)) / stories
+        packed_coverage = sum(coverage(facts, text) for (facts, _), text in zip(corpus, packed_texts)) / stories
+        print(f"  {name:7}: old {legacy_tokens // stories:5} tokens/item, {legacy_coverage:4.0%} of facts | "
+              f"packed {packed_tokens // stories:5} tokens/item, {packed_coverage:4.0%} of facts "
+              f"({1 - packed_tokens / legacy_tokens:4.0%} fewer tokens), {seconds / stories * 1e6:6.1f} us/item", flush=True)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,103 @@
+import random
+import time
+import numpy as np
+from src.scoring import (
+    KEYWORD_MATCHER, calculate_rule_score, KEYWORDS_LOCAL_ONLY, KEYWORDS_EVENT_STRENGTH, KEYWORDS_MARKETING,
+    KEYWORDS_LANDING_ENTRY, KEYWORDS_LANDING_TECH, KEYWORDS_LANDING_COMMERCIAL
+)
+from src.batch_scoring import extract_features, rule_scores
+from src.config import TIER1_COMPANIES, TIER2_COMPANIES, TIER3_COMPANIES
+from benchmarks.corpus import generate_news
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_rule_score
+# Checks the compiled keyword matcher against the original per-class
+# `any(kw in text ...)` scans, then times both scans and calculate_rule_score
+# per item for short and long summaries. Then checks the batch scoring engine
+# (src/batch_scoring.py) against calculate_rule_score and times both for
+# growing item counts.
+
+RULE_TERMS = [
+    "training", "residents", "india", "revolutionary", "next-gen", "40%", "dashboard", "api reference", "price",
+    "01.AI", "Xiao-i", "launch", "new model", "uk", "tier", "strategy", "Stability AI", "$20", "3x"
+]
+
+CLASSES = {
+    "local_only": KEYWORDS_LOCAL_ONLY,
+    "local_context": ["training", "initiative", "residents"],
+    "event_strength": KEYWORDS_EVENT_STRENGTH,
+    "marketing": KEYWORDS_MARKETING,
+    "substance": ["api", "parameter", "function", "mode", "feature"],
+    "landing": KEYWORDS_LANDING_ENTRY + KEYWORDS_LANDING_TECH + KEYWORDS_LANDING_COMMERCIAL,
+    "type_product_model_release": ["new model", "new product", "launch", "release"],
+    "type_capability_strategy": ["update", "upgrade", "api", "capability", "strategy", "price"],
+    "tier1_company": TIER1_COMPANIES,
+    "tier2_company": TIER2_COMPANIES,
+    "tier3_company": TIER3_COMPANIES,
+}
+
+def match_per_class(text):
+    """
+    Reference: one any() scan per keyword class, as calculate_rule_score used to do.
+    """
+    features = 0
+    for name, keywords in CLASSES.items():
+        if any(kw.lower() in text for kw in keywords):
+            features |= KEYWORD_MATCHER.bits[name]
+    return features
+
+def make_items(n, summary_words, seed=5):
+    rng = random.Random(seed)
+    items = []
+    for news in generate_news(n, summary_words=summary_words, seed=seed):
+        words = news["summary"].split()
+        for _ in range(rng.randint(0, 6)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(RULE_TERMS))
+        items.append({
+            "title": news["title"],
+            "summaries": [" ".join(words)] * rng.randint(1, 3),
+            "source": news["source"],
+            "link": news["link"]
+        })
+    return items
+
+def per_item_us(func, values, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in values:
+            func(value)
+    return (time.perf_counter() - start) / len(values) / repeat * 1e6
+
+def main():
+    for label, summary_words in [("short", (20, 80)), ("long", (400, 1500))]:
+        items = make_items(1000, summary_words)
+        texts = [(item["title"] + " " + " ".join(item["summaries"])).lower() for item in items]
+        mismatches = sum(1 for text in texts if KEYWORD_MATCHER.match(text) != match_per_class(text))
+        avg_len = sum(len(text) for text in texts) // len(texts)
+
+        print(f"{label} summaries (avg {avg_len} chars): {mismatches} feature mismatches", flush=True)
+        print(f"  per-class scans:  {per_item_us(match_per_class, texts):8.1f} us/item")
+        print(f"  compiled matcher: {per_item_us(KEYWORD_MATCHER.match, texts):8.1f} us/item")
+        print(f"  calculate_rule_score: {per_item_us(calculate_rule_score, items):8.1f} us/item", flush=True)
+
+    for size in [1000, 10000, 50000]:
+        items = make_items(size, (20, 80))
+        start = time.perf_counter()
+        scores = [calculate_rule_score(item) for item in items]
+        per_item_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        features = extract_features(items)
+        extract_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batch_scores = rule_scores(features)
+        vector_time = time.perf_counter() - start
+
+        mismatches = int(np.count_nonzero(batch_scores != np.array(scores)))
+        print(
+            f"batch n={size:>6}: {mismatches} score mismatches | per item {per_item_time:6.3f}s | "
+            f"extract {extract_time:6.3f}s + rules {vector_time * 1000:5.1f}ms",
+            flush=True
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import sys
+import time
+from collections import Counter
+import src.deduplicate as deduplicate
+import src.merge_news as merge_news
+from benchmarks.corpus import generate_news
+
+# Usage: LOG_LEVEL=WARNING python -m benchmarks.bench_similarity [max_items]
+# Compares SIMILARITY_MODE=difflib and SIMILARITY_MODE=embedding on a corpus
+# where part of the duplicates are reworded (same story, different words):
+# - dedup: duplicates still kept (missed) and unique stories wrongly dropped
+# - merge: pairwise precision / recall / F1 of the merged groups vs story_id
+# - wall time of each stage (embedding time includes computing the vectors;
+#   "cached" re-runs on items that already carry their embedding)
+
+MODES = ["difflib", "embedding"]
+
+def _pairs(count):
+    return count * (count - 1) // 2
+
+def merge_quality(merged):
+    """
+    Pairwise precision / recall / F1 of merged groups against story_id.
+    """
+    items = [(group_id, item["story_id"]) for group_id, merged_item in enumerate(merged) for item in merged_item["original_items"]]
+    true_positive = sum(_pairs(n) for n in Counter(items).values())
+    predicted = sum(_pairs(n) for n in Counter(group_id for group_id, _ in items).values())
+    actual = sum(_pairs(n) for n in Counter(story_id for _, story_id in items).values())
+    precision = true_positive / predicted if predicted else 1.0
+    recall = true_positive / actual if actual else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+def dedup_quality(news, unique):
+    """
+    Returns (duplicates kept, stories lost): kept items whose story was already
+    kept, and stories none of whose items survived.
+    """
+    kept_stories = Counter(item["story_id"] for item in unique)
+    duplicates_kept = sum(count - 1 for count in kept_stories.values())
+    stories_lost = len({item["story_id"] for item in news} - set(kept_stories))
+    return duplicates_kept, stories_lost
+
+def _set_mode(mode):
+    deduplicate.SIMILARITY_MODE = mode
+    merge_news.SIMILARITY_MODE = mode
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    max_items = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    for size in [1000, 5000, 10000]:
+        if size > max_items:
+            break
+        for mode in MODES:
+            _set_mode(mode)
+            news = generate_news(size, duplicate_ratio=0.3, reworded_ratio=0.5)
+            unique, dedup_time = _timed(lambda: deduplicate.deduplicate_news(news))
+            merged, merge_time = _timed(lambda: merge_news.merge_news_items(news))
+            _, cached_time = _timed(lambda: deduplicate.deduplicate_news(news))
+            duplicates_kept, stories_lost = dedup_quality(news, unique)
+            precision, recall, f1 = merge_quality(merged)
+            print(
+                f"n={size:>6} {mode:<9} dedup {dedup_time:7.3f}s (cached {cached_time:6.3f}s) "
+                f"kept dups={duplicates_kept:<5} lost stories={stories_lost:<4} | "
+                f"merge {merge_time:7.3f}s P={precision:.3f} R={recall:.3f} F1={f1:.3f}",
+                flush=True
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Usage: python -m benchmarks.bench_startup [runs]
+# Measures the import time of the pipeline modules with `python -X importtime`
+# (median of several fresh interpreters) and checks it against a startup
+# budget. Also checks that heavy optional packages (openai, feedparser) are not
+# imported until they are actually used. Exits non-zero if any check fails.
+
+# Cumulative import time budget per module (milliseconds)
+STARTUP_BUDGET_MS = {
+    "src.config": 50,
+    "src.scoring": 250,
+    "src.feishu_sender": 400,
+    "src.fetch_rss": 400,
+    "src.main": 500
+}
+LAZY_MODULES = ["openai", "feedparser"]
+
+def import_time_ms(module):
+    """
+    Returns the cumulative import time of module in a fresh interpreter (ms).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env={**os.environ, "LOG_LEVEL": "ERROR"}
+    )
+    pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$")
+    for line in result.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+def eagerly_imported(module):
+    """
+    Returns which of LAZY_MODULES importing module pulls in.
+    """
+    code = f"import json, sys, {module}; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True, env={**os.environ, "LOG_LEVEL": "ERROR"}
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = 0
+
+    for module, budget in STARTUP_BUDGET_MS.items():
+        elapsed = statistics.median(import_time_ms(module) for _ in range(runs))
+        loaded = eagerly_imported(module)
+        ok = elapsed <= budget and not loaded
+        failures += not ok
+        note = f", eagerly imports {', '.join(loaded)}" if loaded else ""
+        print(f"{module:<20} {elapsed:7.1f}ms (budget {budget}ms){note}  {'OK' if ok else 'FAIL'}", flush=True)
+
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import os
+import random
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+# Deterministic synthetic news corpus for benchmarks.
+# Titles are built from a generated vocabulary plus real company/keyword terms,
+# and a configurable share of items are near-duplicate rewrites of earlier
+# stories (as different outlets would title them: suffixes, dropped or swapped
+# words, inflections, hyphenation, typos). Each item carries a "story_id" so
+# clustering quality can be measured. The same items can be rendered as RSS files for the feed stub server (see benchmarks/stubs.py).
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vo", "zen", "pri", "dex", "qua", "sol", "tor", "bix", "fen", "gra"]
+TERMS = [
+    "OpenAI", "Google", "Anthropic", "Meta", "Microsoft", "Nvidia", "DeepSeek", "Alibaba", "Mistral", "Baidu",
+    "launch", "release", "update", "API", "model", "pricing", "agent", "SDK", "enterprise", "context window"
+]
+SOURCE_SUFFIXES = [" - Reuters", " | TechCrunch", " (Bloomberg)", ": report", " - The Verge"]
+SOURCES = ["OpenAI News", "The Keyword", "Reuters", "Bloomberg", "TechCrunch", "Some Blog"]
+
+def make_vocabulary(rng, size):
+    # 2-4 syllables give ~70k distinct words; allow 5 for larger vocabularies
+    max_syllables = 4 if size <= 60000 else 5
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, max_syllables))))
+    return sorted(words)
+
+def _inflect(rng, word):
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            return word[:-len(suffix)]
+    return word + rng.choice(["s", "ed", "ing"])
+
+def _typo(rng, word):
+    i = rng.randrange(len(word))
+    typo = rng.randrange(3)
+    if typo == 0 and len(word) > 1: # Dropped letter
+        return word[:i] + word[i + 1:]
+    if typo == 1 and i + 1 < len(word): # Swapped letters
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice("aeiourst") + word[i + 1:]
+
+def _rewrite_title(rng, title):
+    words = title.split()
+    edit = rng.randrange(7)
+    if edit == 0:
+        return title + rng.choice(SOURCE_SUFFIXES)
+    if edit == 1 and len(words) > 4:
+        del words[rng.randrange(len(words))]
+    elif edit == 2 and len(words) > 2:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    elif edit == 3: # Inflection: "release" / "releases" / "released"
+        i = rng.randrange(len(words))
+        words[i] = _inflect(rng, words[i])
+    elif edit == 4 and len(words) > 2: # Hyphenation: "gpt 5" / "gpt-5" / "gpt5"
+        i = rng.randrange(len(words) - 1)
+        words[i:i + 2] = [words[i] + rng.choice(["-", ""]) + words[i + 1]]
+    elif edit == 5: # Typos
+        for i in rng.sample(range(len(words)), min(len(words), rng.randint(1, 2))):
+            words[i] = _typo(rng, words[i])
+    else:
+        return title.lower()
+    return " ".join(words)
+
+def _reword_title(rng, title, vocabulary):
+    # Same story in different words: keep the names, swap most other words, reorder
+    words = title.split()
+    kept = [word for word in words if word in TERMS or rng.random() < 0.4]
+    added = [rng.choice(vocabulary) for _ in range(max(2, len(words) - len(kept)))]
+    words = kept + added
+    rng.shuffle(words)
+    return " ".join(words)
+
+def generate_titles(n, duplicate_ratio=0.3, title_words=(6, 14), seed=42, reworded_ratio=0.0):
+    """
+    Returns [(title, story_id)] with roughly duplicate_ratio near-duplicates.
+    A reworded_ratio share of the duplicates is reworded (different wording,
+    same names) instead of lightly edited.
+    """
+    rng = random.Random(seed)
+    # Real headline vocabularies keep growing with the corpus (names, products, numbers)
+    vocabulary = make_vocabulary(rng, max(5000, n))
+    titles = []
+    for _ in range(n):
+        if titles and rng.random() < duplicate_ratio:
+            base_title, story_id = titles[rng.randrange(len(titles))]
+            if reworded_ratio and rng.random() < reworded_ratio:
+                titles.append((_reword_title(rng, base_title, vocabulary), story_id))
+            else:
+                titles.append((_rewrite_title(rng, base_title), story_id))
+        else:
+            words = [rng.choice(TERMS) if rng.random() < 0.2 else rng.choice(vocabulary)
+                     for _ in range(rng.randint(*title_words))]
+            titles.append((" ".join(words), len(titles)))
+    return titles
+
+def generate_news(n, duplicate_ratio=0.3, title_words=(6, 14), summary_words=(30, 120), span_hours=120, seed=42, reworded_ratio=0.0):
+    """
+    Returns n news dicts shaped like fetch_rss_feeds() output (plus "story_id").
+    With reworded_ratio > 0 some duplicates are reworded (see generate_titles)
+    and every duplicate's summary paraphrases its story's first summary.
+    """
+    rng = random.Random(seed + 1)
+    vocabulary = make_vocabulary(rng, 5000)
+    latest = datetime(2026, 2, 27, 8, 0)
+    news = []
+    story_summaries = {}
+    for i, (title, story_id) in enumerate(generate_titles(n, duplicate_ratio, title_words, seed, reworded_ratio)):
+        if reworded_ratio and story_id in story_summaries:
+            words = [word if rng.random() < 0.5 else rng.choice(vocabulary) for word in story_summaries[story_id]]
+        else:
+            words = [rng.choice(TERMS) if rng.random() < 0.05 else rng.choice(vocabulary)
+                     for _ in range(rng.randint(*summary_words))]
+            story_summaries.setdefault(story_id, words)
+        summary = " ".join(words)
+        news.append({
+            "title": title,
+            "link": f"https://news.example.com/{story_id}/{i}",
+            "source": rng.choice(SOURCES),
+            "publish_time": latest - timedelta(minutes=rng.randint(0, span_hours * 60)),
+            "summary": summary,
+            "content": f"<div><p>{summary}</p><p><a href=\"#\">{title}</a></p></div>",
+            "story_id": story_id
+        })
+    return news
+
+def to_rss(news, channel_title="Synthetic AI News"):
+    """
+    Renders news dicts as an RSS 2.0 document (what the feed stub serves).
+    """
+    entries = []
+    for item in news:
+        entries.append(
+            "<item>"
+            f"<title>{escape(item['title'])}</title>"
+            f"<link>{escape(item['link'])}</link>"
+            f"<pubDate>{format_datetime(item['publish_time'])}</pubDate>"
+            f"<description>{escape(item['summary'])}</description>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<rss version="2.0"><channel><title>{escape(channel_title)}</title>'
+        f"<link>https://news.example.com/</link><description>{escape(channel_title)}</description>"
+        f"{''.join(entries)}</channel></rss>"
+    )
+
+def write_feeds(news, directory, feed_count=4):
+    """
+    Splits news round-robin into feed_count RSS files in directory.
+    Returns the file names.
+    """
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for i in range(feed_count):
+        name = f"feed{i}.xml"
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(to_rss(news[i::feed_count], channel_title=f"Synthetic Feed {i}"))
+        names.append(name)
+    return names
@@ -0,0 +1,176 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+from benchmarks.corpus import generate_news
+
+# Usage: python -m benchmarks.fixtures.make_fixtures
+# Regenerates the feed fixtures in this directory. They are not checked in:
+# the benchmarks call fixture_paths, which writes any missing ones. They mirror
+# the markup of large feeds the notifier reads in the wild (long archives,
+# newest first):
+# - wordpress_rss2.xml: WordPress-style RSS 2.0 with CDATA descriptions,
+#   content:encoded bodies, dc:creator, categories, guid permalinks, mixed
+#   RFC 822 zones
+# - blogger_atom.xml: Blogger/Atom with html-typed titles and content,
+#   replies/self/alternate links, published and updated dates with offsets
+# - arxiv_rss1.xml: RSS 1.0 (RDF) with dc:date and no pubDate, rdf:Seq index
+# - broken_entities_rss2.xml: RSS 2.0 using undeclared HTML entities (&nbsp;),
+#   which only a forgiving parser reads (exercises the feedparser fallback)
+# Items come from benchmarks.corpus with fixed seeds, so the files only change
+# when the corpus generator does.
+
+FIXTURES_DIR = os.path.dirname(os.path.abspath(__file__))
+NEWEST = datetime(2026, 3, 2, 9, 30, tzinfo=timezone.utc)
+ZONES = [timezone.utc, timezone(timedelta(hours=8)), timezone(timedelta(hours=-5)), timezone(timedelta(hours=1))]
+
+def _dated_news(n, seed, step_minutes):
+    rng = random.Random(seed)
+    items = generate_news(n, seed=seed)
+    publish_time = NEWEST
+    for item in items:
+        item["publish_time"] = publish_time.astimezone(rng.choice(ZONES))
+        publish_time -= timedelta(minutes=rng.randint(step_minutes // 2, step_minutes * 3 // 2))
+    return items, rng
+
+def _paragraphs(rng, text, count):
+    words = text.split()
+    return "".join(
+        f"<p>{' '.join(rng.sample(words, min(len(words), 25)))} <a href=\"https://example.com/ref/{rng.randrange(10**6)}\">more</a></p>\n"
+        for _ in range(count)
+    )
+
+def wordpress_rss2(n=400):
+    items, rng = _dated_news(n, seed=101, step_minutes=240)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:wfw="http://wellformedweb.org/CommentAPI/" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:atom="http://www.w3.org/2005/Atom" xmlns:sy="http://purl.org/rss/1.0/modules/syndication/" '
+        'xmlns:slash="http://purl.org/rss/1.0/modules/slash/">\n<channel>\n'
+        '<title>AI Weekly &amp; Research Notes</title>\n'
+        '<atom:link href="https://blog.example.com/feed/" rel="self" type="application/rss+xml" />\n'
+        '<link>https://blog.example.com</link>\n<description>News on models, agents and AI infrastructure</description>\n'
+        f'<lastBuildDate>{format_datetime(NEWEST)}</lastBuildDate>\n<language>en-US</language>\n'
+        '<sy:updatePeriod>hourly</sy:updatePeriod>\n<sy:updateFrequency>1</sy:updateFrequency>\n'
+        '<generator>https://wordpress.org/?v=6.4.3</generator>\n'
+        '<image>\n<url>https://blog.example.com/icon.png</url>\n<title>AI Weekly &amp; Research Notes</title>\n'
+        '<link>https://blog.example.com</link>\n<width>32</width>\n<height>32</height>\n</image>\n'
+    ]
+    for i, item in enumerate(items):
+        post_id = 90000 - i
+        categories = "".join(f"<category><![CDATA[{word}]]></category>\n" for word in rng.sample(item["title"].split(), 3))
+        parts.append(
+            f"<item>\n<title>{escape(item['title'])}</title>\n"
+            f"<link>{item['link']}</link>\n"
+            f"<comments>{item['link']}#respond</comments>\n"
+            f"<dc:creator><![CDATA[Author {rng.randrange(40)}]]></dc:creator>\n"
+            f"<pubDate>{format_datetime(item['publish_time'])}</pubDate>\n{categories}"
+            f'<guid isPermaLink="false">https://blog.example.com/?p={post_id}</guid>\n'
+            f"<description><![CDATA[<p>{item['summary']}</p>\n<p>The post <a rel=\"nofollow\" href=\"{item['link']}\">"
+            f"{escape(item['title'])}</a> appeared first on AI Weekly.</p>]]></description>\n"
+            f"<content:encoded><![CDATA[{_paragraphs(rng, item['summary'], 6)}]]></content:encoded>\n"
+            f"<wfw:commentRss>{item['link']}feed/</wfw:commentRss>\n<slash:comments>{rng.randrange(30)}</slash:comments>\n"
+            "</item>\n"
+        )
+    parts.append("</channel>\n</rss>\n")
+    return "".join(parts)
+
+def blogger_atom(n=300):
+    items, rng = _dated_news(n, seed=202, step_minutes=360)
+    parts = [
+        "<?xml version='1.0' encoding='UTF-8'?>"
+        "<feed xmlns='http://www.w3.org/2005/Atom' xmlns:openSearch='http://a9.com/-/spec/opensearchrss/1.0/' "
+        "xmlns:thr='http://purl.org/syndication/thread/1.0'>"
+        f"<id>tag:blogger.com,1999:blog-1234567890</id><updated>{NEWEST.isoformat(timespec='milliseconds')}</updated>"
+        "<category term='machine learning'/><title type='text'>Research Blog</title>"
+        "<subtitle type='html'>Updates from the research team</subtitle>"
+        "<link rel='http://schemas.google.com/g/2005#feed' type='application/atom+xml' href='https://research.example.com/feeds/posts/default'/>"
+        "<link rel='self' type='application/atom+xml' href='https://research.example.com/feeds/posts/default'/>"
+        "<link rel='alternate' type='text/html' href='https://research.example.com/'/>"
+        "<author><name>Research Team</name><email>noreply@example.com</email></author>"
+        "<generator version='7.00' uri='http://www.blogger.com'>Blogger</generator>"
+        f"<openSearch:totalResults>{n}</openSearch:totalResults><openSearch:startIndex>1</openSearch:startIndex>"
+    ]
+    for i, item in enumerate(items):
+        published = item["publish_time"]
+        updated = published + timedelta(hours=rng.randint(0, 30))
+        title = escape(escape(item["title"])) # html-typed: markup escaped once more
+        parts.append(
+            f"<entry><id>tag:blogger.com,1999:blog-1234567890.post-{10**9 + i}</id>"
+            f"<published>{published.isoformat(timespec='milliseconds')}</published>"
+            f"<updated>{updated.isoformat(timespec='milliseconds')}</updated>"
+            f"<category scheme='http://www.blogger.com/atom/ns#' term='{escape(item['title'].split()[0])}'/>"
+            f"<title type='html'>{title}</title>"
+            f"<content type='html'>{escape(_paragraphs(rng, item['summary'], 8))}</content>"
+            f"<link rel='replies' type='application/atom+xml' href='{item['link']}/comments/default' title='Post Comments'/>"
+            f"<link rel='edit' type='application/atom+xml' href='https://www.blogger.com/feeds/1234567890/posts/default/{i}'/>"
+            f"<link rel='self' type='application/atom+xml' href='https://www.blogger.com/feeds/1234567890/posts/default/{i}'/>"
+            f"<link rel='alternate' type='text/html' href='{item['link']}' title='{escape(item['title'])}'/>"
+            "<author><name>Research Team</name><uri>http://www.blogger.com/profile/1</uri></author>"
+            f"<thr:total>{rng.randrange(10)}</thr:total></entry>"
+        )
+    parts.append("</feed>")
+    return "".join(parts)
+
+def arxiv_rss1(n=1000):
+    items, rng = _dated_news(n, seed=303, step_minutes=20)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:taxo="http://purl.org/rss/1.0/modules/taxonomy/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:syn="http://purl.org/rss/1.0/modules/syndication/" '
+        'xmlns:admin="http://webns.net/mvcb/">\n'
+        '<channel rdf:about="http://arxiv.example.org/rss/cs.AI">\n<title>cs.AI updates on arXiv.org</title>\n'
+        '<link>http://arxiv.example.org/</link>\n<description rdf:parseType="Literal">Computer Science -- Artificial Intelligence</description>\n'
+        f'<dc:date>{NEWEST.isoformat()}</dc:date>\n<syn:updatePeriod>daily</syn:updatePeriod>\n<items>\n<rdf:Seq>\n'
+    ]
+    parts.extend(f'<rdf:li rdf:resource="http://arxiv.example.org/abs/2603.{i:05d}" />\n' for i in range(n))
+    parts.append("</rdf:Seq>\n</items>\n</channel>\n")
+    for i, item in enumerate(items):
+        link = f"http://arxiv.example.org/abs/2603.{i:05d}"
+        parts.append(
+            f'<item rdf:about="{link}">\n<title>{escape(item["title"])}. (arXiv:2603.{i:05d}v1 [cs.AI])</title>\n'
+            f"<link>{link}</link>\n<description>&lt;p&gt;{escape(item['summary'])}&lt;/p&gt;</description>\n"
+            f"<dc:creator>&lt;a href=\"http://arxiv.example.org/find/cs/1/au:+Author_{rng.randrange(500)}\"&gt;"
+            f"Author {rng.randrange(500)}&lt;/a&gt;</dc:creator>\n"
+            f"<dc:date>{item['publish_time'].isoformat()}</dc:date>\n</item>\n"
+        )
+    parts.append("</rdf:RDF>\n")
+    return "".join(parts)
+
+def broken_entities_rss2(n=150):
+    feed = wordpress_rss2(n)
+    # Hand-written templates often paste HTML entities straight into titles
+    return feed.replace("</title>\n<link>https://news.", "&nbsp;&mdash;&nbsp;AI</title>\n<link>https://news.")
+
+FIXTURES = {
+    "wordpress_rss2.xml": wordpress_rss2,
+    "blogger_atom.xml": blogger_atom,
+    "arxiv_rss1.xml": arxiv_rss1,
+    "broken_entities_rss2.xml": broken_entities_rss2,
+}
+
+def _write_fixture(name, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(FIXTURES[name]())
+
+def fixture_paths():
+    """
+    Returns {name: path} for the fixtures, generating the missing ones first.
+    """
+    paths = {name: os.path.join(FIXTURES_DIR, name) for name in FIXTURES}
+    for name, path in paths.items():
+        if not os.path.exists(path):
+            _write_fixture(name, path)
+    return paths
+
+def main():
+    for name in FIXTURES:
+        path = os.path.join(FIXTURES_DIR, name)
+        _write_fixture(name, path)
+        print(f"{name}: {os.path.getsize(path) // 1024} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import json
+import re
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-ins for the external services the pipeline talks to, so
+# end-to-end benchmarks run offline and deterministically:
+# - a static file server for RSS feeds (see corpus.write_feeds)
+# - an OpenAI-compatible chat completions endpoint (scores and summaries)
+# - a Feishu webhook that accepts every card
+# Each server binds to a free local port and runs in a daemon thread.
+
+BATCH_ITEM_PATTERN = re.compile(r"^\[\d+\] Title:", re.MULTILINE)
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class _FeedHandler(SimpleHTTPRequestHandler):
+    latency = 0.0 # Simulated network latency per request (seconds)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+class _OpenAIHandler(_QuietHandler):
+    latency = 0.0 # Simulated model latency per request (seconds)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = request["messages"][-1]["content"]
+        time.sleep(self.latency)
+
+        if not request.get("response_format"):
+            content = "75" # Single-item score
+        elif '"scores"' in prompt:
+            content = json.dumps({"scores": [70] * len(BATCH_ITEM_PATTERN.findall(prompt))})
+        else:
+            content = json.dumps({
+                "title": "基准测试标题", "summary": "基准测试摘要。", "key_changes": ["变化一", "变化二"],
+                "source_name": "", "url": ""
+            }, ensure_ascii=False)
+
+        prompt_tokens = len(prompt) // 4
+        self._send_json({
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()), "model": request["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4, "total_tokens": prompt_tokens + len(content) // 4}
+        })
+
+class _FeishuHandler(_QuietHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send_json({"code": 0, "msg": "success"})
+
+def _serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def start_feed_server(directory, latency=0.0):
+    """
+    Serves the files in directory. Returns (server, base_url).
+    """
+    handler = type("FeedHandler", (_FeedHandler,), {"latency": latency})
+    return _serve(partial(handler, directory=directory))
+
+def start_openai_stub(latency=0.0):
+    """
+    Serves /v1/chat/completions. Returns (server, base_url ending in /v1).
+    """
+    handler = type("OpenAIHandler", (_OpenAIHandler,), {"latency": latency})
+    server, url = _serve(handler)
+    return server, f"{url}/v1"
+
+def start_feishu_stub():
+    """
+    Accepts webhook posts. Returns (server, webhook_url).
+    """
+    server, url = _serve(_FeishuHandler)
+    return server, f"{url}/open-apis/bot/v2/hook/bench"
@@ -1,31 +1,145 @@
+import asyncio
 import json
 import os
-from openai import OpenAI
-from src.config import AI_API_KEY, AI_MODEL, AI_PROVIDER, AI_BASE_URL
-from src.utils import setup_logger
+import re
+import threading
+import time
+from src.config import (
+    AI_API_KEY, AI_MODEL, AI_PROVIDER, AI_BASE_URL, AI_MAX_RETRIES, SUMMARY_TIMEOUT, SUMMARY_PROMPT_TOKENS,
+    SCORE_PROMPT_TOKENS
+)
+from src.utils import setup_logger, retry_with_backoff, retry_with_backoff_async
+from src.llm_cache import make_cache_key, cache_get, cache_set
+from src.metrics import record_llm_call, increment
+from src.normalize import summary_texts
+from src.prompt_packer import pack_texts, tokens_saved
 
 logger = setup_logger("ai_summary")
 
-client = None
-if AI_API_KEY:
-    if AI_BASE_URL:
-        client = OpenAI(api_key=AI_API_KEY, base_url=AI_BASE_URL)
-    elif AI_PROVIDER == "deepseek":
-        client = OpenAI(api_key=AI_API_KEY, base_url="https://api.deepseek.com")
-    else:
-        client = OpenAI(api_key=AI_API_KEY)
-else:
+# The OpenAI client (and the openai package, which takes most of a second to
+# import) is only loaded on the first actual request, so runs and tools that
+# never call the LLM start fast. The async pipeline (src/async_pipeline.py)
+# uses an AsyncOpenAI client instead; prompts, parsing and caching are shared.
+_client = None
+_client_lock = threading.Lock()
+_async_client = None
+_async_client_loop = None
+
+if not AI_API_KEY:
     logger.warning("AI_API_KEY not set. AI features will be disabled or mocked.")
 
-def get_ai_score(news_item):
+def get_client():
     """
-    Asks AI to score the importance of the news item (0-100).
+    Returns the shared OpenAI client, creating it on first use.
+    Returns None if AI_API_KEY is not set.
+    """
+    global _client
+    if not AI_API_KEY:
+        return None
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI
+            _client = OpenAI(**_client_options())
+        return _client
+
+def _client_options():
+    if AI_BASE_URL:
+        return {"api_key": AI_API_KEY, "base_url": AI_BASE_URL, "max_retries": 0}
+    if AI_PROVIDER == "deepseek":
+        return {"api_key": AI_API_KEY, "base_url": "https://api.deepseek.com", "max_retries": 0}
+    return {"api_key": AI_API_KEY, "max_retries": 0}
+
+def get_async_client():
+    """
+    Returns the AsyncOpenAI client for the running event loop, creating it on
+    first use (its connection pool belongs to the loop it was created on).
+    Returns None if AI_API_KEY is not set.
+    """
+    global _async_client, _async_client_loop
+    if not AI_API_KEY:
+        return None
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        from openai import AsyncOpenAI
+        _async_client = AsyncOpenAI(**_client_options())
+        _async_client_loop = loop
+    return _async_client
+
+def preload_openai():
+    """
+    Imports the openai package ahead of the first request. The async runner
+    calls this on a worker thread while feeds download, so the import is off
+    the critical path.
+    """
+    if AI_API_KEY:
+        import openai # noqa: F401
+
+async def close_async_client():
+    """
+    Closes the async client's connections (call before the event loop ends).
+    """
+    global _async_client, _async_client_loop
+    client, _async_client, _async_client_loop = _async_client, None, None
+    if client is not None:
+        await client.close()
+
+def is_retryable_error(e):
+    """
+    Rate limits, server errors, timeouts and connection errors are worth retrying.
+    """
+    from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+    if isinstance(e, (APITimeoutError, APIConnectionError, RateLimitError)):
+        return True
+    return isinstance(e, APIStatusError) and e.status_code >= 500
+
+def create_completion(**kwargs):
+    """
+    chat.completions.create with rate-limit aware exponential backoff.
+    Latency (including retries) and token usage are recorded in src.metrics.
+    """
+    start = time.perf_counter()
+    try:
+        response = retry_with_backoff(
+            lambda: get_client().chat.completions.create(model=AI_MODEL, **kwargs),
+            retries=AI_MAX_RETRIES,
+            should_retry=is_retryable_error
+        )
+    except Exception:
+        increment("llm_errors")
+        raise
+    record_llm_call(time.perf_counter() - start, getattr(response, "usage", None))
+    return response
+
+async def create_completion_async(**kwargs):
+    """
+    Async variant of create_completion (same backoff and metrics).
+    """
+    start = time.perf_counter()
+    try:
+        response = await retry_with_backoff_async(
+            lambda: get_async_client().chat.completions.create(model=AI_MODEL, **kwargs),
+            retries=AI_MAX_RETRIES,
+            should_retry=is_retryable_error
+        )
+    except Exception:
+        increment("llm_errors")
+        raise
+    record_llm_call(time.perf_counter() - start, getattr(response, "usage", None))
+    return response
+
+def _log_api_error(message, e):
+    logger.error(f"{message}: {e}")
+    # Log response body if available for debugging
+    if hasattr(e, 'response') and hasattr(e.response, 'text'):
+         logger.error(f"API Response: {e.response.text}")
+
+def _score_request(news_item):
+    """
+    Returns the score request for news_item and the prompt tokens packing saved.
     """
-    if not client:
-        return 50 # Default if no API key
-        
     title = news_item.get("title", "")
-    summary = " ".join(news_item.get("summaries", []))[:1000] # Truncate to save tokens
+    texts = summary_texts(news_item)
+    summary = pack_texts(texts, SCORE_PROMPT_TOKENS) # Plain text, packed into the token budget
     
     prompt = f"""
     Give this AI news item an importance score (0-100).
@@ -36,52 +150,150 @@ def get_ai_score(news_item):
     Summary: {summary}
     """
     
+    return {
+        "messages": [
+            {"role": "system", "content": "You are an AI news analyst. Output only a number between 0 and 100."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.1,
+        "max_tokens": 10
+    }, tokens_saved(texts, summary)
+
+def _store_score(cache_key, response):
+    content = response.choices[0].message.content.strip()
+    # Extract number
+    match = re.search(r'\d+', content)
+    if match:
+        score = int(match.group())
+        cache_set(cache_key, score)
+        return score
+    return 50
+
+def get_ai_score(news_item):
+    """
+    Asks AI to score the importance of the news item (0-100).
+    """
+    if not get_client():
+        return 50 # Default if no API key
+    
+    request, saved = _score_request(news_item)
+    cache_key = make_cache_key("score", request)
+    cached_score = cache_get(cache_key)
+    if cached_score is not None:
+        return cached_score
+    
+    increment("prompt_tokens_saved", saved)
     try:
-        response = client.chat.completions.create(
-            model=AI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an AI news analyst. Output only a number between 0 and 100."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=10
-        )
-        content = response.choices[0].message.content.strip()
-        # Extract number
-        import re
-        match = re.search(r'\d+', content)
-        if match:
-            return int(match.group())
+        return _store_score(cache_key, create_completion(**request))
+    except Exception as e:
+        _log_api_error("Error getting AI score", e)
         return 50
+
+async def get_ai_score_async(news_item):
+    """
+    Async variant of get_ai_score (same prompt, cache and fallbacks).
+    """
+    if not AI_API_KEY:
+        return 50 # Default if no API key
+    
+    request, saved = _score_request(news_item)
+    cache_key = make_cache_key("score", request)
+    cached_score = cache_get(cache_key)
+    if cached_score is not None:
+        return cached_score
+    
+    increment("prompt_tokens_saved", saved)
+    try:
+        return _store_score(cache_key, await create_completion_async(**request))
     except Exception as e:
-        logger.error(f"Error getting AI score: {e}")
-        # Log response body if available for debugging
-        if hasattr(e, 'response') and hasattr(e.response, 'text'):
-             logger.error(f"API Response: {e.response.text}")
+        _log_api_error("Error getting AI score", e)
         return 50
 
-def generate_summary(news_item):
+def get_ai_scores_batch(news_items):
     """
-    Generates a structured summary for the news item using AI.
-    Returns a dictionary with title, summary, key_changes, etc.
+    Scores several news items with a single request.
+    Returns a list of scores (0-100) in the same order.
+    Raises ValueError if the response can't be parsed into exactly one score per
+    item, so the caller can fall back to get_ai_score per item.
+    """
+    if not get_client():
+        return [50] * len(news_items) # Default if no API key
+    
+    # Only send the items we don't have a cached score for. Each item is keyed by
+    # the batch request for that item alone, so keys don't depend on the batching.
+    cache_keys = [make_cache_key("score_batch", _batch_score_request([item])[0]) for item in news_items]
+    scores = [cache_get(key) for key in cache_keys]
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if not missing:
+        return scores
+    
+    fresh_scores = _request_ai_scores_batch([news_items[i] for i in missing])
+    for i, score in zip(missing, fresh_scores):
+        scores[i] = score
+        cache_set(cache_keys[i], score)
+    return scores
+
+def _batch_score_request(news_items):
+    """
+    Returns the batch score request for news_items and the prompt tokens
+    packing saved.
+    """
+    items_text = []
+    saved = 0
+    for i, item in enumerate(news_items):
+        texts = summary_texts(item)
+        summary = pack_texts(texts, SCORE_PROMPT_TOKENS // 2)
+        saved += tokens_saved(texts, summary)
+        items_text.append(f"[{i}] Title: {item.get('title', '')}\n    Summary: {' '.join(summary.splitlines())}")
+    items_text = "\n\n".join(items_text)
+    
+    prompt = f"""
+    Give each of these {len(news_items)} AI news items an importance score (0-100).
+    Consider: Industry Impact, Technical Breakthrough, Company Influence.
+    Return JSON: {{"scores": [score for item 0, score for item 1, ...]}}
+    
+    {items_text}
+    """
+    
+    return {
+        "messages": [
+            {"role": "system", "content": "You are an AI news analyst. Respond with valid JSON only."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.1,
+        "max_tokens": 20 + 8 * len(news_items),
+        "response_format": {"type": "json_object"}
+    }, saved
+
+def _request_ai_scores_batch(news_items):
+    request, saved = _batch_score_request(news_items)
+    increment("prompt_tokens_saved", saved)
+    response = create_completion(**request)
+    scores = json.loads(response.choices[0].message.content).get("scores")
+    
+    if not isinstance(scores, list) or len(scores) != len(news_items):
+        raise ValueError(f"Expected {len(news_items)} scores, got: {scores}")
+    return [max(0, min(100, int(score))) for score in scores]
+
+def _summary_without_ai(news_item):
+    # Fallback to RSS summary if available (already plain text, see src.normalize)
+    fallback_summary = (summary_texts(news_item) or ["No summary available."])[0][:200] + "..."
+    
+    return {
+        "title": news_item.get("title", "No Title"),
+        "summary": f"[AI Key Missing] {fallback_summary}",
+        "key_changes": ["Configure AI_API_KEY to enable smart summaries"],
+        "source_name": news_item.get("source", "RSS Source"),
+        "url": news_item.get("link", "#")
+    }
+
+def _summary_request(news_item):
+    """
+    Returns the summary request for news_item and the prompt tokens packing saved.
     """
-    if not client:
-        # Fallback to RSS summary if available
-        fallback_summary = news_item.get("summaries", ["No summary available."])[0]
-        # Clean up HTML tags if simple
-        import re
-        fallback_summary = re.sub('<[^<]+?>', '', fallback_summary)[:200] + "..."
-        
-        return {
-            "title": news_item.get("title", "No Title"),
-            "summary": f"[AI Key Missing] {fallback_summary}",
-            "key_changes": ["Configure AI_API_KEY to enable smart summaries"],
-            "source_name": news_item.get("source", "RSS Source"),
-            "url": news_item.get("link", "#")
-        }
-        
     title = news_item.get("title", "")
-    summaries = "\n".join(news_item.get("summaries", []))
+    texts = summary_texts(news_item)
+    summaries = pack_texts(texts, SUMMARY_PROMPT_TOKENS) # Repeated sentences dropped, fits the budget
     sources = ", ".join(news_item.get("sources", []))
     
     prompt = f"""
@@ -122,26 +334,68 @@ def generate_summary(news_item):
        - Simplified Chinese.
     """
     
+    return {
+        "messages": [
+            {"role": "system", "content": "You are a helpful AI news assistant. Respond with valid JSON only."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.3,
+        "response_format": {"type": "json_object"},
+        "timeout": SUMMARY_TIMEOUT
+    }, tokens_saved(texts, summaries)
+
+def _store_summary(cache_key, response):
+    content = response.choices[0].message.content
+    summary_data = json.loads(content)
+    cache_set(cache_key, summary_data)
+    return summary_data
+
+def _failed_summary(news_item):
+    return {
+        "title": news_item.get("title", ""),
+        "summary": "Failed to generate summary.",
+        "key_changes": [],
+        "source_name": "Unknown",
+        "url": ""
+    }
+
+def generate_summary(news_item):
+    """
+    Generates a structured summary for the news item using AI.
+    Returns a dictionary with title, summary, key_changes, etc.
+    """
+    if not get_client():
+        return _summary_without_ai(news_item)
+    
+    request, saved = _summary_request(news_item)
+    cache_key = make_cache_key("summary", request)
+    cached_summary = cache_get(cache_key)
+    if cached_summary is not None:
+        return cached_summary
+    
+    increment("prompt_tokens_saved", saved)
     try:
-        response = client.chat.completions.create(
-            model=AI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful AI news assistant. Respond with valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
-        content = response.choices[0].message.content
-        return json.loads(content)
+        return _store_summary(cache_key, create_completion(**request))
+    except Exception as e:
+        _log_api_error("Error generating summary", e)
+        return _failed_summary(news_item)
+
+async def generate_summary_async(news_item):
+    """
+    Async variant of generate_summary (same prompt, cache and fallbacks).
+    """
+    if not AI_API_KEY:
+        return _summary_without_ai(news_item)
+    
+    request, saved = _summary_request(news_item)
+    cache_key = make_cache_key("summary", request)
+    cached_summary = cache_get(cache_key)
+    if cached_summary is not None:
+        return cached_summary
+    
+    increment("prompt_tokens_saved", saved)
+    try:
+        return _store_summary(cache_key, await create_completion_async(**request))
     except Exception as e:
-        logger.error(f"Error generating summary: {e}")
-        if hasattr(e, 'response') and hasattr(e.response, 'text'):
-             logger.error(f"API Response: {e.response.text}")
-        return {
-            "title": title,
-            "summary": "Failed to generate summary.",
-            "key_changes": [],
-            "source_name": "Unknown",
-            "url": ""
-        }
\ No newline at end of file
+        _log_api_error("Error generating summary", e)
+        return _failed_summary(news_item)
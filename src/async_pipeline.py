@@ -0,0 +1,140 @@
+import asyncio
+from functools import partial
+from src.config import AI_SCORE_MODE, AI_SCORE_CONCURRENCY, SUMMARY_CONCURRENCY, SUMMARY_STAGE_TIMEOUT
+from src.utils import setup_logger, run_concurrently, DeadlineExceeded
+from src.fetch_rss import fetch_rss_feeds_async
+from src.freshness_filter import iter_fresh_news
+from src.deduplicate import iter_unique_links
+from src.scoring import AI_SCORE_TOP_K, combine_scores, get_ai_scores
+from src.ai_summary import get_ai_score_async, generate_summary_async, close_async_client, preload_openai
+from src.feishu_sender import send_to_feishu_async
+from src.metrics import stage
+from src.pipeline import (
+    TIME_WINDOWS, log_configuration, build_candidates, pick_top_news, format_summary, record_delivery, log_completion
+)
+
+logger = setup_logger("async_pipeline")
+
+# asyncio runner for the pipeline (python -m src.main --async).
+# Almost all of a run is spent waiting on the network, so the network-bound
+# stages (feed fetch, AI scoring, summaries, Feishu) run as tasks on a single
+# event loop: LLM requests go through AsyncOpenAI, while feed downloads/parsing
+# and the webhook POST stay on the shared requests sessions in worker threads.
+# Work that doesn't depend on the fetch overlaps it: the openai package (most of
+# a second to import) is loaded on a worker thread while the feeds download.
+# The CPU-bound stages in between (freshness, dedup, merge, rule score, rank)
+# are the same src.pipeline functions the sync runner calls, and every stage is
+# timed the same way in src.metrics.
+# Each stage's requests run under src.utils.run_concurrently with the usual
+# limits and deadlines (FETCH_*, AI_SCORE_CONCURRENCY, SUMMARY_*): anything
+# still running at a deadline, or when the run is cancelled (Ctrl-C), is
+# cancelled and awaited, so no request outlives its stage.
+
+async def apply_ai_scores_async(candidates):
+    """
+    Async variant of apply_ai_scores: AI scores the top AI_SCORE_TOP_K
+    candidates concurrently (AI_SCORE_CONCURRENCY, or one at a time in serial
+    mode) and combines them with the Rule Score.
+    """
+    top_candidates = candidates[:AI_SCORE_TOP_K]
+    if AI_SCORE_MODE == "batch":
+        # A handful of large requests with a per-batch fallback: keep the sync implementation
+        ai_scores = await asyncio.to_thread(get_ai_scores, top_candidates)
+    else:
+        limit = AI_SCORE_CONCURRENCY if AI_SCORE_MODE == "concurrent" else 1
+        ai_scores = await run_concurrently([partial(get_ai_score_async, item) for item in top_candidates], limit)
+        for result in ai_scores:
+            if isinstance(result, Exception):
+                raise result
+    return combine_scores(candidates, ai_scores)
+
+async def summarize_item_async(item):
+    """
+    Async variant of summarize_item.
+    """
+    return format_summary(item, await generate_summary_async(item))
+
+async def summarize_news_async(top_news):
+    """
+    Async variant of summarize_news: at most SUMMARY_CONCURRENCY requests at a
+    time; items still running after SUMMARY_STAGE_TIMEOUT are cancelled and
+    dropped. Returns the summarized items in ranking order.
+    """
+    logger.info(f"Generating summaries for {len(top_news)} items")
+    results = await run_concurrently(
+        [partial(summarize_item_async, item) for item in top_news], SUMMARY_CONCURRENCY, timeout=SUMMARY_STAGE_TIMEOUT
+    )
+
+    summarized_news = []
+    for item, result in zip(top_news, results):
+        if isinstance(result, DeadlineExceeded):
+            logger.error(f"Summary timed out after {SUMMARY_STAGE_TIMEOUT}s for item '{item.get('title')}'. Skipping.")
+        elif isinstance(result, Exception):
+            logger.error(f"Error processing summary for item '{item.get('title')}': {result}")
+        else:
+            summarized_news.append(result)
+    return summarized_news
+
+async def run_pipeline_async(args):
+    """
+    Runs the same stages as run_pipeline on the running event loop.
+    With --stream, stale items and repeated links are dropped as soon as all
+    feeds are in (the async fetch already overlaps the downloads).
+    """
+    logger.info("Starting AI News Notifier Pipeline (asyncio)")
+    log_configuration()
+    preload = asyncio.ensure_future(asyncio.to_thread(preload_openai))
+
+    try:
+        # 1. Fetch
+        with stage("fetch") as timer:
+            all_news = await fetch_rss_feeds_async()
+            if args.stream:
+                news_stream = all_news
+                if not args.ignore_freshness:
+                    news_stream = iter_fresh_news(news_stream, hours=TIME_WINDOWS[-1])
+                all_news = list(iter_unique_links(news_stream))
+            timer.items_out = len(all_news)
+        if not all_news:
+            logger.info("No news fetched. Exiting.")
+            return
+
+        # 2.-5. Normalize, Freshness, Deduplicate, Merge, Rule Score (CPU-bound, same as the sync runner)
+        candidates = build_candidates(all_news, args)
+        if not candidates:
+            logger.info("No news found even after expanding time window. Exiting.")
+            return
+
+        # 5. AI Score
+        with stage("ai_score", items_in=len(candidates)) as timer:
+            await preload
+            scored_news = await apply_ai_scores_async(candidates)
+            timer.items_out = len(scored_news)
+
+        # 6. Rank
+        top_news = pick_top_news(scored_news)
+
+        # 7. Generate Summaries
+        with stage("summarize", items_in=len(top_news)) as timer:
+            summarized_news = await summarize_news_async(top_news)
+            timer.items_out = len(summarized_news)
+
+        # 8. Send to Feishu
+        if summarized_news:
+            with stage("send", items_in=len(summarized_news)) as timer:
+                if await send_to_feishu_async(summarized_news):
+                    timer.items_out = len(summarized_news)
+                    record_delivery(top_news, summarized_news)
+        else:
+            logger.warning("No summaries generated. Nothing to send.")
+
+        log_completion()
+    finally:
+        preload.cancel()
+        await close_async_client()
+
+def run_async(args):
+    """
+    Runs run_pipeline_async on a new event loop (the --async entry point).
+    """
+    asyncio.run(run_pipeline_async(args))
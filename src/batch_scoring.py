@@ -0,0 +1,91 @@
+import numpy as np
+from src.utils import setup_logger
+from src.source_index import get_source_tier, is_official_link
+from src.normalize import search_text
+from src.scoring import (
+    KEYWORD_MATCHER, SUBSTANCE_PATTERN, F_LOCAL_ONLY, F_LOCAL_CONTEXT, F_EVENT_STRENGTH, F_MARKETING, F_SUBSTANCE,
+    F_LANDING, F_TYPE_PRODUCT_MODEL_RELEASE, F_TYPE_CAPABILITY_STRATEGY, F_TIER1_COMPANY, F_TIER2_COMPANY, F_TIER3_COMPANY,
+    TYPE_PRODUCT_MODEL_RELEASE, TYPE_CAPABILITY_STRATEGY, TYPE_INDUSTRY_EVENT
+)
+
+logger = setup_logger("batch_scoring")
+
+# Batch rule scoring for large item sets (e.g. historical re-ranking runs).
+# The text-dependent signals of calculate_rule_score are extracted once per item
+# into an integer feature matrix (keyword class bitmask, numeric marketing
+# substance, official link, source tier); the reject rules, the type / company /
+# source tier points and the final blend are then evaluated for all rows at once
+# with NumPy instead of branching per item. The scores are identical to
+# calculate_rule_score (the rules are the same, only evaluated column-wise).
+# Keyword matching stays per item: it is string work that NumPy can't speed up.
+# Like calculate_rule_score, the costlier signals (number pattern, official link,
+# source tier) are only looked up where they can still change the score; other
+# rows keep 0 in those columns.
+
+COL_KEYWORDS = 0  # KEYWORD_MATCHER bitmask
+COL_NUMERIC = 1   # Marketing claim backed by a number (SUBSTANCE_PATTERN)
+COL_OFFICIAL = 2  # Official link (only needed without a landing keyword)
+COL_TIER = 3      # Source tier
+FEATURE_COLUMNS = 4
+
+def _item_features(item):
+    text = search_text(item)
+    keywords = KEYWORD_MATCHER.match(text)
+    # Rejected by keywords alone: the other signals can't change the score
+    if not keywords & F_EVENT_STRENGTH or (keywords & F_LOCAL_ONLY and keywords & F_LOCAL_CONTEXT):
+        return keywords, 0, 0, 0
+    numeric = bool(keywords & F_MARKETING and not keywords & F_SUBSTANCE and SUBSTANCE_PATTERN.search(text))
+    official = not keywords & F_LANDING and is_official_link(item.get("link", ""))
+    return keywords, numeric, official, get_source_tier(item)
+
+def extract_features(items):
+    """
+    Returns the (n, FEATURE_COLUMNS) int64 feature matrix of items.
+    """
+    rows = [_item_features(item) for item in items]
+    return np.array(rows, dtype=np.int64).reshape(len(rows), FEATURE_COLUMNS)
+
+def reject_masks(features):
+    """
+    Returns {reason: boolean mask} of the hard reject rules (in the order
+    calculate_rule_score checks them; an item can match several).
+    """
+    keywords = features[:, COL_KEYWORDS]
+    has = lambda bit: (keywords & bit) != 0
+    return {
+        "local": has(F_LOCAL_ONLY) & has(F_LOCAL_CONTEXT),
+        "weak_event": ~has(F_EVENT_STRENGTH),
+        "marketing": has(F_MARKETING) & ~has(F_SUBSTANCE) & (features[:, COL_NUMERIC] == 0),
+        "no_landing": ~has(F_LANDING) & (features[:, COL_OFFICIAL] == 0)
+    }
+
+def rule_scores(features):
+    """
+    Returns the rule score of every feature row (same values as calculate_rule_score).
+    """
+    keywords = features[:, COL_KEYWORDS]
+    tiers = features[:, COL_TIER]
+    has = lambda bit: (keywords & bit) != 0
+
+    news_type = np.select(
+        [has(F_TYPE_PRODUCT_MODEL_RELEASE), has(F_TYPE_CAPABILITY_STRATEGY)],
+        [TYPE_PRODUCT_MODEL_RELEASE, TYPE_CAPABILITY_STRATEGY],
+        TYPE_INDUSTRY_EVENT
+    )
+    company = np.select([has(F_TIER1_COMPANY), has(F_TIER2_COMPANY), has(F_TIER3_COMPANY)], [5, 3, 1], -10)
+    source = np.select([tiers == 1, tiers == 2], [5, 3], 1)
+    scores = np.clip((news_type + company + source) * 5, 0, 100)
+
+    masks = reject_masks(features)
+    rejected = np.zeros(len(features), dtype=bool)
+    for reason, mask in masks.items():
+        rejected |= mask
+        logger.debug(f"Rule reject '{reason}': {int(mask.sum())} items")
+    scores[rejected] = 0
+    return scores
+
+def batch_rule_scores(items):
+    """
+    Returns the rule scores of items as a list of ints.
+    """
+    return rule_scores(extract_features(items)).tolist()
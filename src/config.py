@@ -1,8 +1,12 @@
 import os
-from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
-load_dotenv()
+# (python-dotenv is only imported when there is one to load)
+for _env_path in (os.path.join(os.getcwd(), ".env"), os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")):
+    if os.path.isfile(_env_path):
+        from dotenv import load_dotenv
+        load_dotenv(_env_path)
+        break
 
 # RSS Feeds Configuration (PRD v1.5)
 
@@ -45,6 +49,31 @@ if not RSS_FEEDS:
 else:
     RSS_FEEDS = RSS_FEEDS.split(",")
 
+# Fetch Settings
+FETCH_TIMEOUT = int(os.getenv("FETCH_TIMEOUT", "30").strip() or "30") # Per-request timeout (seconds)
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8").strip() or "8") # 1 = sequential
+FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", "2").strip() or "2")
+FETCH_DEADLINE = int(os.getenv("FETCH_DEADLINE", "120").strip() or "120") # Whole fetch stage (seconds)
+
+# Shared HTTP Client (feeds and Feishu webhook)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "20").strip() or "20") # Hosts kept in the pool
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10").strip() or "10") # Keep-alive connections per host
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3").strip() or "3")
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5").strip() or "0.5")
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", "10485760").strip() or "10485760") # Per feed response (10 MB, 0 = no cap)
+
+# Feed Parsing
+FEED_PARSER = os.getenv("FEED_PARSER", "fast").strip().lower() or "fast" # fast (streaming, falls back to feedparser) or feedparser
+FEED_EARLY_STOP_ENTRIES = int(os.getenv("FEED_EARLY_STOP_ENTRIES", "20").strip() or "20") # Stop reading a feed after this many stale entries in a row (0 = read it all)
+AVAILABLE_CORES = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1) # Respects CPU affinity / cpusets
+PARSE_WORKERS = os.getenv("PARSE_WORKERS", "0").strip().lower() or "0"
+PARSE_WORKERS = AVAILABLE_CORES if PARSE_WORKERS == "auto" else int(PARSE_WORKERS) # Parse worker processes (0 = parse in the fetch threads, auto = one per core)
+
+# Feed Cache (Conditional GET). Set FEED_CACHE_DIR to empty to disable.
+FEED_CACHE_DIR = os.getenv("FEED_CACHE_DIR", ".cache/feeds").strip()
+FEED_CACHE_MAX_AGE_HOURS = int(os.getenv("FEED_CACHE_MAX_AGE_HOURS", "168").strip() or "168")
+FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "500").strip() or "500")
+
 # Company Priorities (PRD v1.5)
 # P0 Global
 P0_GLOBAL = ["OpenAI", "Google", "Microsoft", "Anthropic", "Meta"]
@@ -69,12 +98,60 @@ FRESHNESS_HOURS = int(os.getenv("FRESHNESS_HOURS", "24").strip() or "24")
 
 # Deduplication Settings
 SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.8").strip() or "0.8")
+# Title candidates for difflib comparisons: "words" (titles sharing two word keys)
+# or "none" (every title, same result as comparing every pair; slower on large windows)
+SIMILARITY_BLOCKING = os.getenv("SIMILARITY_BLOCKING", "words").strip().lower()
+
+# Merge Settings
+MERGE_STRATEGY = os.getenv("MERGE_STRATEGY", "components").strip().lower() # components or greedy
+
+# Similarity Mode for Dedup/Merge: "difflib" (SequenceMatcher on titles) or
+# "embedding" (local hashing-vectorizer embeddings + cosine similarity, needs numpy)
+SIMILARITY_MODE = os.getenv("SIMILARITY_MODE", "difflib").strip().lower()
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "512").strip() or "512")
+EMBEDDING_SUMMARY_WEIGHT = float(os.getenv("EMBEDDING_SUMMARY_WEIGHT", "1.0").strip() or "1.0")
+EMBEDDING_DEDUP_THRESHOLD = float(os.getenv("EMBEDDING_DEDUP_THRESHOLD", "0.5").strip() or "0.5")
+EMBEDDING_MERGE_THRESHOLD = float(os.getenv("EMBEDDING_MERGE_THRESHOLD", "0.35").strip() or "0.35")
 
 # Scoring Settings
 AI_PROVIDER = os.getenv("AI_PROVIDER", "openai").strip().strip('"').strip("'").lower() # openai or deepseek
 AI_API_KEY = os.getenv("AI_API_KEY", "").strip().strip('"').strip("'")
 AI_BASE_URL = os.getenv("AI_BASE_URL", "").strip().strip('"').strip("'")
 AI_MODEL = os.getenv("AI_MODEL", "gpt-4o").strip().strip('"').strip("'") 
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "3").strip() or "3") # Retries on 429/5xx/timeouts, with backoff
+
+# AI Scoring Mode: serial, concurrent (thread pool) or batch (N items per prompt)
+AI_SCORE_MODE = os.getenv("AI_SCORE_MODE", "concurrent").strip().lower()
+AI_SCORE_CONCURRENCY = int(os.getenv("AI_SCORE_CONCURRENCY", "5").strip() or "5")
+AI_SCORE_BATCH_SIZE = int(os.getenv("AI_SCORE_BATCH_SIZE", "10").strip() or "10")
+# Rule score this many (or more) items as one NumPy batch instead of one by one (0 = never)
+BATCH_SCORING_MIN_ITEMS = int(os.getenv("BATCH_SCORING_MIN_ITEMS", "2000").strip() or "2000")
+
+# LLM Response Cache (SQLite). Set LLM_CACHE_PATH to empty to disable.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3").strip()
+LLM_CACHE_TTL_HOURS = int(os.getenv("LLM_CACHE_TTL_HOURS", "168").strip() or "168")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000").strip() or "5000")
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").strip().lower() in ("1", "true", "yes")
+
+# Seen-Items History (SQLite). Set HISTORY_DB_PATH to empty to disable.
+# HISTORY_SKIP: which known items are dropped on later runs:
+# "sent" (already pushed to Feishu, default), "processed" (seen by any earlier run) or "none".
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", ".cache/history.sqlite3").strip()
+HISTORY_SKIP = os.getenv("HISTORY_SKIP", "sent").strip().lower()
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "30").strip() or "30")
+
+# Summary Generation
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "5").strip() or "5")
+SUMMARY_TIMEOUT = int(os.getenv("SUMMARY_TIMEOUT", "60").strip() or "60") # Per request (seconds)
+SUMMARY_STAGE_TIMEOUT = int(os.getenv("SUMMARY_STAGE_TIMEOUT", "180").strip() or "180") # Whole stage (seconds)
+# Prompt budgets in estimated tokens (see src/prompt_packer.py; 0 = no limit, repeated sentences are still dropped).
+# Batch scoring gives each item half of SCORE_PROMPT_TOKENS.
+SUMMARY_PROMPT_TOKENS = int(os.getenv("SUMMARY_PROMPT_TOKENS", "800").strip() or "800")
+SCORE_PROMPT_TOKENS = int(os.getenv("SCORE_PROMPT_TOKENS", "250").strip() or "250")
+
+# Run Metrics (empty paths disable the output; see also --report / --prometheus)
+METRICS_REPORT_PATH = os.getenv("METRICS_REPORT_PATH", "").strip()
+METRICS_PROMETHEUS_PATH = os.getenv("METRICS_PROMETHEUS_PATH", "").strip()
 
 # Ranking Settings
 TOP_N = int(os.getenv("TOP_N", "5").strip() or "5")
@@ -1,6 +1,10 @@
 from difflib import SequenceMatcher
 from src.utils import setup_logger
-from src.config import SIMILARITY_THRESHOLD
+from src.similarity_index import TitleIndex
+from src.history_store import is_known_link, is_known_fingerprint
+from src.normalize import normalized
+from src.metrics import increment
+from src.config import SIMILARITY_THRESHOLD, SIMILARITY_BLOCKING, SIMILARITY_MODE, EMBEDDING_DEDUP_THRESHOLD
 
 logger = setup_logger("deduplicate")
 
@@ -10,38 +14,100 @@ def is_similar(title1, title2):
     """
     return SequenceMatcher(None, title1, title2).ratio() > SIMILARITY_THRESHOLD
 
-def deduplicate_news(news_list):
+def _title_matcher(news_list, known_news):
+    # Index of kept (normalized) titles to check similarity against
+    seen_titles = TitleIndex(SIMILARITY_BLOCKING)
+    
+    def keep(position, item):
+        seen_titles.add(item["title_norm"], item)
+    
+    for item in known_news:
+        keep(None, item)
+    
+    def is_duplicate(position, item):
+        for seen_title, _ in seen_titles.find_similar(item["title_norm"], SIMILARITY_THRESHOLD):
+            # logger.debug(f"Duplicate title found: '{item.get('title')}' similar to '{seen_title}'")
+            return True
+        return False
+    
+    return is_duplicate, keep
+
+def _embedding_matcher(news_list, known_news):
+    from src.embeddings import embed_items, any_similar, EarlierSimilar
+    vectors = embed_items(news_list)
+    similar_to_known = any_similar(vectors, embed_items(known_news), EMBEDDING_DEDUP_THRESHOLD)
+    similar_earlier = EarlierSimilar(vectors, EMBEDDING_DEDUP_THRESHOLD)
+    kept = [False] * len(news_list)
+    
+    def is_duplicate(position, item):
+        return bool(similar_to_known[position]) or any(kept[i] for i in similar_earlier(position))
+    
+    def keep(position, item):
+        kept[position] = True
+    
+    return is_duplicate, keep
+
+def deduplicate_news(news_list, known_news=None):
     """
     Removes duplicate news items based on link and title similarity.
+    If known_news (already deduplicated items) is given, new items are also
+    checked against it and only the newly admitted unique items are returned.
+    
+    Normalized titles (see src.normalize) are only compared against the
+    candidates a title index selects (see src.similarity_index), so this
+    stays fast for large windows; with SIMILARITY_BLOCKING=none the result is
+    the same as comparing every pair. With SIMILARITY_MODE=embedding, items are compared by the cosine
+    similarity of their local embeddings instead (see src.embeddings). Items whose
+    link or title fingerprint is known from earlier runs (src.history_store)
+    are dropped with a set lookup.
     """
+    known_news = [normalized(item) for item in known_news or []]
+    news_list = [normalized(item) for item in news_list]
     unique_news = []
-    seen_links = set()
-    seen_titles = [] # List of (title, news_item) to check similarity against
+    seen_links = set(item.get("link") for item in known_news)
+    known_from_history = 0
+    
+    if SIMILARITY_MODE == "embedding":
+        is_duplicate, keep = _embedding_matcher(news_list, known_news)
+    else:
+        is_duplicate, keep = _title_matcher(news_list, known_news)
     
     logger.info(f"Starting deduplication on {len(news_list)} items")
     
-    for item in news_list:
+    for position, item in enumerate(news_list):
         link = item.get("link")
-        title = item.get("title")
         
         # Check exact link match
         if link in seen_links:
             continue
         
-        # Check title similarity
-        is_duplicate = False
-        for seen_title, _ in seen_titles:
-            if is_similar(title, seen_title):
-                is_duplicate = True
-                # logger.debug(f"Duplicate title found: '{title}' similar to '{seen_title}'")
-                break
+        # Check history of earlier runs
+        if is_known_link(link) or is_known_fingerprint(item["title_fp"]):
+            known_from_history += 1
+            continue
         
-        if is_duplicate:
+        # Check title similarity
+        if is_duplicate(position, item):
             continue
             
         seen_links.add(link)
-        seen_titles.append((title, item))
+        keep(position, item)
         unique_news.append(item)
         
+    if known_from_history:
+        increment("history_skipped_at_dedup", known_from_history)
     logger.info(f"Deduplication complete. Removed {len(news_list) - len(unique_news)} duplicates. Remaining: {len(unique_news)}")
     return unique_news
+
+def iter_unique_links(news_iter):
+    """
+    Streaming link-level dedup: yields only the first item seen for each link.
+    Title similarity is still checked later by deduplicate_news.
+    """
+    seen_links = set()
+    for item in news_iter:
+        link = item.get("link")
+        if link in seen_links:
+            continue
+        seen_links.add(link)
+        yield item
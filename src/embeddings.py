@@ -0,0 +1,97 @@
+import zlib
+import numpy as np
+from src.similarity_index import TOKEN_PATTERN
+from src.normalize import summary_texts
+from src.config import EMBEDDING_DIM, EMBEDDING_SUMMARY_WEIGHT
+
+# Local, network-free text embeddings for SIMILARITY_MODE=embedding.
+# A hashing vectorizer maps the words of a title into EMBEDDING_DIM signed
+# buckets and adds the lead of the summary (EMBEDDING_SUMMARY_WEIGHT), so
+# stories titled in different words but describing the same thing (same names,
+# numbers and details) still land close together.
+# Vectors are unit length, so cosine similarity is a dot product and a whole
+# batch of comparisons is one matrix product. Each item's vector is cached on
+# the item ("embedding") so later stages and wider windows reuse it.
+
+SUMMARY_WORDS = 60
+BLOCK_SIZE = 256 # Query rows per matrix product (bounds the similarity block's memory)
+
+def _hashed_vector(text, out, weight):
+    features = TOKEN_PATTERN.findall((text or "").lower())
+    if not features:
+        return
+    counts = {}
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        # Low bits pick the bucket, one high bit the sign (keeps collisions unbiased)
+        bucket = h % EMBEDDING_DIM
+        counts[bucket] = counts.get(bucket, 0.0) + (1.0 if h & 0x80000000 else -1.0)
+    buckets = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    values = np.sign(values) * np.log1p(np.abs(values)) # Sublinear term frequency
+    norm = np.linalg.norm(values)
+    if norm:
+        out[buckets] += weight * values / norm
+
+def _summary_lead(item):
+    texts = summary_texts(item) # Plain text, see src.normalize
+    return " ".join(texts[0].split()[:SUMMARY_WORDS]) if texts else ""
+
+def embed_text(title, summary=""):
+    """
+    Returns the unit-length embedding of a title (plus summary lead).
+    """
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    _hashed_vector(title, vector, 1.0)
+    if summary and EMBEDDING_SUMMARY_WEIGHT:
+        _hashed_vector(summary, vector, EMBEDDING_SUMMARY_WEIGHT)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def embed_items(items):
+    """
+    Returns an (n, EMBEDDING_DIM) matrix of item embeddings, computing and
+    caching them on the items that don't have one yet.
+    """
+    matrix = np.empty((len(items), EMBEDDING_DIM), dtype=np.float32)
+    for row, item in enumerate(items):
+        vector = item.get("embedding")
+        if vector is None:
+            vector = embed_text(item.get("title", ""), _summary_lead(item))
+            item["embedding"] = vector
+        matrix[row] = vector
+    return matrix
+
+def any_similar(queries, keys, threshold):
+    """
+    Returns a boolean array: True where a query row has similarity >= threshold
+    with at least one key row. Computed BLOCK_SIZE query rows at a time.
+    """
+    result = np.zeros(len(queries), dtype=bool)
+    if len(queries) and len(keys):
+        for start in range(0, len(queries), BLOCK_SIZE):
+            result[start:start + BLOCK_SIZE] = (queries[start:start + BLOCK_SIZE] @ keys.T >= threshold).any(axis=1)
+    return result
+
+class EarlierSimilar:
+    """
+    Answers "which earlier rows are similar to row p" for a matrix of item
+    embeddings, in increasing p. Similarities are computed one block of
+    BLOCK_SIZE rows at a time (one matrix product against all earlier rows), so
+    memory stays at BLOCK_SIZE x n.
+    """
+    def __init__(self, vectors, threshold):
+        self.vectors = vectors
+        self.threshold = threshold
+        self.block_start = None
+        self.block = None
+
+    def __call__(self, position):
+        """
+        Returns the ids of rows before position with similarity >= threshold.
+        """
+        if self.block_start is None or not self.block_start <= position < self.block_start + BLOCK_SIZE:
+            self.block_start = position - position % BLOCK_SIZE
+            end = min(self.block_start + BLOCK_SIZE, len(self.vectors))
+            self.block = self.vectors[self.block_start:end] @ self.vectors[:end].T >= self.threshold
+        return np.flatnonzero(self.block[position - self.block_start, :position])
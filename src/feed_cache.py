@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from src.utils import setup_logger
+from src.models import NewsItem
+from src.config import FEED_CACHE_DIR, FEED_CACHE_MAX_AGE_HOURS, FEED_CACHE_MAX_ENTRIES
+
+logger = setup_logger("feed_cache")
+
+# On-disk HTTP validator cache for RSS feeds.
+# One JSON file per feed URL holding the ETag / Last-Modified validators
+# and the already-parsed news items, so a 304 skips download AND parsing.
+
+def _cache_path(feed_url):
+    key = hashlib.sha1(feed_url.encode("utf-8")).hexdigest()
+    return os.path.join(FEED_CACHE_DIR, f"{key}.json")
+
+def load_cached_feed(feed_url):
+    """
+    Returns the cache entry for a feed ({"etag", "last_modified", "items", ...}),
+    or None if caching is disabled or nothing usable is stored.
+    """
+    if not FEED_CACHE_DIR:
+        return None
+
+    path = _cache_path(feed_url)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        entry["items"] = [
+            NewsItem(**{**item, "publish_time": datetime.fromisoformat(item["publish_time"]) if item.get("publish_time") else None})
+            for item in entry.get("items", [])
+        ]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache entry for {feed_url}: {e}")
+        return None
+    return entry
+
+def request_headers(entry):
+    """
+    Builds conditional GET headers from a cache entry.
+    """
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def save_cached_feed(feed_url, etag, last_modified, items, max_entry_age_hours=None):
+    """
+    Stores validators and parsed items for a feed.
+    Feeds that send neither ETag nor Last-Modified are not cached.
+    max_entry_age_hours records the freshness window the items were cut to
+    (None if the feed was parsed in full).
+    """
+    if not FEED_CACHE_DIR or not (etag or last_modified):
+        return
+
+    entry = {
+        "url": feed_url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "stored_at": time.time(),
+        "max_entry_age_hours": max_entry_age_hours,
+        "items": [
+            {**dict(item), "publish_time": item["publish_time"].isoformat() if item.get("publish_time") else None}
+            for item in items
+        ]
+    }
+
+    try:
+        os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+        path = _cache_path(feed_url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path) # Atomic, so concurrent fetch workers never see half-written files
+    except Exception as e:
+        logger.warning(f"Failed to cache feed {feed_url}: {e}")
+
+def touch_cached_feed(feed_url):
+    """
+    Marks a cache entry as recently used (after a 304) so eviction keeps it.
+    """
+    try:
+        os.utime(_cache_path(feed_url))
+    except OSError:
+        pass
+
+def invalidate_feed(feed_url):
+    """
+    Drops the cache entry for a single feed. Returns True if one existed.
+    """
+    if not FEED_CACHE_DIR:
+        return False
+    try:
+        os.remove(_cache_path(feed_url))
+        logger.info(f"Invalidated cache for {feed_url}")
+        return True
+    except FileNotFoundError:
+        return False
+
+def evict_feed_cache():
+    """
+    Removes entries unused for FEED_CACHE_MAX_AGE_HOURS, then the least
+    recently used ones beyond FEED_CACHE_MAX_ENTRIES.
+    """
+    if not FEED_CACHE_DIR or not os.path.isdir(FEED_CACHE_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(FEED_CACHE_DIR):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(FEED_CACHE_DIR, name)
+        try:
+            entries.append((os.path.getmtime(path), path))
+        except OSError:
+            continue
+
+    cutoff = time.time() - FEED_CACHE_MAX_AGE_HOURS * 3600
+    entries.sort(reverse=True) # Most recently used first
+    expired = [path for i, (mtime, path) in enumerate(entries) if mtime < cutoff or i >= FEED_CACHE_MAX_ENTRIES]
+
+    for path in expired:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    if expired:
+        logger.info(f"Evicted {len(expired)} feed cache entries")
+    return len(expired)
+
+if __name__ == "__main__":
+    # Usage: python -m src.feed_cache --invalidate <feed_url> | --evict
+    if len(sys.argv) == 3 and sys.argv[1] == "--invalidate":
+        invalidate_feed(sys.argv[2])
+    elif len(sys.argv) == 2 and sys.argv[1] == "--evict":
+        evict_feed_cache()
+    else:
+        print("Usage: python -m src.feed_cache --invalidate <feed_url> | --evict")
@@ -0,0 +1,233 @@
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from src.config import FEED_EARLY_STOP_ENTRIES
+
+# Fast-path streaming parser for RSS 2.0, RSS 1.0 (RDF) and Atom feeds.
+# The response body is fed to an incremental XML parser chunk by chunk while
+# it downloads, and only the fields the pipeline uses are extracted (title,
+# link, publish time, summary, feed title); the full content HTML is skipped
+# unless an entry has no summary. Finished entries are dropped from the tree
+# right away, so memory stays flat on large feeds.
+# With a maximum entry age, entries older than that before the newest entry
+# seen so far in the feed are skipped (they can't survive any freshness
+# window, see iter_fresh_news), and reading stops after FEED_EARLY_STOP_ENTRIES
+# consecutive stale entries: feeds list newest first, so the rest of the body
+# is history the run would throw away.
+# Anything the fast path doesn't model (malformed XML, HTML entities, unknown
+# root elements, xhtml content, xml:base, unparseable dates) is reported as an
+# error so the caller can parse the whole body with feedparser instead.
+# Publish times match what fetch_feed derives from feedparser's
+# published_parsed / updated_parsed (UTC, converted the same way). Summaries are
+# not HTML-sanitized; they only feed prompts and keyword scoring.
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS10_NS = "http://purl.org/rss/1.0/"
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+DCTERMS_NS = "http://purl.org/dc/terms/"
+XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+
+# Elements in these namespaces (or none) are the core feed vocabulary
+CORE_NAMESPACES = ("", ATOM_NS, RSS10_NS)
+ENTRY_TAGS = ("item", "entry")
+FEED_TAGS = ("channel", "feed")
+PUBLISHED_TAGS = (("", "pubDate"), ("", "published"), (DCTERMS_NS, "issued"))
+UPDATED_TAGS = (("", "updated"), (DC_NS, "date"), (DCTERMS_NS, "modified"))
+
+class FeedFormatError(Exception):
+    """
+    Input the fast path doesn't handle; parse it with feedparser instead.
+    """
+
+def _split_tag(tag):
+    if tag[0] == "{":
+        namespace, local = tag[1:].split("}", 1)
+        return ("" if namespace in CORE_NAMESPACES else namespace), local
+    return "", tag
+
+def parse_date(value):
+    """
+    Parses an RFC 822 or ISO 8601 date into the naive datetime fetch_feed
+    derives from feedparser's UTC struct_time. Raises FeedFormatError if the
+    date can't be parsed.
+    """
+    value = (value or "").strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        parsed = None
+    if parsed is None:
+        try:
+            parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value)
+        except ValueError:
+            raise FeedFormatError(f"Unsupported date: {value!r}") from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return datetime.fromtimestamp(time.mktime(parsed.utctimetuple()))
+
+class StreamingFeedParser:
+    """
+    Incremental feed parser: feed() it the body chunk by chunk, then close().
+
+    feed() returns False once the parser needs no more input (early stop).
+    close() returns (feed_title, entries), each entry a dict with title, link,
+    summary and publish_time (None if the entry has no date), or None if the
+    fast path failed (see .error) and the body should go to feedparser.
+    """
+    def __init__(self, max_entry_age_hours=None, early_stop_entries=FEED_EARLY_STOP_ENTRIES):
+        self.max_entry_age = timedelta(hours=max_entry_age_hours) if max_entry_age_hours else None
+        self.early_stop_entries = early_stop_entries
+        self.feed_title = None
+        self.entries = []
+        self.error = None
+        self.stopped_early = False
+        self.stale_skipped = 0
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack = []
+        self._entry = None
+        self._entry_depth = None
+        self._newest = None
+        self._stale_run = 0
+
+    def feed(self, chunk):
+        """
+        Parses the next chunk. Returns False once no more input is needed.
+        After an error it keeps returning True, so the caller reads the whole
+        body for the feedparser fallback.
+        """
+        if self.stopped_early:
+            return False
+        if self.error is None:
+            try:
+                self._parser.feed(chunk)
+                self._handle_events()
+            except (ET.ParseError, FeedFormatError) as e:
+                self.error = e
+        return not self.stopped_early
+
+    def close(self):
+        """
+        Returns (feed_title, entries), or None if the fast path failed.
+        """
+        if self.error is None and not self.stopped_early:
+            try:
+                self._parser.close()
+                self._handle_events()
+                if not self._stack and self.feed_title is None and not self.entries:
+                    raise FeedFormatError("No feed found")
+            except (ET.ParseError, FeedFormatError) as e:
+                self.error = e
+        if self.error is not None:
+            return None
+        return self.feed_title, self.entries
+
+    def _handle_events(self):
+        for event, elem in self._parser.read_events():
+            if self.stopped_early:
+                return
+            if event == "start":
+                self._start(elem)
+            else:
+                self._end(elem)
+
+    def _start(self, elem):
+        if XML_BASE in elem.attrib:
+            raise FeedFormatError("xml:base is not supported")
+        namespace, local = _split_tag(elem.tag)
+        if not self._stack and local not in ("rss", "RDF", "feed"):
+            raise FeedFormatError(f"Not a feed: <{local}>")
+        if self._entry is None and namespace == "" and local in ENTRY_TAGS:
+            self._entry = {}
+            self._entry_depth = len(self._stack)
+        self._stack.append(elem)
+
+    def _end(self, elem):
+        self._stack.pop()
+        namespace, local = _split_tag(elem.tag)
+        depth = len(self._stack)
+
+        if self._entry is None:
+            parent = _split_tag(self._stack[-1].tag) if self._stack else None
+            if (namespace, local) == ("", "title") and parent and parent[0] == "" and parent[1] in FEED_TAGS:
+                self.feed_title = (elem.text or "").strip()
+            if depth and (namespace, local) != ("", "title") and parent[1] in FEED_TAGS + ("rss", "RDF"):
+                # Feed-level metadata is done with; keep the tree small
+                self._stack[-1].remove(elem)
+            return
+
+        if depth == self._entry_depth + 1:
+            self._entry_field(namespace, local, elem)
+        elif depth == self._entry_depth:
+            self._finish_entry()
+            if self._stack:
+                self._stack[-1].remove(elem)
+
+    def _entry_field(self, namespace, local, elem):
+        entry = self._entry
+        key = (namespace, local)
+        if local in ("summary", "content") and elem.get("type") == "xhtml":
+            raise FeedFormatError("xhtml content is not supported")
+
+        if key == ("", "title"):
+            entry["title"] = elem.text or ""
+        elif key == ("", "link"):
+            href = elem.get("href")
+            if href is not None:
+                if elem.get("rel", "alternate") == "alternate" and "link" not in entry:
+                    entry["link"] = href
+            elif elem.text and "link" not in entry:
+                entry["link"] = elem.text
+        elif key == ("", "guid"):
+            if elem.get("isPermaLink", "true") != "false":
+                entry["guid"] = elem.text or ""
+        elif key in (("", "description"), ("", "summary")):
+            entry.setdefault("summary", elem.text or "")
+        elif key in ((CONTENT_NS, "encoded"), ("", "content")):
+            entry.setdefault("content", elem.text or "")
+        elif key in PUBLISHED_TAGS:
+            entry.setdefault("published", elem.text)
+        elif key in UPDATED_TAGS:
+            entry.setdefault("updated", elem.text)
+
+    def _finish_entry(self):
+        entry, self._entry = self._entry, None
+        date = entry.get("published") or entry.get("updated")
+        publish_time = parse_date(date) if date else None
+
+        if publish_time and self.max_entry_age:
+            if self._newest is None or publish_time > self._newest:
+                self._newest = publish_time
+            if publish_time < self._newest - self.max_entry_age:
+                self.stale_skipped += 1
+                self._stale_run += 1
+                if self.early_stop_entries and self._stale_run >= self.early_stop_entries:
+                    self.stopped_early = True
+                return
+            self._stale_run = 0
+
+        self.entries.append({
+            "title": (entry.get("title") or "").strip(),
+            "link": (entry.get("link") or entry.get("guid") or "").strip(),
+            "summary": (entry.get("summary") or entry.get("content") or "").strip(),
+            "publish_time": publish_time
+        })
+
+def feed_content(parser, content, chunk_size=65536):
+    """
+    Feeds a complete body to parser in chunk_size slices (as it would arrive
+    from get_limited), stopping as soon as the parser is done. Returns parser.
+    """
+    for start in range(0, len(content), chunk_size):
+        if not parser.feed(content[start:start + chunk_size]):
+            break
+    return parser
+
+def parse_feed(content, max_entry_age_hours=None):
+    """
+    Parses a complete feed body with the fast path. Returns
+    (feed_title, entries) or None if it should go to feedparser instead.
+    """
+    return feed_content(StreamingFeedParser(max_entry_age_hours), content).close()
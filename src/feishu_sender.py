@@ -1,7 +1,8 @@
-import requests
+import asyncio
 import json
 from src.config import FEISHU_WEBHOOK
 from src.utils import setup_logger
+from src.http_client import get_webhook_session
 
 from datetime import datetime
 
@@ -10,10 +11,11 @@ logger = setup_logger("feishu_sender")
 def send_to_feishu(summaries):
     """
     Sends the list of summarized news to Feishu via Webhook.
+    Returns True if Feishu accepted the message.
     """
     if not FEISHU_WEBHOOK:
         logger.warning("FEISHU_WEBHOOK not set. Skipping notification.")
-        return
+        return False
 
     logger.info(f"Sending {len(summaries)} items to Feishu")
     
@@ -87,7 +89,7 @@ def send_to_feishu(summaries):
     }
     
     try:
-        response = requests.post(
+        response = get_webhook_session().post(
             FEISHU_WEBHOOK, 
             headers={"Content-Type": "application/json"},
             data=json.dumps(card)
@@ -98,13 +100,23 @@ def send_to_feishu(summaries):
         res_json = response.json()
         if res_json.get("code") and res_json.get("code") != 0:
             logger.error(f"Feishu API Error: {res_json}")
-        else:
-            logger.info("Successfully sent to Feishu")
+            return False
+        logger.info("Successfully sent to Feishu")
+        return True
             
     except Exception as e:
         logger.error(f"Failed to send to Feishu: {e}")
         if hasattr(e, 'response') and hasattr(e.response, 'text'):
              logger.error(f"Feishu Response: {e.response.text}")
+        return False
+
+async def send_to_feishu_async(summaries):
+    """
+    Async variant of send_to_feishu for the asyncio pipeline. The card is one
+    webhook POST, so it runs on a worker thread through the shared webhook
+    session (same retry policy) instead of a second HTTP client.
+    """
+    return await asyncio.to_thread(send_to_feishu, summaries)
 
 if __name__ == "__main__":
     # Test
@@ -1,12 +1,25 @@
-import feedparser
-import requests
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from urllib.parse import urlparse
 import time
-from src.utils import setup_logger
-from src.config import RSS_FEEDS
+from src.utils import setup_logger, run_concurrently, DeadlineExceeded
+from src.models import NewsItem
+from src.source_index import tag_source
+from src.http_client import get_limited
+from src.history_store import drop_known
+from src.metrics import stage, increment
+from src.feed_cache import load_cached_feed, request_headers, save_cached_feed, touch_cached_feed, evict_feed_cache
+from src.feed_parser import StreamingFeedParser, feed_content
+from src.parse_pool import get_parse_pool, warm_parse_pool
+from src.config import RSS_FEEDS, FETCH_TIMEOUT, FETCH_MAX_WORKERS, FETCH_PER_HOST_LIMIT, FETCH_DEADLINE, FEED_PARSER
 
 logger = setup_logger("rss_fetcher")
 
+# Widest freshness window of the run (hours), see set_max_entry_age
+_max_entry_age_hours = None
+
 # Browser-like User-Agent to avoid blocking
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -25,63 +38,310 @@ def parse_date(date_str):
         logger.warning(f"Failed to parse date: {date_str}, error: {e}")
     return None
 
-def fetch_rss_feeds():
+def set_max_entry_age(hours):
+    """
+    Sets the widest freshness window (hours) of this run, or None to keep
+    every entry (--ignore-freshness). With a window, the fast feed parser skips
+    entries that can't survive it and stops reading long feeds early.
+    """
+    global _max_entry_age_hours
+    _max_entry_age_hours = hours
+
+def _cache_covers_run(cached):
+    """
+    A cache entry parsed with a freshness window is missing older entries, so
+    it can only stand in for a feed when this run's window is no wider.
+    """
+    window = cached.get("max_entry_age_hours")
+    return not window or bool(_max_entry_age_hours and _max_entry_age_hours <= window)
+
+def _parse_with_feedparser(feed_url, content):
+    """
+    Parses a feed body with feedparser. Returns (feed_title, entries) in the
+    same shape as the fast parser.
+    """
+    import feedparser # Deferred: only needed when a feed actually has to be parsed
+    feed = feedparser.parse(content)
+    
+    if feed.bozo:
+        logger.warning(f"Error parsing feed {feed_url}: {feed.bozo_exception}")
+        # Continue anyway as feedparser often parses partially broken feeds
+    
+    entries = []
+    for entry in feed.entries:
+        # Extract publish time
+        published_parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        if published_parsed:
+            publish_time = datetime.fromtimestamp(time.mktime(published_parsed))
+        else:
+            # STRICT MODE: If no date, do NOT use current time. 
+            # Set to None so we can filter it out later or handle it as "Unknown".
+            # Using datetime.now() causes old news to appear fresh.
+            publish_time = None
+        
+        entries.append({
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "publish_time": publish_time,
+            "summary": entry.get("summary", "") or entry.get("description", ""),
+            "content": entry.get("content", [{"value": ""}])[0]["value"] if "content" in entry else ""
+        })
+    return feed.feed.get("title"), entries
+
+def parse_feed_records(feed_url, content, max_entry_age_hours=None, parser=None):
+    """
+    Parses a downloaded feed body into compact
+    (title, link, publish_time, summary, content) records.
+    parser is the StreamingFeedParser the body was already fed to while it
+    downloaded; without one the body is parsed here (in a parse worker with
+    PARSE_WORKERS). Anything the fast path can't handle goes to feedparser.
+    Returns (feed_title, records, stats); stats holds what the parent process
+    counts ("fallback", "stale_skipped", "stopped_early").
+    """
+    if parser is None and FEED_PARSER == "fast":
+        parser = feed_content(StreamingFeedParser(max_entry_age_hours), content)
+
+    parsed = parser.close() if parser else None
+    stats = {"fallback": False, "stale_skipped": 0, "stopped_early": False}
+    if parsed is None:
+        if parser:
+            stats["fallback"] = True
+            logger.debug(f"Fast parser can't handle {feed_url} ({parser.error}), using feedparser")
+        parsed = _parse_with_feedparser(feed_url, content)
+    else:
+        stats["stale_skipped"] = parser.stale_skipped
+        stats["stopped_early"] = parser.stopped_early
+    feed_title, entries = parsed
+
+    records = [
+        (entry["title"], entry["link"], entry["publish_time"], entry["summary"], entry.get("content", ""))
+        for entry in entries
+    ]
+    return feed_title, records, stats
+
+def fetch_feed(feed_url):
+    """
+    Fetches a single RSS feed and returns its news items.
+    Raises on network/HTTP errors so the caller can isolate failures per feed.
+    """
+    logger.info(f"Fetching RSS feed: {feed_url}")
+    news_items = []
+
+    # Conditional GET: send cached validators so unchanged feeds come back as 304
+    cached = load_cached_feed(feed_url)
+    if cached and not _cache_covers_run(cached):
+        cached = None
+
+    # Fetch through the shared pooled session (retries, size cap). Without a parse
+    # pool, the fast parser reads the body while it downloads and can stop once
+    # the rest is stale.
+    pool = get_parse_pool()
+    parser = StreamingFeedParser(_max_entry_age_hours) if FEED_PARSER == "fast" and pool is None else None
+    response = get_limited(
+        feed_url, headers={**HEADERS, **request_headers(cached)}, timeout=FETCH_TIMEOUT,
+        on_chunk=parser.feed if parser else None
+    )
+    if response.status_code == 304 and cached:
+        touch_cached_feed(feed_url)
+        increment("feed_cache_hits")
+        logger.info(f"Feed not modified, reusing {len(cached['items'])} cached items from {feed_url}")
+        return [tag_source(item) for item in cached["items"]]
+    response.raise_for_status()
+    increment("feed_cache_misses")
+
+    if pool is not None:
+        # CPU-bound: parse in a worker process, off this process's GIL
+        feed_title, records, stats = pool.submit(
+            parse_feed_records, feed_url, response.content, _max_entry_age_hours
+        ).result()
+    else:
+        feed_title, records, stats = parse_feed_records(feed_url, response.content, _max_entry_age_hours, parser)
+    if stats["fallback"]:
+        increment("feed_parser_fallbacks")
+    elif stats["stale_skipped"]:
+        increment("feed_entries_skipped_stale", stats["stale_skipped"])
+        logger.debug(
+            f"Skipped {stats['stale_skipped']} stale entries from {feed_url}"
+            f"{' and stopped reading early' if stats['stopped_early'] else ''}"
+        )
+
+    source = feed_title or feed_url
+    for title, link, publish_time, summary, content in records:
+        news_item = NewsItem(title, link, source, publish_time, summary, content)
+        
+        # Only append if we have a valid date OR if we decide to allow date-less items (currently Rejecting)
+        if publish_time:
+            news_items.append(tag_source(news_item))
+        else:
+            logger.debug(f"Skipping item with no date: {news_item['title']}")
+        
+    logger.info(f"Fetched {len(records)} items from {feed_url}")
+    save_cached_feed(
+        feed_url, response.headers.get("ETag"), response.headers.get("Last-Modified"), news_items,
+        max_entry_age_hours=_max_entry_age_hours if stats["stale_skipped"] else None
+    )
+    return news_items
+
+def _feed_host(feed_url):
+    """
+    Returns the host that FETCH_PER_HOST_LIMIT applies to for a feed.
+    """
+    return urlparse(feed_url).netloc.lower()
+
+def _timed_fetch(feed_url):
+    with stage("fetch_feed", feed=feed_url) as timer:
+        items = fetch_feed(feed_url)
+        timer.items_out = len(items)
+    return items
+
+def _normalize_feed_urls(feed_urls):
+    if feed_urls is None:
+        feed_urls = RSS_FEEDS
+    return [url.strip() for url in feed_urls if url.strip()]
+
+def iter_feed_results(feed_urls):
+    """
+    Yields (feed_url, news_items) for each feed as soon as it completes.
+
+    Feeds are fetched concurrently (FETCH_MAX_WORKERS threads, at most
+    FETCH_PER_HOST_LIMIT requests per host) and the whole stage is bounded by
+    FETCH_DEADLINE seconds. A failing or slow feed only loses its own items.
+    Items already sent (or processed, see HISTORY_SKIP) by earlier runs are dropped.
+    """
+    evict_feed_cache()
+    warm_parse_pool()
+
+    if FETCH_MAX_WORKERS <= 1:
+        deadline = time.monotonic() + FETCH_DEADLINE
+        for position, feed_url in enumerate(feed_urls):
+            if time.monotonic() >= deadline:
+                for skipped_url in feed_urls[position:]:
+                    logger.error(f"Fetch deadline ({FETCH_DEADLINE}s) exceeded for feed {skipped_url}. Skipping.")
+                return
+            try:
+                yield feed_url, drop_known(_timed_fetch(feed_url))
+            except Exception as e:
+                logger.error(f"Failed to fetch feed {feed_url}: {e}")
+        return
+
+    # The per-host limit is applied here, not in the workers: feeds wait in a
+    # queue per host and are only submitted while their host has a free slot,
+    # so a slow host can't tie up pool threads that other hosts could use.
+    host_queues = {}
+    for feed_url in feed_urls:
+        host_queues.setdefault(_feed_host(feed_url), deque()).append(feed_url)
+
+    executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix="rss_fetch")
+    futures = {}
+
+    def submit_next(host):
+        queue = host_queues[host]
+        if queue:
+            feed_url = queue.popleft()
+            futures[executor.submit(_timed_fetch, feed_url)] = feed_url
+
+    for host in host_queues:
+        for _ in range(max(1, FETCH_PER_HOST_LIMIT)):
+            submit_next(host)
+
+    deadline = time.monotonic() + FETCH_DEADLINE
+    try:
+        while futures:
+            done, _ = wait(futures, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                skipped = list(futures.values()) + [url for queue in host_queues.values() for url in queue]
+                for feed_url in skipped:
+                    logger.error(f"Fetch deadline ({FETCH_DEADLINE}s) exceeded for feed {feed_url}. Skipping.")
+                return
+            for future in done:
+                feed_url = futures.pop(future)
+                submit_next(_feed_host(feed_url))
+                try:
+                    items = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch feed {feed_url}: {e}")
+                    continue
+                yield feed_url, drop_known(items)
+    finally:
+        # Don't block on stragglers; their requests are still bounded by FETCH_TIMEOUT
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_rss_feeds(feed_urls=None):
     """
     Fetches news items from all configured RSS feeds.
     Returns a list of dictionaries containing news item details.
+    Items keep the configured feed order.
     """
+    feed_urls = _normalize_feed_urls(feed_urls)
+    results = dict(iter_feed_results(feed_urls))
+
     all_news = []
-    
-    for feed_url in RSS_FEEDS:
-        feed_url = feed_url.strip()
-        if not feed_url:
-            continue
-            
-        logger.info(f"Fetching RSS feed: {feed_url}")
-        try:
-            # Use requests to fetch with headers, then parse with feedparser
-            response = requests.get(feed_url, headers=HEADERS, timeout=30)
-            response.raise_for_status()
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo:
-                logger.warning(f"Error parsing feed {feed_url}: {feed.bozo_exception}")
-                # Continue anyway as feedparser often parses partially broken feeds
-            
-            for entry in feed.entries:
-                # Extract publish time
-                published_parsed = entry.get("published_parsed") or entry.get("updated_parsed")
-                if published_parsed:
-                    publish_time = datetime.fromtimestamp(time.mktime(published_parsed))
-                else:
-                    # STRICT MODE: If no date, do NOT use current time. 
-                    # Set to None so we can filter it out later or handle it as "Unknown".
-                    # Using datetime.now() causes old news to appear fresh.
-                    publish_time = None
-                
-                news_item = {
-                    "title": entry.get("title", ""),
-                    "link": entry.get("link", ""),
-                    "source": feed.feed.get("title", feed_url),
-                    "publish_time": publish_time,
-                    "summary": entry.get("summary", "") or entry.get("description", ""),
-                    "content": entry.get("content", [{"value": ""}])[0]["value"] if "content" in entry else ""
-                }
-                
-                # Only append if we have a valid date OR if we decide to allow date-less items (currently Rejecting)
-                if publish_time:
-                    all_news.append(news_item)
-                else:
-                    logger.debug(f"Skipping item with no date: {news_item['title']}")
-                
-            logger.info(f"Fetched {len(feed.entries)} items from {feed_url}")
-            
-        except Exception as e:
-            logger.error(f"Failed to fetch feed {feed_url}: {e}")
+    for feed_url in feed_urls:
+        all_news.extend(results.get(feed_url, []))
             
     logger.info(f"Total news items fetched: {len(all_news)}")
     return all_news
 
+def iter_rss_feeds(feed_urls=None):
+    """
+    Streaming variant of fetch_rss_feeds: yields news items feed by feed as
+    each feed completes (completion order, not configured order), so later
+    stages can filter them while other feeds are still downloading.
+    """
+    count = 0
+    for _, items in iter_feed_results(_normalize_feed_urls(feed_urls)):
+        count += len(items)
+        yield from items
+    logger.info(f"Total news items fetched: {count}")
+
+async def fetch_rss_feeds_async(feed_urls=None):
+    """
+    Async variant of fetch_rss_feeds for the asyncio pipeline: same limits
+    (FETCH_MAX_WORKERS, FETCH_PER_HOST_LIMIT, FETCH_DEADLINE), result order and
+    history filtering. Feeds are still downloaded and parsed by fetch_feed on
+    worker threads (the shared requests session and feedparser are blocking),
+    so the event loop stays free while they run. Cancelling the caller stops
+    waiting for feeds that haven't finished.
+    """
+    feed_urls = _normalize_feed_urls(feed_urls)
+    evict_feed_cache()
+    warm_parse_pool()
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max(1, FETCH_MAX_WORKERS), thread_name_prefix="rss_fetch")
+    # A feed takes its host's slot before one of the FETCH_MAX_WORKERS slots, so
+    # feeds waiting on a busy host don't hold workers other hosts could use
+    # (the same scheduling as the per-host queues in iter_feed_results).
+    worker_slots = asyncio.Semaphore(max(1, FETCH_MAX_WORKERS))
+    host_semaphores = {}
+
+    def fetch_job(feed_url):
+        host = _feed_host(feed_url)
+        host_slots = host_semaphores.setdefault(host, asyncio.Semaphore(max(1, FETCH_PER_HOST_LIMIT)))
+
+        async def job():
+            async with host_slots, worker_slots:
+                return await loop.run_in_executor(executor, _timed_fetch, feed_url)
+        return job
+
+    try:
+        # The limits are applied in the jobs, run_concurrently only bounds the stage
+        results = await run_concurrently([fetch_job(url) for url in feed_urls], len(feed_urls), timeout=FETCH_DEADLINE)
+    finally:
+        # Don't block on stragglers; their requests are still bounded by FETCH_TIMEOUT
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    all_news = []
+    for feed_url, result in zip(feed_urls, results):
+        if isinstance(result, DeadlineExceeded):
+            logger.error(f"Fetch deadline ({FETCH_DEADLINE}s) exceeded for feed {feed_url}. Skipping.")
+        elif isinstance(result, Exception):
+            logger.error(f"Failed to fetch feed {feed_url}: {result}")
+        else:
+            all_news.extend(drop_known(result))
+
+    logger.info(f"Total news items fetched: {len(all_news)}")
+    return all_news
+
 if __name__ == "__main__":
     # Test the fetcher
     news = fetch_rss_feeds()
@@ -1,10 +1,75 @@
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from src.utils import setup_logger
 from src.config import FRESHNESS_HOURS
 
 logger = setup_logger("freshness_filter")
 
-def filter_fresh_news(news_list, hours=FRESHNESS_HOURS):
+class FreshnessIndex:
+    """
+    Sorts the items of a fetch by publish time once, so any 'Relative Freshness'
+    window can be answered with a bisect instead of rescanning the whole list.
+
+    Timezones are normalized (made naive) once while building the index; items
+    without a publish time are left out. Windows are returned in the original
+    list order, same as filter_fresh_news.
+    """
+    def __init__(self, news_list):
+        self.items = []
+        for item in news_list:
+            publish_time = item.get("publish_time")
+            if not publish_time:
+                continue
+            if publish_time.tzinfo is not None:
+                item["publish_time"] = publish_time.replace(tzinfo=None)
+            self.items.append(item)
+        
+        # Positions into self.items, oldest first, and their timestamps
+        self._order = sorted(range(len(self.items)), key=lambda i: self.items[i]["publish_time"])
+        self._times = [self.items[i]["publish_time"] for i in self._order]
+        self.max_publish_time = self._times[-1] if self._times else None
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def cutoff(self, hours):
+        """
+        Returns the cutoff time for a window (relative to the latest item).
+        """
+        return self.max_publish_time - timedelta(hours=hours)
+    
+    def _start(self, hours):
+        return bisect_left(self._times, self.cutoff(hours)) if self._times else 0
+    
+    def count(self, hours):
+        """
+        Number of items within 'hours' of the latest item.
+        """
+        return len(self._times) - self._start(hours)
+    
+    def counts(self, windows):
+        """
+        Returns {hours: item count} for each window.
+        """
+        return {hours: self.count(hours) for hours in windows}
+    
+    def window(self, hours):
+        """
+        Returns the items within 'hours' of the latest item.
+        """
+        return self._slice(self._start(hours), len(self._times))
+    
+    def between(self, inner_hours, outer_hours):
+        """
+        Returns the items inside the outer window but not the inner one, i.e.
+        what widening the window from inner_hours to outer_hours adds.
+        """
+        return self._slice(self._start(outer_hours), self._start(inner_hours))
+    
+    def _slice(self, start, end):
+        return [self.items[i] for i in sorted(self._order[start:end])]
+
+def filter_fresh_news(news_list, hours=FRESHNESS_HOURS, index=None):
     """
     Filters news items using 'Relative Freshness'.
     1. Find the latest timestamp in the entire list (max_publish_time).
@@ -12,36 +77,48 @@ def filter_fresh_news(news_list, hours=FRESHNESS_HOURS):
     
     This solves the "System Time vs Real Time" paradox where 
     system time is 2026 but RSS feeds have 2025 data.
+    
+    Pass a FreshnessIndex built from news_list to reuse it across windows.
     """
     if not news_list:
         return []
-        
-    fresh_news = []
     
-    # Normalize timezones first
-    valid_items = []
-    for item in news_list:
-        publish_time = item.get("publish_time")
-        if not publish_time:
-            continue
-        if publish_time.tzinfo is not None:
-            item["publish_time"] = publish_time.replace(tzinfo=None)
-        valid_items.append(item)
-        
-    if not valid_items:
+    if index is None:
+        index = FreshnessIndex(news_list)
+    if not index:
         return []
-
-    # Find the latest time in the feed
-    max_publish_time = max(item["publish_time"] for item in valid_items)
     
     # Calculate cutoff relative to the LATEST item found, NOT system clock
-    cutoff_time = max_publish_time - timedelta(hours=hours)
+    logger.info(f"Relative Freshness: Latest item is from {index.max_publish_time}. Filtering older than {hours}h (cutoff: {index.cutoff(hours)})")
     
-    logger.info(f"Relative Freshness: Latest item is from {max_publish_time}. Filtering older than {hours}h (cutoff: {cutoff_time})")
+    fresh_news = index.window(hours)
     
-    for item in valid_items:
-        if item["publish_time"] >= cutoff_time:
-            fresh_news.append(item)
-            
     logger.info(f"Filtered {len(news_list) - len(fresh_news)} old items. Remaining: {len(fresh_news)}")
     return fresh_news
+
+def iter_fresh_news(news_iter, hours=FRESHNESS_HOURS):
+    """
+    Streaming pre-filter for filter_fresh_news: drops items older than 'hours'
+    before the latest item seen SO FAR. The latest item can only get newer, so
+    anything dropped here would also be dropped by filter_fresh_news(all, hours);
+    survivors still need the exact filter once the stream is complete.
+    """
+    max_publish_time = None
+    dropped = 0
+    
+    for item in news_iter:
+        publish_time = item.get("publish_time")
+        if not publish_time:
+            continue
+        if publish_time.tzinfo is not None:
+            publish_time = item["publish_time"] = publish_time.replace(tzinfo=None)
+        
+        if max_publish_time is None or publish_time > max_publish_time:
+            max_publish_time = publish_time
+        
+        if publish_time >= max_publish_time - timedelta(hours=hours):
+            yield item
+        else:
+            dropped += 1
+    
+    logger.info(f"Streaming freshness pre-filter dropped {dropped} items older than {hours}h")
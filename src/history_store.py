@@ -0,0 +1,150 @@
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from src.utils import setup_logger
+from src.normalize import normalized
+from src.metrics import increment
+from src.config import HISTORY_DB_PATH, HISTORY_SKIP, HISTORY_RETENTION_DAYS
+
+logger = setup_logger("history_store")
+
+# Persistent record of items seen by earlier runs (SQLite).
+# Every item processed by a run is stored by link hash and title fingerprint,
+# and items pushed to Feishu get a sent_at timestamp. Later runs load the known
+# hashes/fingerprints once (filtered by HISTORY_SKIP) so fetch and dedup can
+# drop known items with a set lookup. Rows not seen for HISTORY_RETENTION_DAYS
+# are compacted away when the store is opened.
+
+_lock = threading.Lock()
+_connection = None
+_enabled = bool(HISTORY_DB_PATH) and HISTORY_SKIP != "none"
+_known = None # (link hashes, title fingerprints) of items to skip, loaded once per run
+
+def set_history_enabled(enabled):
+    """
+    Enables or disables history lookups and writes for this process.
+    """
+    global _enabled
+    _enabled = enabled and bool(HISTORY_DB_PATH)
+
+def link_hash(link):
+    """
+    Returns the hash a link is stored under.
+    """
+    return hashlib.sha1((link or "").strip().encode("utf-8")).hexdigest()
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        directory = os.path.dirname(HISTORY_DB_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _connection = sqlite3.connect(HISTORY_DB_PATH, check_same_thread=False)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "link_hash TEXT PRIMARY KEY, title_fp TEXT, first_seen REAL NOT NULL, last_seen REAL NOT NULL, sent_at REAL)"
+        )
+        _connection.execute("CREATE INDEX IF NOT EXISTS idx_items_title_fp ON items (title_fp)")
+        _connection.execute("CREATE INDEX IF NOT EXISTS idx_items_last_seen ON items (last_seen)")
+        compact(_connection)
+    return _connection
+
+def compact(connection=None):
+    """
+    Deletes items not seen for HISTORY_RETENTION_DAYS. Returns the number removed.
+    """
+    connection = connection or _get_connection()
+    cutoff = time.time() - HISTORY_RETENTION_DAYS * 86400
+    removed = connection.execute("DELETE FROM items WHERE last_seen < ?", (cutoff,)).rowcount
+    connection.commit()
+    if removed:
+        logger.info(f"Compacted {removed} history entries older than {HISTORY_RETENTION_DAYS} days")
+    return removed
+
+def _load_known():
+    global _known
+    if _known is None:
+        where = "WHERE sent_at IS NOT NULL" if HISTORY_SKIP == "sent" else ""
+        link_hashes, title_fps = set(), set()
+        try:
+            with _lock:
+                for row_link_hash, row_title_fp in _get_connection().execute(f"SELECT link_hash, title_fp FROM items {where}"):
+                    link_hashes.add(row_link_hash)
+                    if row_title_fp:
+                        title_fps.add(row_title_fp)
+            logger.info(f"Loaded {len(link_hashes)} known items from history ({HISTORY_SKIP})")
+        except Exception as e:
+            logger.warning(f"History lookup failed, processing all items: {e}")
+        _known = (link_hashes, title_fps)
+    return _known
+
+def is_known_link(link):
+    """
+    True if an item with this link was sent (or processed, see HISTORY_SKIP) by an earlier run.
+    """
+    if not _enabled:
+        return False
+    return link_hash(link) in _load_known()[0]
+
+def is_known_fingerprint(fingerprint):
+    """
+    True if an item with this title fingerprint (title_fp, see src.normalize)
+    was sent (or processed) by an earlier run.
+    """
+    if not _enabled:
+        return False
+    return fingerprint is not None and fingerprint in _load_known()[1]
+
+def drop_known(news_list):
+    """
+    Returns the items whose link isn't known from earlier runs.
+    """
+    if not _enabled:
+        return news_list
+    fresh = [item for item in news_list if not is_known_link(item.get("link"))]
+    if len(fresh) < len(news_list):
+        increment("history_skipped_at_fetch", len(news_list) - len(fresh))
+        logger.debug(f"Dropped {len(news_list) - len(fresh)} items known from earlier runs")
+    return fresh
+
+def _write(news_items, sent):
+    if not _enabled:
+        return
+    now = time.time()
+    rows = [(link_hash(item.get("link")), normalized(item)["title_fp"], now, now, now if sent else None) for item in news_items]
+    update = "last_seen = excluded.last_seen, title_fp = excluded.title_fp"
+    if sent:
+        update += ", sent_at = excluded.sent_at"
+    try:
+        with _lock:
+            connection = _get_connection()
+            connection.executemany(
+                "INSERT INTO items (link_hash, title_fp, first_seen, last_seen, sent_at) VALUES (?, ?, ?, ?, ?) "
+                f"ON CONFLICT(link_hash) DO UPDATE SET {update}",
+                rows
+            )
+            connection.commit()
+    except Exception as e:
+        logger.warning(f"History write failed: {e}")
+
+def record_processed(news_items):
+    """
+    Records news items processed by this run.
+    """
+    _write(news_items, sent=False)
+
+def record_sent(news_items):
+    """
+    Records news items pushed to Feishu by this run.
+    """
+    _write(news_items, sent=True)
+
+if __name__ == "__main__":
+    # Usage: python -m src.history_store --compact
+    if len(sys.argv) == 2 and sys.argv[1] == "--compact":
+        compact()
+    else:
+        print("Usage: python -m src.history_store --compact")
@@ -0,0 +1,103 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from src.utils import setup_logger
+from src.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, FETCH_MAX_BYTES
+
+logger = setup_logger("http_client")
+
+# Shared HTTP sessions for feed fetching and the Feishu webhook.
+# One requests.Session per process keeps a pool of keep-alive connections per
+# host (urllib3 PoolManager), so feeds on the same host reuse TCP/TLS
+# connections instead of handshaking for every request. Retries with
+# exponential backoff (honouring Retry-After) are handled by urllib3.
+# ACCEPT_ENCODING advertises brotli only when the brotli package is installed,
+# which is also what lets urllib3 decode it; gzip/deflate always work.
+# requests has no HTTP/2 support, so connections stay on HTTP/1.1.
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_sessions = {}
+
+class ResponseTooLargeError(requests.RequestException):
+    """
+    Raised when a response body exceeds the configured size cap.
+    """
+
+def _build_session(retry):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+def get_session():
+    """
+    Returns the shared session for idempotent requests (GET/HEAD): retried on
+    connection errors, 429 and 5xx.
+    """
+    with _lock:
+        if "default" not in _sessions:
+            _sessions["default"] = _build_session(Retry(
+                total=HTTP_MAX_RETRIES,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            ))
+        return _sessions["default"]
+
+def get_webhook_session():
+    """
+    Returns the shared session for webhook POSTs. Only failures where the
+    message can't have been delivered (connection errors, 429) are retried,
+    so a retry never posts the same card twice.
+    """
+    with _lock:
+        if "webhook" not in _sessions:
+            _sessions["webhook"] = _build_session(Retry(
+                total=HTTP_MAX_RETRIES,
+                read=0,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                status_forcelist=(429,),
+                allowed_methods=frozenset(["POST"]),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            ))
+        return _sessions["webhook"]
+
+def get_limited(url, max_bytes=FETCH_MAX_BYTES, chunk_size=65536, on_chunk=None, **kwargs):
+    """
+    GET through the shared session, reading at most max_bytes of (decoded) body.
+    Raises ResponseTooLargeError beyond that instead of buffering a huge
+    response. Returns the response with its content already read.
+    For successful responses, on_chunk(chunk) sees the body as it downloads;
+    returning False stops reading (response.content is then what was read).
+    """
+    response = get_session().get(url, stream=True, **kwargs)
+    try:
+        declared = response.headers.get("Content-Length")
+        if max_bytes and declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ResponseTooLargeError(f"{url} declares {declared} bytes (limit {max_bytes})", response=response)
+
+        if not 200 <= response.status_code < 300:
+            on_chunk = None
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size):
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise ResponseTooLargeError(f"{url} exceeded {max_bytes} bytes", response=response)
+            chunks.append(chunk)
+            if on_chunk is not None and on_chunk(chunk) is False:
+                break
+        # Same as what response.content does when it reads the body itself
+        response._content = b"".join(chunks)
+    finally:
+        response.close()
+    return response
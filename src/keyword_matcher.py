@@ -0,0 +1,51 @@
+class KeywordMatcher:
+    """
+    Matches several keyword classes against a text in one pass over a
+    precompiled keyword table and returns the classes found as a bitmask.
+
+    Matching keeps plain substring semantics (same as `kw in text`). Each
+    distinct keyword is checked at most once even if it belongs to several
+    classes, a keyword implies every keyword it contains (finding "api
+    reference" also sets the classes of "api"), and keywords whose classes are
+    all already found are skipped.
+
+    CPython's substring search is much faster than a pure-Python Aho-Corasick
+    automaton or a regex alternation scanning every position, so the table is
+    checked with `in` rather than compiled into an automaton.
+    """
+    def __init__(self, classes):
+        # classes: {class_name: [keywords]}; keywords are matched lowercased
+        self.bits = {name: 1 << i for i, name in enumerate(classes)}
+
+        masks = {}
+        for name, keywords in classes.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                masks[keyword] = masks.get(keyword, 0) | self.bits[name]
+
+        implied = {
+            keyword: mask | self._implied_mask(keyword, masks)
+            for keyword, mask in masks.items()
+        }
+
+        # Keywords covering the most classes first, so later ones can be skipped
+        self.table = sorted(implied.items(), key=lambda kv: -bin(kv[1]).count("1"))
+
+    @staticmethod
+    def _implied_mask(keyword, masks):
+        mask = 0
+        for other, other_mask in masks.items():
+            if other != keyword and other in keyword:
+                mask |= other_mask
+        return mask
+
+    def match(self, text):
+        """
+        Returns the bitmask of classes with at least one keyword in text
+        (text should already be lowercased).
+        """
+        found = 0
+        for keyword, mask in self.table:
+            if mask & ~found and keyword in text:
+                found |= mask
+        return found
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.utils import setup_logger
+from src.config import AI_MODEL, LLM_CACHE_PATH, LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_BYPASS
+
+logger = setup_logger("llm_cache")
+
+# Persistent, content-addressed cache for LLM responses (SQLite).
+# Keys hash the model plus the request actually sent (rendered messages and
+# parameters), so the same article seen again in a later run (72h/120h
+# windows, backfills) costs nothing, while any change to a prompt template,
+# the prompt packing or the request parameters misses instead of returning an
+# answer to a different prompt. Entries expire after LLM_CACHE_TTL_HOURS and the least recently
+# used ones are evicted beyond LLM_CACHE_MAX_ENTRIES.
+
+_lock = threading.Lock()
+_connection = None
+_bypass = LLM_CACHE_BYPASS
+_stats = {"hits": 0, "misses": 0, "writes": 0}
+
+def set_cache_bypass(bypass):
+    """
+    Disables (True) or re-enables (False) cache lookups and writes for this process.
+    """
+    global _bypass
+    _bypass = bypass
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        directory = os.path.dirname(LLM_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _connection = sqlite3.connect(LLM_CACHE_PATH, check_same_thread=False)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        _connection.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)")
+        _evict(_connection)
+    return _connection
+
+def _evict(connection):
+    cutoff = time.time() - LLM_CACHE_TTL_HOURS * 3600
+    expired = connection.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,)).rowcount
+    overflow = connection.execute(
+        "DELETE FROM responses WHERE key IN ("
+        "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+        (LLM_CACHE_MAX_ENTRIES,)
+    ).rowcount
+    connection.commit()
+    if expired or overflow:
+        logger.info(f"Evicted {expired} expired and {overflow} least recently used LLM cache entries")
+
+def _enabled():
+    return bool(LLM_CACHE_PATH) and not _bypass
+
+def make_cache_key(kind, request):
+    """
+    Builds a cache key from the request kind (e.g. "score", "summary"), the
+    model and the chat completion request (messages and parameters).
+    """
+    # The client-side timeout doesn't change the answer
+    request = {name: value for name, value in request.items() if name != "timeout"}
+    payload = json.dumps({"kind": kind, "model": AI_MODEL, "request": request}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def cache_get(key):
+    """
+    Returns the cached (JSON-decoded) value for key, or None on a miss.
+    """
+    if not _enabled():
+        return None
+    try:
+        with _lock:
+            connection = _get_connection()
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+                (key, time.time() - LLM_CACHE_TTL_HOURS * 3600)
+            ).fetchone()
+            if row is None:
+                _stats["misses"] += 1
+                return None
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            connection.commit()
+            _stats["hits"] += 1
+        return json.loads(row[0])
+    except Exception as e:
+        logger.warning(f"LLM cache lookup failed: {e}")
+        return None
+
+def cache_set(key, value):
+    """
+    Stores a JSON-serializable value under key.
+    """
+    if not _enabled():
+        return
+    try:
+        now = time.time()
+        with _lock:
+            connection = _get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            connection.commit()
+            _stats["writes"] += 1
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
+
+def cache_stats():
+    """
+    Returns hit/miss/write counters for this process.
+    """
+    return dict(_stats)
@@ -1,133 +1,155 @@
 import sys
 import argparse
-from src.config import AI_API_KEY, AI_PROVIDER, AI_MODEL, AI_BASE_URL, FEISHU_WEBHOOK
+import cProfile
+import pstats
+from concurrent.futures import ThreadPoolExecutor, wait
+from src.config import SUMMARY_CONCURRENCY, SUMMARY_STAGE_TIMEOUT, METRICS_REPORT_PATH, METRICS_PROMETHEUS_PATH
 from src.utils import setup_logger
-from src.fetch_rss import fetch_rss_feeds
-from src.freshness_filter import filter_fresh_news
-from src.deduplicate import deduplicate_news
-from src.merge_news import merge_news_items
-from src.scoring import score_news
-from src.ranking import rank_news
+from src.fetch_rss import fetch_rss_feeds, iter_rss_feeds, set_max_entry_age
+from src.freshness_filter import iter_fresh_news
+from src.deduplicate import iter_unique_links
+from src.scoring import apply_ai_scores
 from src.ai_summary import generate_summary
+from src.llm_cache import set_cache_bypass
+from src.history_store import set_history_enabled
 from src.feishu_sender import send_to_feishu
+from src.metrics import stage, run_report, log_summary, write_report, write_prometheus
+from src.pipeline import (
+    TIME_WINDOWS, log_configuration, build_candidates, pick_top_news, format_summary, record_delivery, log_completion
+)
 
 logger = setup_logger("main")
 
-def main():
-    parser = argparse.ArgumentParser(description="AI News Notifier")
-    parser.add_argument("--ignore-freshness", action="store_true", help="Ignore time filters (for testing/backfill)")
-    args = parser.parse_args()
+def summarize_item(item):
+    """
+    Generates the AI summary for a ranked item and merges it with the item's
+    own data into the dict send_to_feishu expects.
+    """
+    return format_summary(item, generate_summary(item))
 
-    logger.info("Starting AI News Notifier Pipeline")
+def summarize_news(top_news):
+    """
+    Summarizes the ranked items concurrently (SUMMARY_CONCURRENCY threads).
+    Each request is bounded by SUMMARY_TIMEOUT and retried with jittered backoff
+    (see create_completion); items still running after SUMMARY_STAGE_TIMEOUT are
+    dropped so one hung request can't hold back the rest.
+    Returns the summarized items in ranking order.
+    """
+    logger.info(f"Generating summaries for {len(top_news)} items")
+    results = {}
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, SUMMARY_CONCURRENCY), thread_name_prefix="summary")
+    futures = {executor.submit(summarize_item, item): i for i, item in enumerate(top_news)}
+    done, not_done = wait(futures, timeout=SUMMARY_STAGE_TIMEOUT)
+    
+    for future in done:
+        item = top_news[futures[future]]
+        try:
+            results[futures[future]] = future.result()
+        except Exception as e:
+            logger.error(f"Error processing summary for item '{item.get('title')}': {e}")
+    
+    for future in not_done:
+        logger.error(f"Summary timed out after {SUMMARY_STAGE_TIMEOUT}s for item '{top_news[futures[future]].get('title')}'. Skipping.")
     
-    # Log configuration (masking sensitive data)
-    masked_key = f"{AI_API_KEY[:4]}...{AI_API_KEY[-4:]}" if AI_API_KEY and len(AI_API_KEY) > 8 else "NOT_SET"
-    logger.info(f"Configuration: Provider={AI_PROVIDER}, Model={AI_MODEL}, BaseURL={AI_BASE_URL}, API_KEY={masked_key}")
-    logger.info(f"Feishu Webhook set: {'Yes' if FEISHU_WEBHOOK else 'No'}")
+    executor.shutdown(wait=False, cancel_futures=True)
+    return [results[i] for i in sorted(results)]
+
+def run_pipeline(args):
+    """
+    Runs Fetch -> Freshness -> Deduplicate -> Merge -> Score -> Rank -> Summarize -> Send.
+    Every stage is timed in src.metrics. The stages shared with the asyncio
+    runner (src.async_pipeline, --async) live in src.pipeline.
+    """
+    logger.info("Starting AI News Notifier Pipeline")
+    log_configuration()
 
     # 1. Fetch
-    all_news = fetch_rss_feeds()
+    with stage("fetch") as timer:
+        if args.stream:
+            # Streaming: filter stale items and repeated links while other feeds are
+            # still downloading, and only keep the survivors in memory
+            news_stream = iter_rss_feeds()
+            if not args.ignore_freshness:
+                news_stream = iter_fresh_news(news_stream, hours=TIME_WINDOWS[-1])
+            all_news = list(iter_unique_links(news_stream))
+        else:
+            all_news = fetch_rss_feeds()
+        timer.items_out = len(all_news)
     if not all_news:
         logger.info("No news fetched. Exiting.")
         return
 
-    # 2. Filter Freshness (Tiered Strategy: 24h -> 72h -> 120h)
-    target_count = 5
-    selected_news = []
-    
-    if args.ignore_freshness:
-        logger.info("TEST MODE: Ignoring freshness filter. Processing ALL fetched news.")
-        selected_news = all_news
-    else:
-        time_windows = [24, 72, 120]
-        
-        for hours in time_windows:
-            logger.info(f"Trying time window: {hours} hours")
-            fresh_news = filter_fresh_news(all_news, hours=hours)
-            
-            if not fresh_news:
-                logger.info(f"No fresh news found within {hours}h.")
-                continue
-                
-            # 3. Deduplicate (Moved inside loop to process smaller chunks efficiently, or can be done after)
-            # Actually, deduplication should be done on the fresh set
-            unique_news = deduplicate_news(fresh_news)
-            
-            # 4. Merge
-            merged_news = merge_news_items(unique_news)
-            
-            # 5. Score
-            scored_news = score_news(merged_news)
-            
-            # 6. Rank
-            ranked_news = rank_news(scored_news)
-            
-            # Check if we have enough high-quality news
-            if len(ranked_news) >= target_count:
-                selected_news = ranked_news
-                logger.info(f"Found {len(selected_news)} items within {hours}h window. Stopping search.")
-                break
-            else:
-                logger.info(f"Only found {len(ranked_news)} items within {hours}h window. Expanding search...")
-                # If we are at the last window, just take what we have
-                if hours == time_windows[-1]:
-                    selected_news = ranked_news
-
-    if not selected_news:
+    # 2.-5. Normalize, Freshness, Deduplicate, Merge, Rule Score
+    candidates = build_candidates(all_news, args)
+    if not candidates:
         logger.info("No news found even after expanding time window. Exiting.")
         return
-        
-    # If ignoring freshness, we still need to run the pipeline steps (Deduplicate -> Rank)
-    if args.ignore_freshness:
-        unique_news = deduplicate_news(selected_news)
-        merged_news = merge_news_items(unique_news)
-        scored_news = score_news(merged_news)
-        ranked_news = rank_news(scored_news)
-        selected_news = ranked_news
-
-    # Take top N
-    top_news = selected_news[:target_count]
+    
+    # 5. AI Score (only once, for the window we settled on)
+    with stage("ai_score", items_in=len(candidates)) as timer:
+        scored_news = apply_ai_scores(candidates)
+        timer.items_out = len(scored_news)
+    
+    # 6. Rank
+    top_news = pick_top_news(scored_news)
         
     # 7. Generate Summaries
-    logger.info(f"Generating summaries for {len(top_news)} items")
-    summarized_news = []
-    for item in top_news:
-        try:
-            summary_data = generate_summary(item)
-            
-            # Merge summary data with original item data
-            final_item = {
-                **summary_data,
-                "links": item.get("links", []),
-                "original_sources": item.get("sources", []), 
-                "original_title": item.get("title"),
-                "publish_date": item.get("publish_time").strftime("%Y-%m-%d %H:%M") # Format for Feishu
-            }
-            
-            # Fallback logic for URL and Source Name
-            if not final_item.get("url") or final_item.get("url") == "":
-                 if item.get("link"):
-                     final_item["url"] = item["link"]
-                 elif item.get("links"):
-                     final_item["url"] = item["links"][0]
-            
-            if not final_item.get("source_name") or final_item.get("source_name") == "Unknown":
-                 if item.get("source"):
-                     final_item["source_name"] = item["source"]
-                 elif item.get("sources"):
-                     final_item["source_name"] = item["sources"][0]
-
-            summarized_news.append(final_item)
-        except Exception as e:
-            logger.error(f"Error processing summary for item '{item.get('title')}': {e}")
+    with stage("summarize", items_in=len(top_news)) as timer:
+        summarized_news = summarize_news(top_news)
+        timer.items_out = len(summarized_news)
             
-    # 8. Send to Feishu
+    # 8. Send to Feishu (and remember what was sent so later runs skip it)
     if summarized_news:
-        send_to_feishu(summarized_news)
+        with stage("send", items_in=len(summarized_news)) as timer:
+            if send_to_feishu(summarized_news):
+                timer.items_out = len(summarized_news)
+                record_delivery(top_news, summarized_news)
     else:
         logger.warning("No summaries generated. Nothing to send.")
-        
-    logger.info("Pipeline completed successfully.")
+    
+    log_completion()
+
+def main():
+    parser = argparse.ArgumentParser(description="AI News Notifier")
+    parser.add_argument("--ignore-freshness", action="store_true", help="Ignore time filters (for testing/backfill)")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Bypass the LLM response cache")
+    parser.add_argument("--no-history", action="store_true", help="Ignore and don't update the seen-items history")
+    parser.add_argument("--stream", action="store_true", help="Filter items while feeds are still being fetched")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run the network-bound stages on an asyncio event loop")
+    parser.add_argument("--report", default=METRICS_REPORT_PATH, help="Write a JSON run report (stage timings, LLM usage, cache hit rates) to this path")
+    parser.add_argument("--prometheus", default=METRICS_PROMETHEUS_PATH, help="Write run metrics as a Prometheus textfile to this path")
+    parser.add_argument("--profile", nargs="?", const="pipeline.prof", help="Profile the run with cProfile and save the stats (default pipeline.prof)")
+    args = parser.parse_args()
+    
+    if args.no_llm_cache:
+        set_cache_bypass(True)
+    if args.no_history:
+        set_history_enabled(False)
+    if not args.ignore_freshness:
+        set_max_entry_age(TIME_WINDOWS[-1])
+
+    if args.use_async:
+        from src.async_pipeline import run_async as run
+    else:
+        run = run_pipeline
+
+    try:
+        if args.profile:
+            profiler = cProfile.Profile()
+            profiler.runcall(run, args)
+            profiler.dump_stats(args.profile)
+            logger.info(f"Profile written to {args.profile} (hottest functions by cumulative time below)")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(25)
+        else:
+            run(args)
+    finally:
+        report = run_report()
+        log_summary(report)
+        if args.report:
+            write_report(args.report, report)
+        if args.prometheus:
+            write_prometheus(args.prometheus, report)
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,10 @@
 from difflib import SequenceMatcher
 from src.utils import setup_logger
-from src.config import TIER1_SOURCES, TIER2_SOURCES
+from src.similarity_index import TitleIndex
+from src.normalize import normalized
+from src.models import MergedNews
+from src.source_index import resolve_source
+from src.config import MERGE_STRATEGY, SIMILARITY_BLOCKING, SIMILARITY_MODE, EMBEDDING_MERGE_THRESHOLD
 
 logger = setup_logger("merge_news")
 
@@ -19,80 +23,194 @@ def get_source_priority(source_name, link):
     5: Tier 2 (Other Media)
     6: Others
     """
-    s_lower = source_name.lower()
-    l_lower = link.lower()
+    return resolve_source(source_name, link)[1]
+
+def _item_priority(item):
+    # Items are tagged at fetch time; resolve (memoized) for untagged ones
+    if "source_priority" in item:
+        return item["source_priority"]
+    return get_source_priority(item["source"], item["link"])
+
+def build_merged_item(group):
+    """
+    Builds a merged news item from a group of similar items.
+    group[0] is the base item the others were matched against.
+    """
+    # Determine best item in group based on Source Priority
+    # Sort group by priority (asc) then by time (desc)
+    best_item = min(group, key=lambda x: (_item_priority(x), -x["publish_time"].timestamp()))
+    
+    # summaries/contents are derived from original_items, not copied
+    merged_item = MergedNews(
+        title=best_item["title"], # Use title from best source
+        link=best_item["link"],   # Use link from best source
+        source=best_item["source"], # Use source name from best source
+        publish_time=max(item["publish_time"] for item in group), # Use latest time
+        sources=list(set(item["source"] for item in group)),
+        links=list(set(item["link"] for item in group)),
+        original_items=group
+    )
+    
+    # Carry the best item's source tags so scoring doesn't resolve them again
+    if "source_tier" in best_item:
+        merged_item["source_tier"] = best_item["source_tier"]
+        merged_item["source_priority"] = best_item["source_priority"]
+    return merged_item
+
+def _merge_greedy(sorted_news, merged_news):
+    """
+    Latest-first greedy merge (original semantics): each base item absorbs every
+    remaining item similar to it; similarity is not transitive.
+    Returns (merged_news, updated group count).
+    """
+    # Existing groups come first in the latest-first order, so their bases get first pick
+    bases = [merged_item["original_items"][0] for merged_item in merged_news]
+    base_index = TitleIndex(SIMILARITY_BLOCKING)
+    for base_item in bases:
+        base_index.add(base_item["title_norm"])
+    
+    changed_groups = {}
+    remaining_news = []
+    for item in sorted_news:
+        for i in base_index.candidates(item["title_norm"], MERGE_SIMILARITY_THRESHOLD):
+            if is_similar(bases[i]["title_norm"], item["title_norm"]):
+                changed_groups.setdefault(i, list(merged_news[i]["original_items"])).append(item)
+                break
+        else:
+            remaining_news.append(item)
     
-    # 1. Official Sources
-    for name, url in TIER1_SOURCES.items():
-        if name.lower() in s_lower or url in link:
-            return 1
-            
-    # 2. Reuters
-    if "reuters" in s_lower or "reuters.com" in l_lower:
-        return 2
+    for i, group in changed_groups.items():
+        merged_news[i] = build_merged_item(group)
+    
+    # Index the rest by position; each base only checks unassigned candidates
+    item_index = TitleIndex(SIMILARITY_BLOCKING)
+    for item in remaining_news:
+        item_index.add(item["title_norm"])
+    assigned = [False] * len(remaining_news)
+    
+    for position, base_item in enumerate(remaining_news):
+        if assigned[position]:
+            continue
+        assigned[position] = True
         
-    # 3. Bloomberg
-    if "bloomberg" in s_lower or "bloomberg.com" in l_lower:
-        return 3
+        # Initialize group
+        group = [base_item]
         
-    # 4. TechCrunch
-    if "techcrunch" in s_lower or "techcrunch.com" in l_lower:
-        return 4
+        # Find similar items among the later, still unassigned ones
+        for candidate in item_index.candidates(base_item["title_norm"], MERGE_SIMILARITY_THRESHOLD):
+            if candidate > position and not assigned[candidate] and is_similar(base_item["title_norm"], remaining_news[candidate]["title_norm"]):
+                assigned[candidate] = True
+                group.append(remaining_news[candidate])
         
-    # 5. Tier 2 (Other Media)
-    for name, url in TIER2_SOURCES.items():
-        if name.lower() in s_lower or url in link:
-            return 5
-            
-    # 6. Others
-    return 6
+        merged_news.append(build_merged_item(group))
+    
+    return merged_news, len(changed_groups)
+
+def _find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]] # Path halving
+        i = parents[i]
+    return i
+
+def _link_similar_titles(all_items, parents, first_new):
+    # Pairs the index of normalized titles can't rule out, verified with SequenceMatcher
+    index = TitleIndex(SIMILARITY_BLOCKING)
+    for item in all_items[:first_new]:
+        index.add(item["title_norm"])
+    
+    for position in range(first_new, len(all_items)):
+        item = all_items[position]
+        for candidate in index.candidates(item["title_norm"], MERGE_SIMILARITY_THRESHOLD):
+            root, candidate_root = _find(parents, position), _find(parents, candidate)
+            if root != candidate_root and is_similar(all_items[candidate]["title_norm"], item["title_norm"]):
+                parents[root] = candidate_root
+        index.add(item["title_norm"])
+
+def _link_similar_embeddings(all_items, parents, first_new):
+    # Pairs with cosine similarity >= EMBEDDING_MERGE_THRESHOLD, one matrix product per block
+    from src.embeddings import embed_items, EarlierSimilar
+    similar_earlier = EarlierSimilar(embed_items(all_items), EMBEDDING_MERGE_THRESHOLD)
+    for position in range(first_new, len(all_items)):
+        for candidate in similar_earlier(position):
+            root, candidate_root = _find(parents, position), _find(parents, int(candidate))
+            if root != candidate_root:
+                parents[root] = candidate_root
 
-def merge_news_items(news_list):
+def _merge_components(sorted_news, merged_news):
+    """
+    Union-find merge: items are connected if their titles are similar (or their
+    embeddings, with SIMILARITY_MODE=embedding), and each connected component
+    becomes one merged item (similarity is transitive).
+    Returns (merged_news, updated group count).
+    """
+    existing_groups = [merged_item["original_items"] for merged_item in merged_news]
+    all_items = [item for group in existing_groups for item in group] + sorted_news
+    parents = list(range(len(all_items)))
+    
+    # Existing groups are already components: link their members without comparing titles
+    position = 0
+    for group in existing_groups:
+        for offset in range(1, len(group)):
+            parents[_find(parents, position + offset)] = _find(parents, position)
+        position += len(group)
+    
+    # Only pairs involving a new item need a similarity check
+    if SIMILARITY_MODE == "embedding":
+        _link_similar_embeddings(all_items, parents, position)
+    else:
+        _link_similar_titles(all_items, parents, position)
+    
+    components = {}
+    for position, item in enumerate(all_items):
+        components.setdefault(_find(parents, position), []).append(item)
+    
+    # Keep unchanged merged items as-is, rebuild the rest (members latest first)
+    unchanged = {id(group[0]): merged_item for group, merged_item in zip(existing_groups, merged_news)}
+    result = []
+    updated_count = 0
+    for group in components.values():
+        group.sort(key=lambda x: x["publish_time"], reverse=True)
+        merged_item = unchanged.get(id(group[0]))
+        if merged_item is None or len(merged_item["original_items"]) != len(group):
+            if any(id(item) in unchanged for item in group):
+                updated_count += 1
+            merged_item = build_merged_item(group)
+        result.append(merged_item)
+    
+    result.sort(key=lambda x: x["publish_time"], reverse=True)
+    return result, updated_count
+
+def merge_news_items(news_list, merged_news=None):
     """
     Merges news items that are about the same topic.
     Selects the best title and link based on source priority.
+
+    MERGE_STRATEGY "components" (default) merges connected components of similar
+    titles; "greedy" keeps the original latest-first behaviour where each base
+    item only absorbs items similar to itself. Both compare normalized titles
+    (see src.normalize), and only the pairs a title index selects (see
+    src.similarity_index); SIMILARITY_BLOCKING=none gives the same result as
+    comparing every pair.
+    SIMILARITY_MODE=embedding makes the components merge link items by
+    embedding similarity instead; the greedy merge always compares titles.
+
+    If merged_news (the result of a previous call) is given, news_list must only
+    contain items OLDER than everything already merged (i.e. the items admitted
+    by a wider freshness window). They are attached to existing groups exactly
+    as a full re-merge would, and only the groups that changed are rebuilt;
+    untouched merged items are returned as the same objects.
     """
-    merged_news = []
-    
     logger.info(f"Starting merge process on {len(news_list)} items")
     
     # Sort by publish time desc so we prioritize latest as the "base" for loop
-    sorted_news = sorted(news_list, key=lambda x: x['publish_time'], reverse=True)
+    sorted_news = sorted((normalized(item) for item in news_list), key=lambda x: x['publish_time'], reverse=True)
+    merged_news = list(merged_news or [])
+    existing_count = len(merged_news)
     
-    while sorted_news:
-        base_item = sorted_news.pop(0)
-        
-        # Initialize group
-        group = [base_item]
-        
-        # Find similar items
-        remaining_news = []
-        for item in sorted_news:
-            if is_similar(base_item["title"], item["title"]):
-                group.append(item)
-            else:
-                remaining_news.append(item)
-        
-        sorted_news = remaining_news
-        
-        # Determine best item in group based on Source Priority
-        # Sort group by priority (asc) then by time (desc)
-        best_item = sorted(group, key=lambda x: (get_source_priority(x["source"], x["link"]), -x["publish_time"].timestamp()))[0]
-        
-        # Construct merged item
-        merged_item = {
-            "title": best_item["title"], # Use title from best source
-            "link": best_item["link"],   # Use link from best source
-            "source": best_item["source"], # Use source name from best source
-            "publish_time": max(item["publish_time"] for item in group), # Use latest time
-            "sources": list(set(item["source"] for item in group)),
-            "links": list(set(item["link"] for item in group)),
-            "summaries": [item["summary"] for item in group],
-            "contents": [item.get("content", "") for item in group],
-            "original_items": group
-        }
-        
-        merged_news.append(merged_item)
+    if MERGE_STRATEGY == "greedy":
+        merged_news, updated_count = _merge_greedy(sorted_news, merged_news)
+    else:
+        merged_news, updated_count = _merge_components(sorted_news, merged_news)
         
-    logger.info(f"Merge complete. Resulted in {len(merged_news)} items from {len(news_list)} original items.")
+    logger.info(f"Merge complete. Resulted in {len(merged_news)} items ({updated_count} of {existing_count} existing updated) from {len(news_list)} original items.")
     return merged_news
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+import time
+from src.utils import setup_logger
+from src.llm_cache import cache_stats
+
+logger = setup_logger("metrics")
+
+# Lightweight per-run instrumentation.
+# Pipeline stages are wrapped in `with stage("name", items_in=n) as timer:` and
+# set timer.items_out; repeated stages (e.g. per freshness window) accumulate
+# under the same name, and labels (e.g. feed=url) keep separate series.
+# LLM calls report latency and token usage, and counters cover cache hits and
+# skipped items. At the end of a run the numbers can be written as a JSON
+# report and/or a Prometheus textfile (node_exporter textfile collector).
+
+_lock = threading.Lock()
+_started_at = time.time()
+_stages = {} # (name, labels) -> aggregated stage record
+_counters = {}
+_llm_latencies = []
+_llm_tokens = {"prompt": 0, "completion": 0}
+
+class _StageTimer:
+    def __init__(self, name, items_in, labels):
+        self.name = name
+        self.items_in = items_in
+        self.items_out = None
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_stage(self.name, time.perf_counter() - self.start, self.items_in, self.items_out, **self.labels)
+        return False
+
+def stage(name, items_in=None, **labels):
+    """
+    Context manager timing one pipeline stage. Set .items_out on the returned
+    timer to record how many items the stage produced.
+    """
+    return _StageTimer(name, items_in, labels)
+
+def record_stage(name, seconds, items_in=None, items_out=None, **labels):
+    """
+    Adds one execution of a stage (wall time and item counts).
+    """
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        record = _stages.setdefault(key, {"stage": name, **labels, "calls": 0, "seconds": 0.0, "items_in": 0, "items_out": 0})
+        record["calls"] += 1
+        record["seconds"] += seconds
+        record["items_in"] += items_in or 0
+        record["items_out"] += items_out or 0
+
+def increment(name, value=1):
+    """
+    Adds value to a named counter.
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+def record_llm_call(seconds, usage=None):
+    """
+    Records one LLM request: latency (including retries) and token usage
+    from the response's usage block, when the API returns one.
+    """
+    with _lock:
+        _llm_latencies.append(seconds)
+        if usage is not None:
+            _llm_tokens["prompt"] += getattr(usage, "prompt_tokens", 0) or 0
+            _llm_tokens["completion"] += getattr(usage, "completion_tokens", 0) or 0
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def _hit_rate(hits, misses):
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+def run_report():
+    """
+    Returns the metrics collected so far as a JSON-serializable dict.
+    """
+    llm_cache = cache_stats()
+    with _lock:
+        stages = [dict(record, seconds=round(record["seconds"], 6)) for record in _stages.values()]
+        counters = dict(_counters)
+        latencies = list(_llm_latencies)
+        tokens = dict(_llm_tokens)
+
+    return {
+        "started_at": _started_at,
+        "duration_seconds": round(time.time() - _started_at, 3),
+        "stages": stages,
+        "llm": {
+            "calls": len(latencies),
+            "prompt_tokens": tokens["prompt"],
+            "completion_tokens": tokens["completion"],
+            "latency_seconds_total": round(sum(latencies), 3),
+            "latency_seconds_p50": round(_percentile(latencies, 0.5), 3),
+            "latency_seconds_p95": round(_percentile(latencies, 0.95), 3),
+            "packed_prompt_tokens_saved": counters.get("prompt_tokens_saved", 0)
+        },
+        "caches": {
+            "llm": {**llm_cache, "hit_rate": _hit_rate(llm_cache["hits"], llm_cache["misses"])},
+            "feed": {
+                "hits": counters.get("feed_cache_hits", 0),
+                "misses": counters.get("feed_cache_misses", 0),
+                "hit_rate": _hit_rate(counters.get("feed_cache_hits", 0), counters.get("feed_cache_misses", 0))
+            }
+        },
+        "counters": counters
+    }
+
+def log_summary(report=None):
+    """
+    Logs one line per top-level stage (wall time and items in -> out).
+    """
+    report = report or run_report()
+    for record in report["stages"]:
+        if record["stage"] == "fetch_feed":
+            continue # Per-feed detail stays in the report
+        logger.info(f"Stage {record['stage']}: {record['seconds']:.3f}s, {record['items_in']} -> {record['items_out']} items")
+    llm = report["llm"]
+    logger.info(
+        f"LLM: {llm['calls']} calls, {llm['prompt_tokens']} prompt / {llm['completion_tokens']} completion tokens, "
+        f"p95 latency {llm['latency_seconds_p95']}s"
+    )
+    if llm["packed_prompt_tokens_saved"]:
+        logger.info(f"Prompt packing: ~{llm['packed_prompt_tokens_saved']} prompt tokens saved (estimated, see src.prompt_packer)")
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path) # Collectors never read a half-written file
+
+def write_report(path, report=None):
+    """
+    Writes the run report as JSON.
+    """
+    _write_atomic(path, json.dumps(report or run_report(), indent=2, ensure_ascii=False))
+    logger.info(f"Run report written to {path}")
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(record):
+    labels = {key: value for key, value in record.items() if key not in ("calls", "seconds", "items_in", "items_out")}
+    return ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+
+def to_prometheus(report=None):
+    """
+    Renders the run report in the Prometheus text exposition format.
+    """
+    report = report or run_report()
+    lines = []
+
+    def metric(name, metric_type, help_text, samples):
+        lines.append(f"# HELP ai_news_{name} {help_text}")
+        lines.append(f"# TYPE ai_news_{name} {metric_type}")
+        for labels, value in samples:
+            lines.append(f"ai_news_{name}{{{labels}}} {value}" if labels else f"ai_news_{name} {value}")
+
+    stages = report["stages"]
+    metric("stage_seconds", "gauge", "Wall time spent in a pipeline stage.", [(_labels(r), r["seconds"]) for r in stages])
+    metric("stage_items_in", "gauge", "Items entering a pipeline stage.", [(_labels(r), r["items_in"]) for r in stages])
+    metric("stage_items_out", "gauge", "Items leaving a pipeline stage.", [(_labels(r), r["items_out"]) for r in stages])
+
+    llm = report["llm"]
+    metric("llm_calls", "gauge", "LLM requests made in the last run.", [("", llm["calls"])])
+    metric("llm_tokens", "gauge", "LLM tokens used in the last run.", [
+        ('type="prompt"', llm["prompt_tokens"]), ('type="completion"', llm["completion_tokens"])
+    ])
+    metric("llm_latency_seconds", "gauge", "LLM request latency in the last run.", [
+        ('quantile="0.5"', llm["latency_seconds_p50"]), ('quantile="0.95"', llm["latency_seconds_p95"])
+    ])
+
+    metric("cache_hit_ratio", "gauge", "Cache hit ratio in the last run.", [
+        (f'cache="{name}"', cache["hit_rate"]) for name, cache in report["caches"].items() if cache["hit_rate"] is not None
+    ])
+    metric("counter", "gauge", "Pipeline counters of the last run.", [
+        (f'name="{_escape_label(name)}"', value) for name, value in sorted(report["counters"].items())
+    ])
+    metric("run_duration_seconds", "gauge", "Duration of the last run.", [("", report["duration_seconds"])])
+    metric("last_run_timestamp_seconds", "gauge", "Start time of the last run.", [("", round(report["started_at"], 3))])
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path, report=None):
+    """
+    Writes the run report as a Prometheus textfile.
+    """
+    _write_atomic(path, to_prometheus(report))
+    logger.info(f"Prometheus metrics written to {path}")
@@ -0,0 +1,91 @@
+import sys
+
+# Compact news item records shared by all pipeline stages.
+# Both classes use __slots__ (no per-instance __dict__) and keep the dict-style
+# access the stages were written against (item["title"], item.get("title"),
+# "rule_score" in item, dict(item)), so plain dicts (e.g. benchmark corpora)
+# still work everywhere. A field that was never set behaves like a missing key.
+
+class _SlotRecord:
+    __slots__ = ()
+    FIELDS = frozenset()
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS and hasattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.FIELDS:
+            return default
+        return getattr(self, key, default)
+
+    def keys(self):
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{key}={self[key]!r}' for key in self.keys())})"
+
+class NewsItem(_SlotRecord):
+    """
+    A single fetched feed entry. The normalized text fields are filled in by
+    src.normalize, the scores by src.scoring when items are scored unmerged.
+    """
+    __slots__ = (
+        "title", "link", "source", "publish_time", "summary", "content", "source_tier", "source_priority", "embedding",
+        "title_norm", "text", "text_lower", "title_tokens", "title_fp", "rule_score", "ai_score", "final_score"
+    )
+    FIELDS = frozenset(__slots__)
+
+    def __init__(self, title, link, source, publish_time, summary="", content="", **tags):
+        self.title = title
+        self.link = link
+        self.source = sys.intern(source) # Every item of a feed shares the same source name
+        self.publish_time = publish_time
+        self.summary = summary
+        self.content = content
+        for key, value in tags.items():
+            self[key] = value
+
+class MergedNews(_SlotRecord):
+    """
+    A group of similar news items merged into one story.
+    summaries / contents are read from original_items on access instead of
+    being copied into every merged item.
+    """
+    __slots__ = (
+        "title", "link", "source", "publish_time", "sources", "links", "original_items",
+        "source_tier", "source_priority", "rule_score", "ai_score", "final_score"
+    )
+    FIELDS = frozenset(__slots__ + ("summaries", "contents"))
+
+    def __init__(self, title, link, source, publish_time, sources, links, original_items):
+        self.title = title
+        self.link = link
+        self.source = source
+        self.publish_time = publish_time
+        self.sources = sources
+        self.links = links
+        self.original_items = original_items
+
+    @property
+    def summaries(self):
+        return [item["summary"] for item in self.original_items]
+
+    @property
+    def contents(self):
+        return [item.get("content", "") for item in self.original_items]
+
+    def keys(self):
+        return super().keys() + ["summaries", "contents"]
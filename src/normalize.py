@@ -0,0 +1,111 @@
+import html
+import re
+from src.utils import setup_logger
+from src.similarity_index import tokenize_title, fingerprint_tokens
+
+logger = setup_logger("normalize")
+
+# Text normalization, run once per item right after fetch (normalize_news).
+# Feed summaries are HTML and titles carry case / entity noise, and every later
+# stage used to clean them again: rule scoring joined and lowercased the
+# summaries per item, prompts joined and truncated them, the no-AI fallback
+# stripped tags with a regex per call, and dedup / merge / history tokenized
+# and fingerprinted titles over and over. normalize_item stores the results on
+# the item instead:
+# - title_norm: title with entities decoded, whitespace collapsed, lowercased
+#   (what dedup and merge compare)
+# - text: summary as plain text (tags, scripts and styles removed, entities
+#   decoded, whitespace collapsed), used by prompts and embeddings
+# - text_lower: text lowercased, used by keyword scoring
+# - title_tokens / title_fp: token set of title_norm and its fingerprint, used
+#   by the run history
+# The accessors below read these fields and normalize an item on first use if
+# the stage didn't run (e.g. plain dicts in benchmarks). Merged items read
+# them from their original items.
+
+SCRIPT_STYLE_PATTERN = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r"<[^<]+?>")
+
+def clean_text(text):
+    """
+    Returns the plain text of an HTML snippet: scripts, styles and tags
+    removed, entities decoded, whitespace collapsed.
+    """
+    if not text:
+        return ""
+    if "<" in text:
+        text = TAG_PATTERN.sub(" ", SCRIPT_STYLE_PATTERN.sub(" ", text))
+    if "&" in text:
+        text = html.unescape(text)
+    return " ".join(text.split())
+
+def normalize_title(title):
+    """
+    Returns the comparison form of a title: entities decoded, whitespace
+    collapsed, lowercased.
+    """
+    if not title:
+        return ""
+    if "&" in title:
+        title = html.unescape(title)
+    return " ".join(title.split()).lower()
+
+def normalize_item(item):
+    """
+    Stores title_norm, text, text_lower, title_tokens and title_fp on item.
+    """
+    title_norm = normalize_title(item.get("title"))
+    text = clean_text(item.get("summary"))
+    tokens = frozenset(tokenize_title(title_norm))
+    item["title_norm"] = title_norm
+    item["text"] = text
+    item["text_lower"] = text.lower()
+    item["title_tokens"] = tokens
+    item["title_fp"] = fingerprint_tokens(tokens)
+    return item
+
+def normalized(item):
+    """
+    Returns item, normalizing it first if that hasn't happened yet.
+    """
+    if "title_fp" not in item:
+        normalize_item(item)
+    return item
+
+def normalize_news(news_list):
+    """
+    Normalizes every item that isn't normalized yet. Returns news_list.
+    """
+    count = 0
+    for item in news_list:
+        if "title_fp" not in item:
+            normalize_item(item)
+            count += 1
+    logger.info(f"Normalized {count} of {len(news_list)} items")
+    return news_list
+
+def summary_texts(item):
+    """
+    Returns the plain-text summaries of an item (one per original item for
+    merged news).
+    """
+    originals = item.get("original_items")
+    if originals is not None:
+        return [normalized(original)["text"] for original in originals]
+    if "summaries" in item:
+        return [clean_text(summary) for summary in item["summaries"]]
+    return [normalized(item)["text"]]
+
+def search_text(item):
+    """
+    Returns the lowercased title and plain-text summaries of an item, the text
+    keyword scoring matches against.
+    """
+    originals = item.get("original_items")
+    if originals is not None:
+        parts = [normalized(original)["text_lower"] for original in originals]
+    elif "summaries" in item:
+        parts = [clean_text(summary).lower() for summary in item["summaries"]]
+    else:
+        parts = [normalized(item)["text_lower"]]
+    return item.get("title", "").lower() + " " + " ".join(parts)
@@ -0,0 +1,185 @@
+from src.config import AI_API_KEY, AI_PROVIDER, AI_MODEL, AI_BASE_URL, FEISHU_WEBHOOK, TOP_N
+from src.utils import setup_logger
+from src.normalize import normalize_news
+from src.freshness_filter import FreshnessIndex, filter_fresh_news
+from src.deduplicate import deduplicate_news
+from src.merge_news import merge_news_items
+from src.scoring import filter_by_rule_score
+from src.ranking import rank_news
+from src.llm_cache import cache_stats
+from src.history_store import record_processed, record_sent
+from src.metrics import stage
+
+logger = setup_logger("pipeline")
+
+# Pipeline stages shared by both runners: src.main (threads, the default) and
+# src.async_pipeline (--async). The runners only differ in how they drive the
+# network-bound stages (fetch, AI score, summarize, send); everything from
+# normalization to ranking, the summary formatting and the run history
+# bookkeeping lives here.
+
+# Tiered freshness windows (hours), tried in order until enough news is found
+TIME_WINDOWS = [24, 72, 120]
+
+def log_configuration():
+    # Log configuration (masking sensitive data)
+    masked_key = f"{AI_API_KEY[:4]}...{AI_API_KEY[-4:]}" if AI_API_KEY and len(AI_API_KEY) > 8 else "NOT_SET"
+    logger.info(f"Configuration: Provider={AI_PROVIDER}, Model={AI_MODEL}, BaseURL={AI_BASE_URL}, API_KEY={masked_key}")
+    logger.info(f"Feishu Webhook set: {'Yes' if FEISHU_WEBHOOK else 'No'}")
+
+def select_candidates(all_news, time_windows, target_count):
+    """
+    Runs Deduplicate -> Merge -> Rule Score over growing freshness windows until
+    one yields enough candidates.
+
+    Items are indexed by publish time once, so per-window counts are known up
+    front: windows holding fewer than target_count items can't yield enough
+    candidates and are skipped, starting at the smallest window that could.
+    Each wider window only adds items older than the previous one, so the work is
+    incremental: new items are deduplicated against the already-unique set,
+    attached to the existing merge groups, and only new/changed merged items are
+    rule scored. Admitted items are recorded in the run history. AI scoring
+    doesn't affect how many items survive, so it is left to the caller and runs
+    once for the chosen window instead of per window.
+    """
+    index = FreshnessIndex(all_news)
+    if not index:
+        logger.info("No news with a publish time found.")
+        return []
+    
+    counts = index.counts(time_windows)
+    logger.info(f"Items per window: {', '.join(f'{hours}h={count}' for hours, count in counts.items())}")
+    
+    # Smallest window that holds enough raw items (the widest one if none does)
+    first = next((i for i, hours in enumerate(time_windows) if counts[hours] >= target_count), len(time_windows) - 1)
+    if first:
+        logger.info(f"Skipping windows {time_windows[:first]}: fewer than {target_count} items")
+    
+    unique_news = []
+    merged_news = []
+    candidates = []
+    previous_hours = None
+    
+    for hours in time_windows[first:]:
+        logger.info(f"Trying time window: {hours} hours")
+        with stage("freshness", items_in=len(all_news)) as timer:
+            if previous_hours is None:
+                new_news = filter_fresh_news(all_news, hours=hours, index=index)
+            else:
+                new_news = index.between(previous_hours, hours)
+            timer.items_out = len(new_news)
+        previous_hours = hours
+        logger.info(f"{len(new_news)} newly admitted items within {hours}h window")
+        record_processed(new_news)
+        
+        # 3. Deduplicate (only the newly admitted items, against what we already kept)
+        with stage("deduplicate", items_in=len(new_news)) as timer:
+            new_unique = deduplicate_news(new_news, known_news=unique_news)
+            timer.items_out = len(new_unique)
+        unique_news.extend(new_unique)
+        
+        # 4. Merge (attach to existing groups, rebuild only changed ones)
+        with stage("merge", items_in=len(new_unique)) as timer:
+            merged_news = merge_news_items(new_unique, merged_news=merged_news)
+            timer.items_out = len(merged_news)
+        
+        # 5. Rule Score (unchanged merged items keep their score)
+        with stage("rule_score", items_in=len(merged_news)) as timer:
+            candidates = filter_by_rule_score(merged_news)
+            timer.items_out = len(candidates)
+        
+        # Check if we have enough high-quality news (ranking keeps at most TOP_N)
+        if min(len(candidates), TOP_N) >= target_count:
+            logger.info(f"Found {len(candidates)} items within {hours}h window. Stopping search.")
+            break
+        else:
+            logger.info(f"Only found {len(candidates)} items within {hours}h window. Expanding search...")
+    
+    # If we ran out of windows, just take what we have
+    return candidates
+
+def build_candidates(all_news, args):
+    """
+    Normalize -> Freshness -> Deduplicate -> Merge -> Rule Score on the fetched
+    items. Returns the rule-sorted candidates.
+    """
+    # Clean and tokenize titles/summaries once for every later stage (see src.normalize)
+    with stage("normalize", items_in=len(all_news)) as timer:
+        normalize_news(all_news)
+        timer.items_out = len(all_news)
+
+    # 2. Filter Freshness (Tiered Strategy: 24h -> 72h -> 120h)
+    if not args.ignore_freshness:
+        return select_candidates(all_news, TIME_WINDOWS, TOP_N)
+    
+    logger.info("TEST MODE: Ignoring freshness filter. Processing ALL fetched news.")
+    # 3. Deduplicate -> 4. Merge -> 5. Rule Score
+    record_processed(all_news)
+    with stage("deduplicate", items_in=len(all_news)) as timer:
+        unique_news = deduplicate_news(all_news)
+        timer.items_out = len(unique_news)
+    with stage("merge", items_in=len(unique_news)) as timer:
+        merged_news = merge_news_items(unique_news)
+        timer.items_out = len(merged_news)
+    with stage("rule_score", items_in=len(merged_news)) as timer:
+        candidates = filter_by_rule_score(merged_news)
+        timer.items_out = len(candidates)
+    return candidates
+
+def pick_top_news(scored_news):
+    """
+    Ranks the scored candidates and returns the top TOP_N.
+    """
+    with stage("rank", items_in=len(scored_news)) as timer:
+        selected_news = rank_news(scored_news)
+
+        # Take top N
+        top_news = selected_news[:TOP_N]
+        timer.items_out = len(top_news)
+    return top_news
+
+def format_summary(item, summary_data):
+    """
+    Merges an item's AI summary with the item's own data (links, sources,
+    publish date, URL / source name fallbacks).
+    """
+    # Merge summary data with original item data
+    final_item = {
+        **summary_data,
+        "links": item.get("links", []),
+        "original_sources": item.get("sources", []), 
+        "original_title": item.get("title"),
+        "publish_date": item.get("publish_time").strftime("%Y-%m-%d %H:%M") # Format for Feishu
+    }
+    
+    # Fallback logic for URL and Source Name
+    if not final_item.get("url") or final_item.get("url") == "":
+         if item.get("link"):
+             final_item["url"] = item["link"]
+         elif item.get("links"):
+             final_item["url"] = item["links"][0]
+    
+    if not final_item.get("source_name") or final_item.get("source_name") == "Unknown":
+         if item.get("source"):
+             final_item["source_name"] = item["source"]
+         elif item.get("sources"):
+             final_item["source_name"] = item["sources"][0]
+    
+    return final_item
+
+def record_delivery(top_news, summarized_news):
+    """
+    Records the original items behind the sent summaries in the run history,
+    so later runs skip them.
+    """
+    sent_links = {link for summary in summarized_news for link in summary.get("links", [])}
+    record_sent([
+        original for item in top_news for original in item.get("original_items", [item])
+        if original.get("link") in sent_links
+    ])
+
+def log_completion():
+    llm_cache_stats = cache_stats()
+    logger.info(f"LLM cache: {llm_cache_stats['hits']} hits, {llm_cache_stats['misses']} misses")
+        
+    logger.info("Pipeline completed successfully.")
@@ -0,0 +1,103 @@
+import re
+
+# Token-budgeted prompt packing for the LLM requests in src/ai_summary.py.
+# A merged story carries one summary per source, and the sources mostly
+# restate each other: the summary prompt used to send all of them in full, and
+# the score prompts cut the joined text at a fixed character count (which
+# could keep three copies of the same lead sentence and drop the one fact only
+# the fourth source had). pack_texts instead:
+# - splits the summaries into sentences and drops sentences whose tokens are
+#   (almost) all contained in a sentence that was already kept
+# - if the rest doesn't fit the token budget, ranks sentences by information
+#   density (distinct content words and numbers per estimated token, leads of
+#   each source first) and keeps the best ones that fit
+# - returns the kept sentences in their original order, one line per source
+# Token counts are estimated locally (estimate_tokens), no tokenizer needed.
+# The packed text is part of the rendered request that keys the LLM cache
+# (src.llm_cache), so changing a budget re-asks instead of reusing answers to
+# the old prompts. tokens_saved is added to the prompt_tokens_saved run counter
+# only for requests that are actually sent (see src.ai_summary).
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])")
+CJK_PATTERN = re.compile(r"[\u4e00-\u9fff]")
+WORD_PATTERN = re.compile(r"[\u4e00-\u9fff]|[^\W\u4e00-\u9fff]+") # One token per Chinese character, words in any other script
+NUMBER_PATTERN = re.compile(r"\d")
+DUPLICATE_CONTAINMENT = 0.8 # Share of a sentence's tokens found in a kept sentence
+LEAD_BONUS = 1.5 # Density multiplier for the first sentence of each source
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have in into is it its of on or that the their "
+    "this to was were which will with".split()
+)
+
+def estimate_tokens(text):
+    """
+    Estimates the token count of text: about one token per CJK character and
+    one per four other characters.
+    """
+    if not text:
+        return 0
+    cjk = len(CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+def split_sentences(text):
+    """
+    Splits plain text into sentences (English and CJK sentence punctuation).
+    """
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.split(text) if sentence.strip()]
+
+def _density(tokens, sentence_tokens, lead):
+    content = [token for token in tokens if token not in STOPWORDS]
+    score = (len(content) + sum(1 for token in content if NUMBER_PATTERN.match(token))) / max(sentence_tokens, 1)
+    return score * LEAD_BONUS if lead else score
+
+def _sentence_tokens(sentence):
+    return set(WORD_PATTERN.findall(sentence.lower()))
+
+def _is_repeated(tokens, kept_token_sets):
+    if not tokens:
+        return False # Nothing to compare (e.g. only punctuation or symbols): keep it
+    needed = DUPLICATE_CONTAINMENT * len(tokens)
+    return any(len(tokens & kept) >= needed for kept in kept_token_sets)
+
+def pack_texts(texts, budget):
+    """
+    Packs texts (e.g. the per-source summaries of a merged item) into at most
+    budget estimated tokens (0 = no limit, only repeated sentences are
+    dropped). Returns the packed text, one line per source that kept a
+    sentence.
+    """
+    sentences = [] # (source, position, text, estimated tokens, density)
+    kept_token_sets = []
+    for source, text in enumerate(texts):
+        for position, sentence in enumerate(split_sentences(text)):
+            tokens = _sentence_tokens(sentence)
+            if _is_repeated(tokens, kept_token_sets):
+                continue
+            kept_token_sets.append(tokens)
+            sentence_tokens = estimate_tokens(sentence)
+            sentences.append((source, position, sentence, sentence_tokens, _density(tokens, sentence_tokens, position == 0)))
+
+    if budget and sum(sentence[3] for sentence in sentences) > budget:
+        chosen = []
+        remaining = budget
+        for sentence in sorted(sentences, key=lambda x: x[4], reverse=True):
+            if sentence[3] <= remaining:
+                chosen.append(sentence)
+                remaining -= sentence[3]
+        if not chosen:
+            # Not even one sentence fits: cut the densest one to the budget
+            source, position, sentence, sentence_tokens, density = max(sentences, key=lambda x: x[4])
+            sentence = sentence[:len(sentence) * budget // sentence_tokens]
+            chosen.append((source, position, sentence, estimate_tokens(sentence), density))
+        sentences = sorted(chosen)
+
+    lines = {}
+    for source, _, sentence, _, _ in sentences:
+        lines.setdefault(source, []).append(sentence)
+    return "\n".join(" ".join(line) for line in lines.values())
+
+def tokens_saved(texts, packed):
+    """
+    Estimated prompt tokens saved by sending packed instead of all texts.
+    """
+    return sum(estimate_tokens(text) for text in texts) - estimate_tokens(packed)
@@ -1,6 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 from src.utils import setup_logger
-from src.ai_summary import get_ai_score
-from src.config import TIER1_COMPANIES, TIER2_COMPANIES, TIER3_COMPANIES, TIER1_SOURCES, TIER2_SOURCES
+from src.keyword_matcher import KeywordMatcher
+from src.ai_summary import get_ai_score, get_ai_scores_batch
+from src.source_index import get_source_tier, is_official_link
+from src.normalize import search_text
+from src.config import TIER1_COMPANIES, TIER2_COMPANIES, TIER3_COMPANIES
+from src.config import AI_SCORE_MODE, AI_SCORE_CONCURRENCY, AI_SCORE_BATCH_SIZE, BATCH_SCORING_MIN_ITEMS
 import re
 
 logger = setup_logger("scoring")
@@ -39,63 +44,87 @@ KEYWORDS_LOCAL_ONLY = [
     "government of", "ministry of", "state of", "province", "city of"
 ]
 
+# Only the top rule-scored candidates get an AI score (saves API calls/time)
+AI_SCORE_TOP_K = 20
+
+# Marketing claims backed by numbers (e.g. "40%", "3x", "128k", "$20") count as substance
+SUBSTANCE_PATTERN = re.compile(r'\d+(\.\d+)?%|\d+x|\d+[kKmMbB]|\$\d+')
+
+# All keyword classes are matched together once per item (see src/keyword_matcher.py)
+KEYWORD_MATCHER = KeywordMatcher({
+    "local_only": KEYWORDS_LOCAL_ONLY,
+    "local_context": ["training", "initiative", "residents"],
+    "event_strength": KEYWORDS_EVENT_STRENGTH,
+    "marketing": KEYWORDS_MARKETING,
+    "substance": ["api", "parameter", "function", "mode", "feature"],
+    "landing": KEYWORDS_LANDING_ENTRY + KEYWORDS_LANDING_TECH + KEYWORDS_LANDING_COMMERCIAL,
+    "type_product_model_release": ["new model", "new product", "launch", "release"],
+    "type_capability_strategy": ["update", "upgrade", "api", "capability", "strategy", "price"],
+    "tier1_company": TIER1_COMPANIES,
+    "tier2_company": TIER2_COMPANIES,
+    "tier3_company": TIER3_COMPANIES,
+})
+F_LOCAL_ONLY = KEYWORD_MATCHER.bits["local_only"]
+F_LOCAL_CONTEXT = KEYWORD_MATCHER.bits["local_context"]
+F_EVENT_STRENGTH = KEYWORD_MATCHER.bits["event_strength"]
+F_MARKETING = KEYWORD_MATCHER.bits["marketing"]
+F_SUBSTANCE = KEYWORD_MATCHER.bits["substance"]
+F_LANDING = KEYWORD_MATCHER.bits["landing"]
+F_TYPE_PRODUCT_MODEL_RELEASE = KEYWORD_MATCHER.bits["type_product_model_release"]
+F_TYPE_CAPABILITY_STRATEGY = KEYWORD_MATCHER.bits["type_capability_strategy"]
+F_TIER1_COMPANY = KEYWORD_MATCHER.bits["tier1_company"]
+F_TIER2_COMPANY = KEYWORD_MATCHER.bits["tier2_company"]
+F_TIER3_COMPANY = KEYWORD_MATCHER.bits["tier3_company"]
+
 def calculate_rule_score(item):
     """
     Calculates the rule-based score for a news item based on PRD v1.5.
     """
     score = 0
     title = item.get("title", "")
-    summary = " ".join(item.get("summaries", []))
-    source_name = item.get("source", "")
-    text_to_check = (title + " " + summary).lower()
+    text_to_check = search_text(item) # Lowercased plain text, see src.normalize
+    features = KEYWORD_MATCHER.match(text_to_check)
     
     # --- 0. Local/Regional Filter (Hard Reject) ---
     # Reject if it's purely a local initiative (e.g., "OpenAI for India", "Training for Massachusetts")
     # UNLESS it involves a Global Product Launch or Major Policy (but usually those won't have 'residents' in title)
-    if any(kw in text_to_check for kw in KEYWORDS_LOCAL_ONLY):
+    if features & F_LOCAL_ONLY:
         # Double check: Is it a global product rollout that just happens to mention a region?
         # e.g. "ChatGPT now available in Italy" -> Maybe keep? 
         # But "Training for residents" -> Reject.
-        if "training" in text_to_check or "initiative" in text_to_check or "residents" in text_to_check:
+        if features & F_LOCAL_CONTEXT:
              logger.debug(f"Rejecting '{title[:20]}...': Local/Regional initiative")
              return 0
     
     # --- 1. Event Strength Check (Hard Filter) ---
-    has_event_strength = any(kw in text_to_check for kw in KEYWORDS_EVENT_STRENGTH)
+    has_event_strength = features & F_EVENT_STRENGTH
     if not has_event_strength:
         logger.debug(f"Rejecting '{title[:20]}...': Weak event strength")
         return 0 # Reject R101_WEAK_EVENT
 
     # --- 2. Marketing Language Check (Negative Filter) ---
     # Reject if marketing language exists BUT no specific metrics/functions are found
-    has_marketing = any(kw in text_to_check for kw in KEYWORDS_MARKETING)
-    has_substance = re.search(r'\d+(\.\d+)?%|\d+x|\d+[kKmMbB]|\$\d+', text_to_check) or \
-                    any(kw in text_to_check for kw in ["api", "parameter", "function", "mode", "feature"])
+    has_marketing = features & F_MARKETING
     
-    if has_marketing and not has_substance:
+    if has_marketing and not (features & F_SUBSTANCE or SUBSTANCE_PATTERN.search(text_to_check)):
         logger.debug(f"Rejecting '{title[:20]}...': Marketing fluff")
         return 0 # Reject R102_MARKETING_LANGUAGE
 
     # --- 3. Landing Signal Check (Hard Filter) ---
-    has_entry = any(kw in text_to_check for kw in KEYWORDS_LANDING_ENTRY)
-    has_tech = any(kw in text_to_check for kw in KEYWORDS_LANDING_TECH)
-    has_commercial = any(kw in text_to_check for kw in KEYWORDS_LANDING_COMMERCIAL)
-    
-    if not (has_entry or has_tech or has_commercial):
+    if not features & F_LANDING:
         # Allow if it's a Type 1 (New Product) even without explicit signals in text, 
         # as the event itself implies entry point usually.
         # But PRD says "Otherwise reject R093". 
         # We will be strict but allow official sources to pass easier.
-        is_official = any(s_url in item.get("link", "") for s_url in TIER1_SOURCES.values())
-        if not is_official:
+        if not is_official_link(item.get("link", "")):
              logger.debug(f"Rejecting '{title[:20]}...': No landing signal")
              return 0
 
     # --- 4. News Value Scoring (Type 1/2/3) ---
     # Heuristic detection
-    if any(kw in text_to_check for kw in ["new model", "new product", "launch", "release"]):
+    if features & F_TYPE_PRODUCT_MODEL_RELEASE:
         score += TYPE_PRODUCT_MODEL_RELEASE
-    elif any(kw in text_to_check for kw in ["update", "upgrade", "api", "capability", "strategy", "price"]):
+    elif features & F_TYPE_CAPABILITY_STRATEGY:
         score += TYPE_CAPABILITY_STRATEGY
     else:
         score += TYPE_INDUSTRY_EVENT # Fallback, lowest value
@@ -105,14 +134,11 @@ def calculate_rule_score(item):
     # CRITICAL: If the company is NOT in Tier 1 or Tier 2, apply a PENALTY.
     # This filters out "Genmab" or random partners unless the event is huge.
     
-    is_tier1 = any(c.lower() in text_to_check for c in TIER1_COMPANIES)
-    is_tier2 = any(c.lower() in text_to_check for c in TIER2_COMPANIES)
-    
-    if is_tier1:
+    if features & F_TIER1_COMPANY:
         score += 5 # P0
-    elif is_tier2:
+    elif features & F_TIER2_COMPANY:
         score += 3 # P1
-    elif any(c.lower() in text_to_check for c in TIER3_COMPANIES):
+    elif features & F_TIER3_COMPANY:
         score += 1 # P2
     else:
         # If not a known major AI company, penalize heavily (-10)
@@ -120,24 +146,13 @@ def calculate_rule_score(item):
         score -= 10
              
     # --- 6. Source Tier Scoring ---
-    is_tier1_source = False
-    for s_name, s_url in TIER1_SOURCES.items():
-        if s_name.lower() in source_name.lower() or s_url in item.get("link", ""):
-            is_tier1_source = True
-            break
-            
-    if is_tier1_source:
+    source_tier = get_source_tier(item)
+    if source_tier == 1:
         score += 5
+    elif source_tier == 2:
+        score += 3
     else:
-        is_tier2_source = False
-        for s_name, s_url in TIER2_SOURCES.items():
-            if s_name.lower() in source_name.lower() or s_url in item.get("link", ""):
-                is_tier2_source = True
-                break
-        if is_tier2_source:
-            score += 3
-        else:
-             score += 1
+        score += 1
 
     # Normalize
     # Max: 10 (Type) + 5 (Company) + 5 (Source) = 20
@@ -145,42 +160,84 @@ def calculate_rule_score(item):
     
     return max(0, normalized_score)
 
-def score_news(news_list):
+def filter_by_rule_score(news_list):
     """
-    Applies scoring to a list of news items.
-    Optimized: 
-    1. Calculate Rule Score for ALL items.
-    2. Filter out 0 scores.
-    3. Sort by Rule Score descending.
-    4. Take Top 20 candidates.
-    5. Calculate AI Score ONLY for Top 20.
-    6. Combine scores and re-rank.
+    Calculates the Rule Score for ALL items, drops rejects (0) and returns the
+    candidates sorted by Rule Score descending.
+    Items that already carry a rule_score (e.g. merged items kept unchanged from
+    a narrower freshness window) are not re-scored. From BATCH_SCORING_MIN_ITEMS
+    unscored items on, they are scored together (see src.batch_scoring) if
+    numpy is installed.
     """
-    logger.info(f"Scoring {len(news_list)} items")
+    unscored = [item for item in news_list if "rule_score" not in item]
+    if BATCH_SCORING_MIN_ITEMS and len(unscored) >= BATCH_SCORING_MIN_ITEMS:
+        try:
+            from src.batch_scoring import batch_rule_scores
+        except ImportError as e:
+            logger.warning(f"Batch rule scoring unavailable ({e}). Scoring {len(unscored)} items one by one.")
+        else:
+            for item, score in zip(unscored, batch_rule_scores(unscored)):
+                item["rule_score"] = score
+            unscored = []
+    for item in unscored:
+        item["rule_score"] = calculate_rule_score(item)
     
     candidates = []
     for item in news_list:
-        rule_score = calculate_rule_score(item)
-        
         # Filter out 0 scores (Rejects)
-        if rule_score == 0:
+        if item["rule_score"] == 0:
             continue
             
-        item["rule_score"] = rule_score
         candidates.append(item)
     
     # Sort candidates by rule score descending
     candidates.sort(key=lambda x: x["rule_score"], reverse=True)
+    return candidates
+
+def get_ai_scores(items):
+    """
+    Returns AI scores for items (same order) using AI_SCORE_MODE:
+    serial, concurrent (AI_SCORE_CONCURRENCY threads) or batch
+    (AI_SCORE_BATCH_SIZE items per prompt, per-item fallback if a batch fails).
+    """
+    if AI_SCORE_MODE == "batch":
+        scores = []
+        for start in range(0, len(items), AI_SCORE_BATCH_SIZE):
+            batch = items[start:start + AI_SCORE_BATCH_SIZE]
+            try:
+                scores.extend(get_ai_scores_batch(batch))
+            except Exception as e:
+                logger.warning(f"Batch AI scoring failed ({e}). Falling back to per-item scoring for {len(batch)} items.")
+                scores.extend(get_ai_score(item) for item in batch)
+        return scores
+    
+    if AI_SCORE_MODE == "concurrent" and AI_SCORE_CONCURRENCY > 1 and len(items) > 1:
+        with ThreadPoolExecutor(max_workers=AI_SCORE_CONCURRENCY, thread_name_prefix="ai_score") as executor:
+            return list(executor.map(get_ai_score, items))
     
+    return [get_ai_score(item) for item in items]
+
+def apply_ai_scores(candidates):
+    """
+    Calculates the AI Score for the Top 20 (AI_SCORE_TOP_K) rule-sorted
+    candidates only and combines it with the Rule Score into final_score.
+    """
     # Take top 20 for AI scoring to save API calls/time
-    top_candidates = candidates[:20]
-    remaining_candidates = candidates[20:]
+    top_candidates = candidates[:AI_SCORE_TOP_K]
+    return combine_scores(candidates, get_ai_scores(top_candidates))
+
+def combine_scores(candidates, top_ai_scores):
+    """
+    Sets ai_score / final_score on the rule-sorted candidates, given the AI
+    scores of the first len(top_ai_scores) of them. Returns the candidates.
+    """
+    top_candidates = candidates[:len(top_ai_scores)]
+    remaining_candidates = candidates[len(top_ai_scores):]
     
     scored_list = []
     
     # Process top candidates with AI scoring
-    for item in top_candidates:
-        ai_score = get_ai_score(item)
+    for item, ai_score in zip(top_candidates, top_ai_scores):
         item["ai_score"] = ai_score
         # Final Score: Rule * 0.6 + AI * 0.4
         item["final_score"] = item["rule_score"] * 0.6 + ai_score * 0.4
@@ -193,4 +250,4 @@ def score_news(news_list):
         item["final_score"] = item["rule_score"] * 0.6 # Penalty for not being top tier
         scored_list.append(item)
         
-    return scored_list
\ No newline at end of file
+    return scored_list
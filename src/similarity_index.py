@@ -0,0 +1,298 @@
+import hashlib
+import re
+from difflib import SequenceMatcher
+
+# Candidate generation for title similarity checks.
+# SequenceMatcher(None, a, b).ratio() is 2 * M / (len(a) + len(b)), where M is
+# the number of characters in its matching blocks. Those blocks are a common
+# subsequence of both titles, so M <= LCS(a, b) and 2 * LCS / (len(a) + len(b))
+# is an upper bound of the ratio: a title whose bound doesn't exceed the
+# threshold can't be similar, and skipping it never changes a result.
+# Checking that bound against every indexed title is still quadratic, so by
+# default (blocking="words") only titles sharing at least two word keys with
+# the query are bounded: an inverted index maps each key (a lowercase token
+# with a trailing "ing", "ed" or "s" stripped) to the titles containing it.
+# Keys found in more than BLOCKING_MAX_POSTINGS titles are too common to
+# block on and only count once a rarer key has selected the title. Titles
+# with at least BLOCKING_LONG_TITLE_KEYS keys also select the titles sharing
+# one key found in at most BLOCKING_SINGLE_KEY_POSTINGS titles, since long
+# titles stay similar with most of their words mistyped. This blocking is
+# approximate: a near-duplicate whose shared keys are all common, or that
+# shares too few keys (typos in most words, merged words), is missed;
+# bench_deduplicate reports how many against the exhaustive scan below.
+# Titles with fewer than two keys fall back to that scan, and entries with
+# fewer than two keys are always bounded, so short titles are never missed.
+# With blocking="none" every indexed title is bounded, which keeps the result
+# identical to comparing every pair. LCS lengths are then computed
+# bit-parallel (Hyyro's algorithm) against a block of indexed titles at once:
+# each block packs titles of one length class into one big integer, one
+# fixed-width slot per title and one bit per character, with spare high bits
+# in each slot so that carries never cross from one title into the next. A
+# SWAR popcount per byte and one multiplication then sum each slot's matched
+# bits into one byte (slots are at most 248 bits wide, so no sum overflows a
+# byte), and only slots whose byte can pass the bound are looked at in
+# Python. Whole length classes are skipped when the length bound
+# (real_quick_ratio) rules them out, and titles longer than the widest slot
+# are always candidates. Either way only the candidates that pass the bound
+# are checked with SequenceMatcher.
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]")
+SLOT_WIDTHS = tuple(range(32, 256, 16)) # Title length classes: titles shorter than the slot width
+BLOCK_BITS = 32768 # Bits per bit-parallel block
+BLOCKING_MAX_POSTINGS = 500 # Keys in more titles than this don't select candidates on their own
+BLOCKING_LONG_TITLE_KEYS = 6 # Titles with this many keys also match on one key ...
+BLOCKING_SINGLE_KEY_POSTINGS = 50 # ... if it is in at most this many titles
+STEM_SUFFIXES = ("ing", "ed", "s")
+_BLOCK_BYTES = BLOCK_BITS // 8
+_M1 = int.from_bytes(b"\x55" * _BLOCK_BYTES, "little")
+_M2 = int.from_bytes(b"\x33" * _BLOCK_BYTES, "little")
+_M4 = int.from_bytes(b"\x0f" * _BLOCK_BYTES, "little")
+_above_tables = {}
+
+def tokenize_title(title):
+    """
+    Returns the set of lowercase word tokens of a title.
+    """
+    return set(TOKEN_PATTERN.findall((title or "").lower()))
+
+def _stem(token):
+    for suffix in STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+def title_keys(title):
+    """
+    Returns the set of blocking keys of a title: its tokens with common
+    inflection suffixes stripped, so "model" and "models" share a key.
+    """
+    return {_stem(token) for token in tokenize_title(title)}
+
+def fingerprint_tokens(tokens):
+    """
+    Returns a short hash of a title token set (None for an empty set).
+    """
+    joined = " ".join(sorted(tokens))
+    if not joined:
+        return None
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:16]
+
+def title_fingerprint(title):
+    """
+    Returns a short hash of a title's token set, so titles that differ only in
+    case, punctuation or word order share a fingerprint (None for titles
+    without tokens).
+    """
+    return fingerprint_tokens(tokenize_title(title))
+
+def title_ratio_upper_bound(title1, title2):
+    """
+    Upper bound of SequenceMatcher(None, title1, title2).ratio() from lengths
+    alone (same as real_quick_ratio), without building a matcher.
+    """
+    total = len(title1) + len(title2)
+    if not total:
+        return 1.0
+    return 2.0 * min(len(title1), len(title2)) / total
+
+def titles_similar(title1, title2, threshold):
+    """
+    Returns True if SequenceMatcher(None, title1, title2).ratio() > threshold,
+    rejecting cheaply via the length and character-count bounds first.
+    """
+    if title_ratio_upper_bound(title1, title2) <= threshold:
+        return False
+    matcher = SequenceMatcher(None, title1, title2)
+    return matcher.quick_ratio() > threshold and matcher.ratio() > threshold
+
+def _position_masks(title):
+    # char -> bits of its positions in title
+    positions = {}
+    for i, char in enumerate(title):
+        positions[char] = positions.get(char, 0) | (1 << i)
+    return positions
+
+def _lcs_length(positions, title_length, other):
+    # Bit-parallel LCS of one title (as position masks) and other
+    title_bits = (1 << title_length) - 1
+    state = title_bits
+    for char in other:
+        matches = state & positions.get(char, 0)
+        if matches:
+            state = ((state + matches) | (state ^ matches)) & title_bits
+    return bin(title_bits ^ state).count("1")
+
+def _above_table(cutoff):
+    # bytes.translate table: 1 for byte values above cutoff, else 0
+    table = _above_tables.get(cutoff)
+    if table is None:
+        table = _above_tables[cutoff] = bytes(1 if value > cutoff else 0 for value in range(256))
+    return table
+
+class _TitleBlock:
+    """
+    Titles shorter than slot_width packed into bit masks for bit-parallel LCS.
+    """
+    def __init__(self, slot_width):
+        self.slot_width = slot_width
+        self.capacity = BLOCK_BITS // slot_width
+        self.char_masks = {} # char -> bits of its positions in all titles
+        self.title_bits = 0 # bits of all title positions
+        self.lengths = []
+        self.entry_ids = []
+        self.min_length = slot_width
+        self.slot_bytes = slot_width // 8
+        self.byte_sum = int.from_bytes(b"\x01" * self.slot_bytes, "little") # Sums a slot's bytes into its top byte
+
+    def add(self, entry_id, title):
+        offset = len(self.lengths) * self.slot_width
+        self.lengths.append(len(title))
+        self.entry_ids.append(entry_id)
+        self.min_length = min(self.min_length, len(title))
+        for char, bits in _position_masks(title).items():
+            self.char_masks[char] = self.char_masks.get(char, 0) | (bits << offset)
+        self.title_bits |= ((1 << len(title)) - 1) << offset
+
+    def lcs_lengths(self, title):
+        """
+        Returns the LCS length of title with every title in the block, one byte
+        per slot.
+        """
+        title_bits = self.title_bits
+        char_masks = self.char_masks
+        state = title_bits
+        for char in title:
+            matches = state & char_masks.get(char, 0)
+            if matches:
+                state = ((state + matches) | (state ^ matches)) & title_bits
+        # Cleared bits are the matched ones: popcount per byte, then per slot
+        bits = title_bits ^ state
+        bits -= (bits >> 1) & _M1
+        bits = (bits & _M2) + ((bits >> 2) & _M2)
+        bits = ((bits + (bits >> 4)) & _M4) * self.byte_sum
+        slot_bytes = self.slot_bytes
+        return bits.to_bytes(len(self.lengths) * slot_bytes + slot_bytes, "little")[slot_bytes - 1::slot_bytes][:len(self.lengths)]
+
+    def candidates(self, title, threshold):
+        """
+        Returns the entry ids whose LCS bound against title is above threshold.
+        """
+        if not title:
+            return [entry_id for entry_id, length in zip(self.entry_ids, self.lengths) if not length]
+        lcs = self.lcs_lengths(title)
+        # No slot can pass with fewer matches than the shortest title needs
+        cutoff = int(threshold * (len(title) + self.min_length) / 2)
+        above = lcs.translate(_above_table(min(cutoff, 255)))
+        found = []
+        slot = above.find(1)
+        while slot != -1:
+            if 2.0 * lcs[slot] / (len(title) + self.lengths[slot]) > threshold:
+                found.append(self.entry_ids[slot])
+            slot = above.find(1, slot + 1)
+        return found
+
+class TitleIndex:
+    """
+    Index of titles returning the entries that may be similar to a query.
+    With blocking="none" that is a superset of the entries whose
+    SequenceMatcher ratio exceeds the threshold; with blocking="words" only
+    entries sharing two word keys with the query are considered.
+    """
+    def __init__(self, blocking="words"):
+        self.blocking = blocking
+        self.entries = [] # (title, payload)
+        self.blocks = {slot_width: [] for slot_width in SLOT_WIDTHS}
+        self.long_entries = [] # ids of titles too long for any slot
+        self.entry_keys = [] # blocking keys per entry
+        self.postings = {} # key -> ids of entries with it
+        self.few_key_entries = [] # ids of entries with fewer than two keys
+
+    def add(self, title, payload=None):
+        """
+        Indexes title.
+        """
+        entry_id = len(self.entries)
+        self.entries.append((title, payload))
+        for slot_width in SLOT_WIDTHS:
+            if len(title) < slot_width:
+                blocks = self.blocks[slot_width]
+                if not blocks or len(blocks[-1].lengths) == blocks[-1].capacity:
+                    blocks.append(_TitleBlock(slot_width))
+                blocks[-1].add(entry_id, title)
+                break
+        else:
+            self.long_entries.append(entry_id)
+        if self.blocking == "words":
+            keys = title_keys(title)
+            self.entry_keys.append(keys)
+            if len(keys) < 2:
+                self.few_key_entries.append(entry_id)
+            else:
+                for key in keys:
+                    self.postings.setdefault(key, set()).add(entry_id)
+        return entry_id
+
+    def _scan_candidates(self, title, threshold):
+        # Every indexed title, bounded block by block
+        entry_ids = list(self.long_entries)
+        shortest = 0
+        for slot_width in SLOT_WIDTHS:
+            # Skip the class if even its closest length fails the length bound
+            closest = min(max(len(title), shortest), slot_width - 1)
+            if title_ratio_upper_bound(title, " " * closest) > threshold:
+                for block in self.blocks[slot_width]:
+                    entry_ids.extend(block.candidates(title, threshold))
+            shortest = slot_width
+        return sorted(entry_ids)
+
+    def _blocked_entries(self, keys):
+        # Entries sharing at least two keys with the query (or one rare key)
+        postings = [self.postings[key] for key in keys if key in self.postings]
+        rare = [entry_ids for entry_ids in postings if len(entry_ids) <= BLOCKING_MAX_POSTINGS]
+        found = set()
+        if rare:
+            entry_keys = self.entry_keys
+            found.update(entry_id for entry_id in set().union(*rare) if len(keys & entry_keys[entry_id]) >= 2)
+        else:
+            postings.sort(key=len)
+            for i, entry_ids in enumerate(postings):
+                for other_ids in postings[i + 1:]:
+                    found |= entry_ids & other_ids
+        if len(keys) >= BLOCKING_LONG_TITLE_KEYS:
+            # Long titles can stay similar with most words mistyped
+            for entry_ids in rare:
+                if len(entry_ids) <= BLOCKING_SINGLE_KEY_POSTINGS:
+                    found |= entry_ids
+        return found
+
+    def candidates(self, title, threshold):
+        """
+        Returns the ids of indexed (and, with blocking, selected) entries whose
+        ratio against title may be above threshold (their LCS bound is), in
+        insertion order.
+        """
+        keys = title_keys(title) if self.blocking == "words" else None
+        if not keys or len(keys) < 2:
+            return self._scan_candidates(title, threshold)
+        entry_ids = self._blocked_entries(keys)
+        entry_ids.update(self.few_key_entries)
+        positions = _position_masks(title)
+        found = []
+        for entry_id in sorted(entry_ids):
+            seen_title = self.entries[entry_id][0]
+            total = len(title) + len(seen_title)
+            if title_ratio_upper_bound(title, seen_title) <= threshold:
+                continue
+            if 2.0 * _lcs_length(positions, len(title), seen_title) / total > threshold:
+                found.append(entry_id)
+        return found
+
+    def find_similar(self, title, threshold):
+        """
+        Yields (title, payload) of indexed entries whose SequenceMatcher ratio
+        against title is above threshold (title is passed as the first sequence).
+        """
+        for entry_id in self.candidates(title, threshold):
+            seen_title, payload = self.entries[entry_id]
+            if titles_similar(title, seen_title, threshold):
+                yield seen_title, payload
@@ -0,0 +1,94 @@
+from functools import lru_cache
+from urllib.parse import urlparse
+from src.config import TIER1_SOURCES, TIER2_SOURCES
+
+# Source resolution index shared by fetch, merge and scoring.
+# Source names are matched against the lowercased canonical names of the
+# configured tiers, and links against the configured feed URLs registered
+# under the link's (normalized) host, instead of scanning every tier entry
+# for every item. Lookups are memoized, and fetch tags each item with its
+# tier/priority once so later stages don't resolve it again.
+
+def normalize_host(url):
+    """
+    Returns the lowercased host of a URL without a leading "www.".
+    """
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+def _build_index(sources):
+    names = [name.lower() for name in sources]
+    urls_by_host = {}
+    for url in sources.values():
+        urls_by_host.setdefault(normalize_host(url), []).append(url)
+    return names, urls_by_host
+
+TIER1_NAMES, TIER1_URLS_BY_HOST = _build_index(TIER1_SOURCES)
+TIER2_NAMES, TIER2_URLS_BY_HOST = _build_index(TIER2_SOURCES)
+
+def _link_in_tier(link, host, urls_by_host):
+    return any(url in link for url in urls_by_host.get(host, ()))
+
+def _matches_tier(source_lower, link, host, names, urls_by_host):
+    return any(name in source_lower for name in names) or _link_in_tier(link, host, urls_by_host)
+
+@lru_cache(maxsize=16384)
+def resolve_source(source_name, link):
+    """
+    Resolves a (source name, link) pair to (source_tier, source_priority).
+
+    source_tier (used by scoring): 1 = Tier 1 official, 2 = Tier 2 media, 3 = other.
+    source_priority (used by merge, lower is better):
+    1: Tier 1 (Official)
+    2: Reuters
+    3: Bloomberg
+    4: TechCrunch
+    5: Tier 2 (Other Media)
+    6: Others
+    """
+    s_lower = (source_name or "").lower()
+    link = link or ""
+    l_lower = link.lower()
+    host = normalize_host(link)
+
+    is_tier1 = _matches_tier(s_lower, link, host, TIER1_NAMES, TIER1_URLS_BY_HOST)
+    is_tier2 = _matches_tier(s_lower, link, host, TIER2_NAMES, TIER2_URLS_BY_HOST)
+    source_tier = 1 if is_tier1 else 2 if is_tier2 else 3
+
+    if is_tier1:
+        priority = 1
+    elif "reuters" in s_lower or "reuters.com" in l_lower:
+        priority = 2
+    elif "bloomberg" in s_lower or "bloomberg.com" in l_lower:
+        priority = 3
+    elif "techcrunch" in s_lower or "techcrunch.com" in l_lower:
+        priority = 4
+    elif is_tier2:
+        priority = 5
+    else:
+        priority = 6
+
+    return source_tier, priority
+
+@lru_cache(maxsize=16384)
+def is_official_link(link):
+    """
+    True if the link points under one of the Tier 1 (official) feed URLs.
+    """
+    link = link or ""
+    return _link_in_tier(link, normalize_host(link), TIER1_URLS_BY_HOST)
+
+def tag_source(news_item):
+    """
+    Stores source_tier / source_priority on a news item (done once at fetch time).
+    """
+    news_item["source_tier"], news_item["source_priority"] = resolve_source(news_item["source"], news_item["link"])
+    return news_item
+
+def get_source_tier(news_item):
+    """
+    Returns the item's source tier, using the fetch-time tag when present.
+    """
+    if "source_tier" in news_item:
+        return news_item["source_tier"]
+    return resolve_source(news_item.get("source", ""), news_item.get("link", ""))[0]
@@ -1,5 +1,8 @@
+import asyncio
 import logging
+import random
 import sys
+import time
 from src.config import LOG_LEVEL
 
 def setup_logger(name):
@@ -31,3 +34,83 @@ def setup_logger(name):
         logger.addHandler(handler)
         
     return logger
+
+def _backoff_delay(e, attempt, base_delay, max_delay):
+    # Full jitter; a Retry-After header on the error's HTTP response is a minimum
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    response = getattr(e, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, min(max_delay, float(retry_after)))
+        except ValueError:
+            pass
+    return delay
+
+def retry_with_backoff(func, retries=3, base_delay=1.0, max_delay=30.0, should_retry=None):
+    """
+    Calls func(), retrying on exceptions with exponential backoff and full jitter.
+    should_retry(exception) decides whether an error is worth retrying (default: all).
+    A Retry-After header on the error's HTTP response is honoured as a minimum delay.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= retries or (should_retry and not should_retry(e)):
+                raise
+            time.sleep(_backoff_delay(e, attempt, base_delay, max_delay))
+
+async def retry_with_backoff_async(func, retries=3, base_delay=1.0, max_delay=30.0, should_retry=None):
+    """
+    Async variant of retry_with_backoff: awaits func() and sleeps without
+    blocking the event loop.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await func()
+        except Exception as e:
+            if attempt >= retries or (should_retry and not should_retry(e)):
+                raise
+            await asyncio.sleep(_backoff_delay(e, attempt, base_delay, max_delay))
+
+class DeadlineExceeded(Exception):
+    """
+    Result of a run_concurrently job that was still running at the deadline.
+    """
+
+async def run_concurrently(jobs, limit, timeout=None):
+    """
+    Runs jobs (zero-argument coroutine functions) on the running event loop,
+    at most limit at a time and for at most timeout seconds in total.
+    Returns one entry per job, in order: its result, the exception it raised,
+    or a DeadlineExceeded if it was still running at the deadline.
+    Jobs still running at the deadline, or when the caller is cancelled, are
+    cancelled and awaited before this returns, so none outlive the call.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def limited(job):
+        async with semaphore:
+            return await job()
+
+    tasks = [asyncio.ensure_future(limited(job)) for job in jobs]
+    try:
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for task in tasks:
+        if task.cancelled():
+            results.append(DeadlineExceeded())
+        elif task.exception() is not None:
+            results.append(task.exception())
+        else:
+            results.append(task.result())
+    return results